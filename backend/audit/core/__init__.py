@@ -3,6 +3,12 @@
 from .audit_chain import AuditChain
 from .audit_context import AuditContext
 from .audit_store import AuditStore
+from .batch import AuditRecordBatch
+from .cache import TieredCache
+from .chain_log import SegmentedChainLog
+from .export import ExportWriter
+from .merkle import MerkleProof, verify_inclusion_proof
+from .mining import ParallelMiner
 from .models import (
     AuditFilter,
     AuditFinding,
@@ -15,6 +21,15 @@ from .models import (
     AuditViolation,
     DataClassification,
 )
+from .postgres_store import PostgresAuditBackend
+from .provenance_graph import ProvenanceGraph
+from .rollups import RollupBucket
+from .sequencer import ChainSequencer
+from .snapshot import ChainSnapshot
+from .spill import SpillStore
+from .sqlite_store import SQLiteAuditBackend
+from .watermark import ChainWatermark
+from .write_behind import WriteBehindQueue
 
 __all__ = [
     "AuditChain",
@@ -24,10 +39,26 @@ __all__ = [
     "AuditFinding",
     "AuditOptions",
     "AuditRecord",
+    "AuditRecordBatch",
     "AuditSeverity",
     "AuditSignature",
     "AuditStatus",
     "AuditTargetType",
     "AuditViolation",
+    "ChainSequencer",
+    "ChainSnapshot",
+    "ChainWatermark",
     "DataClassification",
+    "ExportWriter",
+    "MerkleProof",
+    "ParallelMiner",
+    "PostgresAuditBackend",
+    "ProvenanceGraph",
+    "RollupBucket",
+    "SegmentedChainLog",
+    "SpillStore",
+    "SQLiteAuditBackend",
+    "TieredCache",
+    "WriteBehindQueue",
+    "verify_inclusion_proof",
 ]
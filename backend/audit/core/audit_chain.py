@@ -1,27 +1,89 @@
 """Blockchain-style immutable audit chain with cryptographic verification."""
 
 import json
+import time
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
 
 import yaml
 from loguru import logger
 
-from .models import AuditFilter, AuditRecord, AuditTargetType
+from .audit_store import AuditStore
+from .chain_log import DEFAULT_SEGMENT_SIZE, SegmentedChainLog
+from .export import AsyncWriter, export_records, write_tables
+from .merkle import MerkleProof, merkle_path, merkle_root
+from .mining import ParallelMiner
+from .models import GENESIS_PREVIOUS_HASH, AuditFilter, AuditRecord, AuditTargetType
+from .record_index import RECORD_INDEX_FILENAME, RecordIndex, RecordIndexFile, index_entry
+from .sequencer import ChainSequencer
+from .snapshot import write_snapshot
+from .statistics import AuditStatistics
+from .verification import DEFAULT_VERIFY_CHUNK_SIZE, ChunkResult, link_error, verify_log_range, verify_records
+from .watermark import ChainWatermark, WatermarkStore
+
+# Below this difficulty a process round trip costs more than mining in-thread
+DEFAULT_PARALLEL_MINING_DIFFICULTY = 5
+
+CHECKPOINT_ACTION = "merkle_checkpoint"
+
+# Records decoded at a time when catching the record index up with the chain
+_INDEX_BUILD_BATCH = 10_000
 
 
 class AuditChain:
     """Blockchain-style immutable chain of audit records."""
 
-    def __init__(self, difficulty: int = 2) -> None:
+    def __init__(
+        self,
+        difficulty: int = 2,
+        storage_path: str | Path | None = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        mining_workers: int | None = None,
+        parallel_mining_difficulty: int = DEFAULT_PARALLEL_MINING_DIFFICULTY,
+        checkpoint_interval: int | None = None,
+        watermark_key: str | bytes | None = None,
+    ) -> None:
         """
         Initialize audit chain.
 
         Args:
             difficulty: Mining difficulty for proof-of-work (number of leading zeros)
+            storage_path: Directory for a persistent segmented chain log (in-memory if None)
+            segment_size: Maximum segment file size in bytes for the persistent log
+            mining_workers: Worker processes for parallel proof-of-work (defaults to CPU count)
+            parallel_mining_difficulty: Minimum difficulty at which mining moves to the process pool
+            checkpoint_interval: Append a Merkle checkpoint record after every this many records (disabled if None).
+                Checkpoints are chain bookkeeping: they are left out of statistics, ``find_records`` and time slices
+            watermark_key: Secret key signing the verified-watermark (per-process random key if None)
         """
-        self.chain: list[AuditRecord] = []
+        self.chain: list[AuditRecord] | SegmentedChainLog
+        self.chain = [] if storage_path is None else SegmentedChainLog(storage_path, segment_size=segment_size)
         self.difficulty = difficulty
+        self.parallel_mining_difficulty = parallel_mining_difficulty
+        self._miner = ParallelMiner(workers=mining_workers)
+        self._sequencer = ChainSequencer(self._commit_batch)
+        self.checkpoint_interval = checkpoint_interval
+        self._checkpoint_requested = False
+        # Lazily built lookups, maintained on append once built. A persistent chain keeps the
+        # id lookup and record index entries in a file beside its segments, so they are rebuilt
+        # on reopen without decoding records
+        self._checkpoint_positions: list[int] | None = None
+        self._checkpoint_leaves: list[str] | None = None  # Hashes the next checkpoint covers
+        self._positions: dict[str, int] | None = None
+        self._index: RecordIndex | None = None
+        self._stats: AuditStatistics | None = None
+        self._index_file = RecordIndexFile(self.chain.path / RECORD_INDEX_FILENAME) if isinstance(self.chain, SegmentedChainLog) else None
+        self._watermarks = WatermarkStore(watermark_key, self.chain.path if isinstance(self.chain, SegmentedChainLog) else None)
+
+        # Reopen an existing persistent chain instead of creating a new genesis
+        if len(self.chain) > 0:
+            logger.info(f"Audit chain opened from {storage_path} ({len(self.chain)} records, latest={self.get_latest_record().record_hash[:16]}...)")
+            return
 
         # Create genesis record
         genesis = AuditRecord(
@@ -31,10 +93,11 @@ class AuditChain:
             target_type=AuditTargetType.GIT,
             source="system",
             reason="Initialize audit chain",
-            previous_hash="0",
+            previous_hash=GENESIS_PREVIOUS_HASH,
         )
         genesis.mine_block(self.difficulty)
         self.chain.append(genesis)
+        self._checkpoint_positions = []
 
         logger.info(f"Audit chain initialized with genesis record: {genesis.record_hash[:16]}...")
 
@@ -51,65 +114,438 @@ class AuditChain:
         """
         Add new record to chain with proof-of-work.
 
+        Appends go through the chain's single-writer sequencer, so concurrent
+        callers never link to the same previous record.
+
         Args:
             record: Audit record to add (will be modified to link to chain)
 
         Returns:
             The added record with updated hash and nonce
+
+        Raises:
+            ValueError: If the record is shaped like a checkpoint or fails verification
+        """
+        (committed,) = await self._sequencer.submit([record])
+        return committed
+
+    async def add_records(self, records: list[AuditRecord], store: AuditStore | None = None) -> list[AuditRecord]:
+        """
+        Add a batch of records to chain as a single group commit.
+
+        Records are linked and mined in order, the batch is verified in one
+        pass and appended together, and a single summary line is logged.
+
+        Args:
+            records: Audit records to add in order (will be modified to link to chain)
+            store: Audit store that receives the committed batch as one bulk write
+
+        Returns:
+            The added records with updated hashes and nonces
+
+        Raises:
+            ValueError: If any record is shaped like a checkpoint or fails verification (nothing is appended)
         """
-        # Link to previous record
-        latest = self.get_latest_record()
-        object.__setattr__(record, "previous_hash", latest.record_hash)
+        if not records:
+            return []
+
+        committed = await self._sequencer.submit(records)
+
+        if store is not None:
+            await store.store_records(committed)
+
+        return committed
+
+    async def _commit_batch(self, records: list[AuditRecord]) -> list[AuditRecord]:
+        """
+        Link, mine, verify and append records; only ever called by the sequencer's writer.
+
+        Args:
+            records: Audit records to append in order
+
+        Returns:
+            The appended records
+
+        Raises:
+            ValueError: If any record takes the checkpoint shape or fails verification (nothing is appended)
+        """
+        # Only the chain writes checkpoints; a look-alike would be hidden from queries and break proofs
+        for i, record in enumerate(records):
+            if _is_checkpoint(record):
+                msg = f"Record {i} of batch ({record.record_id}) uses the reserved action {CHECKPOINT_ACTION} of actor system"
+                raise ValueError(msg)
+
+        start = time.perf_counter()
+        anchor_hash = self.get_latest_record().record_hash
+        base = len(self.chain)
+        requested = self._checkpoint_requested
+        tracking = self.checkpoint_interval is not None or requested
+        checkpoint_positions = self._get_checkpoint_positions() if tracking else []
+        # Leaves of the next checkpoint: every hash from the previous checkpoint, or genesis, (re-covered, but not new) on
+        leaf_start = checkpoint_positions[-1] if checkpoint_positions else 0
+        if tracking and self._checkpoint_leaves is None:
+            self._checkpoint_leaves = [self.chain[i].record_hash for i in range(leaf_start, base)]
+        leaves = list(self._checkpoint_leaves or ())
+
+        # Link and mine in order, each record to the one before it, with a checkpoint at every interval boundary crossed
+        appended: list[AuditRecord] = []
+        new_checkpoints: list[int] = []
+        previous_hash = anchor_hash
+        for record in records:
+            await self._link_and_mine(record, previous_hash)
+            previous_hash = record.record_hash
+            appended.append(record)
+            if not tracking:
+                continue
+            leaves.append(previous_hash)
+            if self.checkpoint_interval is not None and len(leaves) - 1 >= self.checkpoint_interval:
+                leaf_start = await self._append_checkpoint(appended, leaves, leaf_start, base)
+                new_checkpoints.append(leaf_start)
+                previous_hash = appended[-1].record_hash
+                leaves = [previous_hash]
+        # A requested checkpoint covers any records left over
+        if requested and len(leaves) > 1:
+            new_checkpoints.append(await self._append_checkpoint(appended, leaves, leaf_start, base))
+            leaves = [appended[-1].record_hash]
+
+        # Verify the whole batch once before any of it joins the chain
+        previous_hash = anchor_hash
+        for i, record in enumerate(appended):
+            if record.previous_hash != previous_hash or not record.verify():
+                msg = f"Record {i} of batch ({record.record_id}) failed verification before adding to chain"
+                raise ValueError(msg)
+            previous_hash = record.record_hash
+
+        # Add to chain
+        self._extend(appended)
+        checkpoint_positions.extend(new_checkpoints)
+        self._checkpoint_leaves = leaves if tracking else None
+        self._checkpoint_requested = False
+        for position in new_checkpoints:
+            context = self.chain[position].context
+            logger.info(f"Added Merkle checkpoint at index {position}: root={context['merkle_root'][:16]}... ({context['leaf_count']} records)")
+
+        if len(records) == 1:
+            record = records[0]
+            logger.info(f"Added audit record: {record.record_hash[:16]}... (action={record.action}, target={record.target}, actor={record.actor})")
+        elif records:
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"Added {len(records)} audit records in batch: {records[0].record_hash[:16]}... -> {records[-1].record_hash[:16]}... "
+                f"({elapsed * 1000:.1f}ms, {len(records) / elapsed if elapsed else 0:.0f} records/s)"
+            )
+
+        return records
+
+    async def _link_and_mine(self, record: AuditRecord, previous_hash: str) -> None:
+        """Link record to its predecessor and mine it."""
+        object.__setattr__(record, "previous_hash", previous_hash)
         # Recalculate hash after updating previous_hash
         object.__setattr__(record, "record_hash", record.calculate_hash())
+        await self._mine(record)
+
+    def _extend(self, records: list[AuditRecord]) -> None:
+        """Append records to the chain and to any built lookups."""
+        base = len(self.chain)
+        self.chain.extend(records)
+        if self._index is not None:
+            self._index_records(base, records)
+        if self._stats is not None:
+            for record in records:
+                if not _is_checkpoint(record):
+                    self._stats.add(record)
+
+    async def _mine(self, record: AuditRecord) -> None:
+        """
+        Mine record, using the process pool at high difficulty.
 
-        # Mine the record (proof-of-work)
-        record.mine_block(self.difficulty)
+        Args:
+            record: Linked audit record to mine in place
+        """
+        if self.difficulty < self.parallel_mining_difficulty or record.record_hash.startswith("0" * self.difficulty):
+            record.mine_block(self.difficulty)
+            return
 
-        # Verify before adding
-        if not record.verify():
-            msg = "Record verification failed before adding to chain"
-            raise ValueError(msg)
+        prefix, suffix = record.canonical_hash_parts()
+        nonce, record_hash = await self._miner.mine(prefix, suffix, record.nonce + 1, self.difficulty)
+        object.__setattr__(record, "nonce", nonce)
+        object.__setattr__(record, "record_hash", record_hash)
 
-        # Add to chain
-        self.chain.append(record)
+    async def add_checkpoint(self) -> AuditRecord | None:
+        """
+        Append a Merkle checkpoint covering every record since the last one.
+
+        Returns:
+            The latest checkpoint record, or None if the chain has none
+        """
+        self._checkpoint_requested = True
+        await self._sequencer.submit([])
+        positions = self._get_checkpoint_positions()
+        return self.chain[positions[-1]] if positions else None
+
+    async def _append_checkpoint(self, batch: list[AuditRecord], leaves: list[str], start: int, base: int) -> int:
+        """
+        Link and mine a checkpoint covering the given leaves onto the end of a batch being committed.
+
+        Args:
+            batch: Records linked so far, appended at chain position ``base`` on commit
+            leaves: Record hashes from chain position ``start`` up to the end of the batch
+            start: Chain position of the first leaf
+            base: Chain position of the batch's first record
+
+        Returns:
+            Chain position the checkpoint will take
+        """
+        end = start + len(leaves)
+        checkpoint = AuditRecord.unhashed(
+            actor="system",
+            action=CHECKPOINT_ACTION,
+            target="audit_chain",
+            target_type=AuditTargetType.GIT,
+            source="system",
+            reason="Merkle checkpoint",
+            context={"merkle_root": merkle_root(leaves), "start_index": start, "end_index": end, "leaf_count": end - start},
+        )
+        await self._link_and_mine(checkpoint, batch[-1].record_hash if batch else self.get_latest_record().record_hash)
+        batch.append(checkpoint)
+        return base + len(batch) - 1
 
-        logger.info(f"Added audit record: {record.record_hash[:16]}... (action={record.action}, target={record.target}, actor={record.actor})")
+    def _get_checkpoint_positions(self) -> list[int]:
+        """
+        Return chain positions of checkpoint records, oldest first.
+
+        Built on first use by finding the newest checkpoint and following each
+        checkpoint's ``start_index`` back to its predecessor.
+        """
+        if self._checkpoint_positions is None:
+            positions: list[int] = []
+            for i in range(len(self.chain) - 1, 0, -1):
+                if _is_checkpoint(self.chain[i]):
+                    positions.append(i)
+                    break
+            while positions and (previous := self.chain[positions[-1]].context["start_index"]) > 0:
+                positions.append(previous)
+            positions.reverse()
+            self._checkpoint_positions = positions
+        return self._checkpoint_positions
+
+    def _position_of(self, record_id: str) -> int | None:
+        """Return chain position of a record, building the id lookup on first use."""
+        self._get_index()
+        assert self._positions is not None
+        return self._positions.get(record_id)
+
+    def _get_index(self) -> RecordIndex:
+        """
+        Return the secondary record index, building it and the id lookup on first use.
+
+        A persistent chain reads them from its index file and decodes only the
+        records appended since the file was last written.
+        """
+        if self._index is None:
+            self._positions, self._index = {}, RecordIndex()
+            indexed = self._load_index_file()
+            for start in range(indexed, len(self.chain), _INDEX_BUILD_BATCH):
+                self._index_records(start, list(self._iter_range(start, min(start + _INDEX_BUILD_BATCH, len(self.chain)))))
+        return self._index
+
+    def _load_index_file(self) -> int:
+        """Fill the empty id lookup and record index from the index file, returning the number of positions it covered."""
+        assert self._positions is not None and self._index is not None
+        if self._index_file is None:
+            return 0
+        position = -1
+        record_id = None
+        for position, entry in enumerate(self._index_file.load(len(self.chain))):
+            record_id = entry[0]
+            self._positions[record_id] = position
+            if len(entry) > 1:
+                self._index.add_entry(position, entry[1:])
+        if record_id is not None and record_id != self.chain[position].record_id:
+            logger.warning(f"Record index {self._index_file.path} does not match the chain; rebuilding it")
+            self._index_file.reset()
+            self._positions, self._index = {}, RecordIndex()
+            return 0
+        return position + 1
+
+    def _index_records(self, base: int, records: list[AuditRecord]) -> None:
+        """Add records appended at chain position ``base`` to the id lookup, the record index and the index file."""
+        assert self._positions is not None and self._index is not None
+        entries = []
+        for position, record in enumerate(records, start=base):
+            self._positions[record.record_id] = position
+            if position == 0 or _is_checkpoint(record):
+                entries.append([record.record_id])
+                continue
+            entry = index_entry(record)
+            self._index.add_entry(position, entry[1:])
+            entries.append(entry)
+        if self._index_file is not None:
+            self._index_file.append(entries)
 
-        return record
+    def _audit_records(self) -> Iterator[tuple[int, AuditRecord]]:
+        """Iterate (position, record) over the chain's audit records, skipping genesis and checkpoints."""
+        return ((position, record) for position, record in enumerate(self._iter_range(1, len(self.chain)), start=1) if not _is_checkpoint(record))
+
+    def get_inclusion_proof(self, record_id: str) -> MerkleProof | None:
+        """
+        Build an O(log n) proof that a record is included under a checkpoint.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Inclusion proof, or None if the record is unknown or not yet covered by a checkpoint
+        """
+        position = self._position_of(record_id)
+        if position is None:
+            return None
+
+        positions = self._get_checkpoint_positions()
+        k = bisect_right(positions, position)
+        if k == len(positions):
+            return None
+
+        checkpoint = self.chain[positions[k]]
+        start = checkpoint.context["start_index"]
+        record_hashes = [self.chain[i].record_hash for i in range(start, positions[k])]
+        leaf_index = position - start
+
+        return MerkleProof(
+            record_id=record_id,
+            record_hash=record_hashes[leaf_index],
+            leaf_index=leaf_index,
+            leaf_count=len(record_hashes),
+            path=merkle_path(record_hashes, leaf_index),
+            merkle_root=checkpoint.context["merkle_root"],
+            checkpoint=checkpoint,
+        )
 
-    def verify_chain(self) -> bool:
+    def verify_checkpoints(self) -> bool:
+        """
+        Check every checkpoint's Merkle root against the record hashes it covers.
+
+        Returns:
+            True if all checkpoints are intact and match the chain
+        """
+        positions = self._get_checkpoint_positions()
+        for position in positions:
+            checkpoint = self.chain[position]
+            start = checkpoint.context["start_index"]
+            root = merkle_root([self.chain[i].record_hash for i in range(start, position)])
+            if not checkpoint.verify() or root != checkpoint.context["merkle_root"]:
+                logger.error(f"Checkpoint {position} ({checkpoint.record_id}) does not match the records it covers")
+                return False
+
+        logger.info(f"Verified {len(positions)} Merkle checkpoints")
+        return True
+
+    def verify_chain(
+        self,
+        incremental: bool = False,
+        parallel: bool = False,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_VERIFY_CHUNK_SIZE,
+    ) -> bool:
         """
         Verify entire chain integrity.
 
+        In parallel mode the chain is split into chunks whose hashes, links and
+        proof-of-work are checked in worker processes; only the links between
+        chunks are checked here. The first failing index is reported either way.
+
+        Every successful verification advances the signed verified-watermark.
+        In incremental mode only records after the watermark are checked, plus
+        the anchor record it points at; without a trusted watermark the whole
+        chain is verified.
+
+        Args:
+            incremental: Only verify records added since the last verification
+            parallel: Verify chunks across a process pool
+            workers: Worker processes in parallel mode (defaults to CPU count)
+            chunk_size: Records per chunk in parallel mode
+
         Returns:
             True if chain is cryptographically valid
 
         Raises:
             ValueError: If chain verification fails
         """
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i - 1]
-
-            # Verify current record hash
-            if not current.verify():
-                logger.error(f"Record {i} ({current.record_id}) failed hash verification")
+        end = len(self.chain)
+        start, anchor_hash = 1, self.chain[0].record_hash  # Genesis
+        if incremental:
+            anchor = self._trusted_watermark_anchor()
+            if anchor is not None:
+                start, anchor_hash = anchor
+
+        if start < end:
+            if parallel:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    if not self._check_chunks(self._submit_chunks(pool, start, end, chunk_size), anchor_hash):
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return False
+            elif not self._check_chunks(iter([verify_records(self._iter_range(start, end), start, self.difficulty)]), anchor_hash):
                 return False
 
-            # Verify link to previous record
-            if current.previous_hash != previous.record_hash:
-                logger.error(
-                    f"Record {i} ({current.record_id}) has invalid previous_hash. Expected {previous.record_hash[:16]}..., got {current.previous_hash[:16]}..."
-                )
-                return False
+        self._watermarks.save(end - 1, self.chain[end - 1].record_hash)
 
-            # Verify proof-of-work
-            if not current.record_hash.startswith("0" * self.difficulty):
-                logger.error(f"Record {i} ({current.record_id}) has insufficient proof-of-work")
-                return False
+        logger.info(f"Audit chain verified successfully ({end} records, {end - start} checked)")
+        return True
+
+    def get_watermark(self) -> ChainWatermark | None:
+        """
+        Get the trusted verified-watermark.
 
-        logger.info(f"Audit chain verified successfully ({len(self.chain)} records)")
+        Returns:
+            Signed watermark of the last successful verification, or None
+        """
+        return self._watermarks.load()
+
+    def _trusted_watermark_anchor(self) -> tuple[int, str] | None:
+        """Return (first unverified position, anchor hash) if the watermark still matches the chain."""
+        watermark = self._watermarks.load()
+        if watermark is None or watermark.index >= len(self.chain):
+            return None
+
+        anchor = self.chain[watermark.index]
+        if anchor.record_hash != watermark.record_hash or not anchor.verify():
+            logger.error(f"Record {watermark.index} ({anchor.record_id}) no longer matches the verified watermark")
+            return None
+        return watermark.index + 1, watermark.record_hash
+
+    def _iter_range(self, start: int, end: int) -> Iterator[AuditRecord]:
+        """Iterate chain positions [start, end) without decoding skipped records."""
+        if isinstance(self.chain, SegmentedChainLog):
+            return (self.chain[i] for i in range(start, end))
+        return islice(self.chain, start, end)
+
+    def _submit_chunks(self, pool: ProcessPoolExecutor, start: int, end: int, chunk_size: int) -> Iterator[ChunkResult]:
+        """Submit chunk verification tasks and yield their results in chain order."""
+        bounds = [(chunk_start, min(chunk_start + chunk_size, end)) for chunk_start in range(start, end, chunk_size)]
+        if isinstance(self.chain, SegmentedChainLog):
+            # Workers read their chunk straight from the memory-mapped segments
+            path = str(self.chain.path)
+            futures = [pool.submit(verify_log_range, path, chunk_start, chunk_end, self.difficulty) for chunk_start, chunk_end in bounds]
+        else:
+            futures = [pool.submit(verify_records, self.chain[chunk_start:chunk_end], chunk_start, self.difficulty) for chunk_start, chunk_end in bounds]
+        for future in futures:
+            yield future.result()
+
+    def _check_chunks(self, results: Iterator[ChunkResult], anchor_hash: str) -> bool:
+        """Check chunk results and the seams between them in order, logging the first failure."""
+        previous_hash = anchor_hash
+        for result in results:
+            # A record's own hash is checked before its link, its proof-of-work after
+            if result.failure_kind == "hash" and result.failure_index == result.start:
+                logger.error(result.failure_message)
+                return False
+            if result.first_previous_hash != previous_hash:
+                logger.error(link_error(result.start, result.first_record_id, previous_hash, result.first_previous_hash))
+                return False
+            if result.failure_index is not None:
+                logger.error(result.failure_message)
+                return False
+            previous_hash = result.last_hash
         return True
 
     def get_chain_slice(self, start: datetime, end: datetime) -> list[AuditRecord]:
@@ -123,11 +559,7 @@ class AuditChain:
         Returns:
             List of records within time range
         """
-        return [
-            record
-            for record in self.chain[1:]  # Skip genesis
-            if start <= record.timestamp <= end
-        ]
+        return [self.chain[i] for i in self._get_index().time_range(start, end)]
 
     def find_records(self, audit_filter: AuditFilter) -> list[AuditRecord]:
         """
@@ -138,32 +570,26 @@ class AuditChain:
 
         Returns:
             List of matching records (limited by filter.limit)
-        """
-        matches = []
-        checked = 0
 
-        # Search from newest to oldest (skip genesis)
-        for record in reversed(self.chain[1:]):
-            checked += 1
-
-            # Skip records outside time range first (optimization)
-            if audit_filter.since and record.timestamp < audit_filter.since:
-                continue
-            if audit_filter.until and record.timestamp > audit_filter.until:
-                continue
-
-            # Check other filters
-            if audit_filter.matches(record):
-                matches.append(record)
+        Raises:
+            ValueError: If the filter's cursor is malformed or not from this chain
+        """
+        # A cursor names the last record of the previous page; resume just below its position
+        before = None
+        cursor_key = audit_filter.cursor_key()
+        if cursor_key is not None:
+            before = self._position_of(cursor_key[1])
+            if before is None:
+                msg = f"Cursor record not found in chain: {cursor_key[1]}"
+                raise ValueError(msg)
 
-            # Stop if we hit the limit
-            if len(matches) >= audit_filter.limit:
-                break
+        positions = self._get_index().search(audit_filter, before)
 
-        # Apply offset
-        matches = matches[audit_filter.offset :]
+        # Newest first; a cursor replaces the offset, otherwise skip it before stopping at the limit
+        offset = 0 if before is not None else audit_filter.offset
+        matches = [self.chain[i] for i in islice(positions, offset, offset + audit_filter.limit)]
 
-        logger.debug(f"Found {len(matches)} matching records (checked {checked}, limit={audit_filter.limit})")
+        logger.debug(f"Found {len(matches)} matching records (limit={audit_filter.limit})")
 
         return matches
 
@@ -171,8 +597,10 @@ class AuditChain:
         """
         Export entire chain in specified format.
 
+        Builds the whole export in memory; use ``export_chain_to`` for large chains.
+
         Args:
-            export_format: Export format (json, yaml, csv)
+            export_format: Export format (json, yaml); use ``export_tables`` for CSV
 
         Returns:
             Serialized chain
@@ -194,6 +622,89 @@ class AuditChain:
         msg = f"Unsupported export format: {export_format}"
         raise ValueError(msg)
 
+    async def export_chain_to(
+        self,
+        destination: str | Path | BinaryIO | AsyncWriter,
+        export_format: str = "jsonl",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        compress: bool = False,
+    ) -> int:
+        """
+        Stream the chain, or a time range of it, to a file or writer.
+
+        Unlike ``export_chain``, records are encoded and written one chunk at a
+        time, so memory stays constant however long the chain is.
+
+        Args:
+            destination: File path, binary file object, or writer with an awaitable ``write``
+            export_format: jsonl, json (one array) or yaml (one document per record)
+            start: Earliest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+            end: Latest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+            compress: gzip the output
+
+        Returns:
+            Number of records written
+
+        Raises:
+            ValueError: If format is not supported
+        """
+        count = await export_records(self._export_range(start, end), destination, export_format, compress)
+        logger.info(f"Exported {count} audit records as {export_format}{' (gzip)' if compress else ''}")
+        return count
+
+    def export_snapshot(self, path: str | Path, start: datetime | None = None, end: datetime | None = None) -> int:
+        """
+        Write the chain, or a time range of it, as a binary snapshot for ``ChainSnapshot``.
+
+        Args:
+            path: Snapshot file
+            start: Earliest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+            end: Latest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+
+        Returns:
+            Number of records written
+        """
+        return write_snapshot(self._export_range(start, end), path)
+
+    def export_tables(
+        self,
+        directory: str | Path,
+        columns: Mapping[str, Sequence[str]] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        compress: bool = False,
+    ) -> dict[str, int]:
+        """
+        Stream the chain, or a time range of it, as CSV tables for spreadsheets and warehouse loaders.
+
+        Writes ``records.csv`` plus ``findings.csv`` and ``violations.csv`` with
+        one row per finding or violation keyed by ``record_id``, using the
+        column names of the SQL schema.
+
+        Args:
+            directory: Directory receiving the tables
+            columns: Columns to write per table, in order (every table and column if None; tables not listed are skipped)
+            start: Earliest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+            end: Latest timestamp, as for ``get_chain_slice`` (inclusive, unbounded if None)
+            compress: gzip each file
+
+        Returns:
+            Number of rows written per table
+
+        Raises:
+            ValueError: If a table or column is unknown
+        """
+        counts = write_tables(self._export_range(start, end), directory, columns, compress)
+        logger.info(f"Exported audit chain tables to {directory}: {counts}")
+        return counts
+
+    def _export_range(self, start: datetime | None, end: datetime | None) -> Iterator[AuditRecord]:
+        """Iterate the records to export: the whole chain, or a time range as ``get_chain_slice`` selects it."""
+        if start is None and end is None:
+            return self._iter_range(0, len(self.chain))
+        return (self.chain[i] for i in self._get_index().time_range(start, end))
+
     def verify_signatures(self) -> dict[str, bool]:
         """
         Verify all signatures in chain.
@@ -211,29 +722,41 @@ class AuditChain:
 
         return results
 
+    def close(self) -> None:
+        """Shut down mining workers and release file handles held by a persistent chain."""
+        self._miner.close()
+        if isinstance(self.chain, SegmentedChainLog):
+            self.chain.close()
+
     def get_statistics(self) -> dict[str, Any]:
         """
         Get chain statistics.
 
+        Counters are built on first use and maintained on append, so polling
+        this is O(1).
+
         Returns:
             Dictionary with chain metrics
         """
-        if len(self.chain) <= 1:
-            return {
-                "total_records": 0,
-                "earliest_timestamp": None,
-                "latest_timestamp": None,
-                "unique_actors": 0,
-                "unique_actions": 0,
-            }
-
-        records = self.chain[1:]  # Exclude genesis
-
-        return {
-            "total_records": len(records),
-            "earliest_timestamp": min(r.timestamp for r in records).isoformat(),
-            "latest_timestamp": max(r.timestamp for r in records).isoformat(),
-            "unique_actors": len({r.actor for r in records}),
-            "unique_actions": len({r.action for r in records}),
-            "severity_counts": {severity: sum(1 for r in records if r.severity == severity) for severity in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")},
-        }
+        if self._stats is None:
+            self._stats = AuditStatistics(record for _, record in self._audit_records())
+        return self._stats.chain_statistics()
+
+    def verify_statistics(self) -> bool:
+        """
+        Check the maintained statistics against a full recount, replacing them if they drifted.
+
+        Returns:
+            True if the maintained counters matched the recount
+        """
+        rebuilt = AuditStatistics(record for _, record in self._audit_records())
+        consistent = self._stats is None or self._stats == rebuilt
+        if not consistent:
+            logger.warning("Chain statistics drifted from a full recount; rebuilt them")
+        self._stats = rebuilt
+        return consistent
+
+
+def _is_checkpoint(record: AuditRecord) -> bool:
+    """Check whether a chain record is a Merkle checkpoint rather than an audit record."""
+    return record.action == CHECKPOINT_ACTION and record.actor == "system"
@@ -88,6 +88,8 @@ class AuditContext:
             try:
                 asyncio.set_event_loop(loop)
                 loop.run_until_complete(self.commit())
+                # Background writes must not outlive the loop they run on
+                loop.run_until_complete(self.store.flush())
             finally:
                 loop.close()
 
@@ -198,8 +200,8 @@ class AuditContext:
         Raises:
             ValueError: If record creation fails
         """
-        # Create audit record
-        self.record = AuditRecord(
+        # Create audit record; the chain links and hashes it, so hashing here would be wasted
+        self.record = AuditRecord.unhashed(
             actor=self.actor,
             action=self.action,
             target=self.target,
@@ -1,10 +1,32 @@
 """Persistent storage for audit records with multiple backends."""
 
+import asyncio
+import os
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
-from .models import AuditFilter, AuditRecord
+from .cache import DEFAULT_CACHE_SIZE, DEFAULT_PROVENANCE_CACHE_RECORDS, TieredCache
+from .models import AuditFilter, AuditRecord, AuditSeverity
+from .postgres_store import PostgresAuditBackend
+from .provenance_graph import ProvenanceGraph
+from .provenance_index import TargetIndex
+from .query import select_top_k
+from .rollups import AuditRollups, RollupBucket, validate_rollup_query
+from .spill import SpillStore
+from .statistics import AuditStatistics
+from .sqlite_store import SQLiteAuditBackend
+from .verification import DEFAULT_VERIFY_CHUNK_SIZE, find_invalid_records
+from .write_behind import DEFAULT_MAX_PENDING, DEFAULT_WRITE_BATCH_SIZE, WriteBehindQueue
+
+DEFAULT_STREAM_PAGE_SIZE = 500  # Records fetched per page by stream_records
 
 
 class AuditStore:
@@ -12,9 +34,10 @@ class AuditStore:
     Persistent storage for audit records.
 
     Supports multiple storage backends:
-    - Dgraph: Provenance graph (relationships)
+    - Dgraph: Provenance graph (relationships; optional embedded graph when not configured)
     - Postgres: Structured records (queryable)
     - Redis: Hot cache (recent records)
+    - SQLite: Embedded durable store (single-node deployments)
     """
 
     def __init__(
@@ -23,6 +46,16 @@ class AuditStore:
         dgraph_url: str | None = None,
         redis_url: str | None = None,
         enable_cache: bool = True,
+        sqlite_path: str | Path | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float | None = None,
+        max_memory_records: int | None = None,
+        spill_path: str | Path | None = None,
+        write_behind: bool = False,
+        write_queue_size: int = DEFAULT_MAX_PENDING,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        enable_graph: bool = False,
+        graph_path: str | Path | None = None,
     ) -> None:
         """
         Initialize audit store.
@@ -31,20 +64,82 @@ class AuditStore:
             postgres_url: PostgreSQL connection URL
             dgraph_url: Dgraph connection URL
             redis_url: Redis connection URL
-            enable_cache: Enable Redis caching
+            enable_cache: Enable the read cache (with a Redis tier when redis_url is set)
+            sqlite_path: SQLite database file for embedded durable storage
+            cache_size: Records held by the in-process cache tier
+            cache_ttl: Seconds a cached entry stays valid (no expiry if None)
+            max_memory_records: Memory budget in records, shared with the in-process cache tiers; older records are
+                evicted beyond it (unbounded if None). Without a database, evicted records leave only keys in memory: time order,
+                target index, signed ids and spill positions, a few hundred bytes per record
+            spill_path: Directory evicted records spill to when no database is configured (temporary if None)
+            write_behind: Return once records are in memory and write them to slower backends in the background
+            write_queue_size: Records each backend may fall behind before stores wait (write-behind only)
+            write_batch_size: Maximum records per background backend write (write-behind only)
+            enable_graph: Maintain the embedded provenance graph for ``get_related_records`` when Dgraph is not
+                configured; it holds every record's relationships in memory, outside ``max_memory_records``
+            graph_path: File persisting the embedded provenance graph (in memory if None); setting it enables the graph
         """
         self.postgres_url = postgres_url
         self.dgraph_url = dgraph_url
         self.redis_url = redis_url
         self.enable_cache = enable_cache
+        self.max_memory_records = max_memory_records
+        # Under a memory budget, the record and provenance cache tiers each hold at most a tenth of it and the memory store the rest
+        cache_share: int | None = None
+        self._memory_budget = max_memory_records
+        if max_memory_records is not None and enable_cache:
+            cache_share = max_memory_records // 10
+            self._memory_budget = max_memory_records - 2 * cache_share
+        self._cache = (
+            TieredCache(
+                cache_size if cache_share is None else min(cache_size, cache_share),
+                cache_ttl,
+                redis_url,
+                max_provenance_records=DEFAULT_PROVENANCE_CACHE_RECORDS if cache_share is None else min(DEFAULT_PROVENANCE_CACHE_RECORDS, cache_share),
+            )
+            if enable_cache
+            else None
+        )
+        self._postgres = PostgresAuditBackend(postgres_url) if postgres_url else None
+        self._sqlite = SQLiteAuditBackend(sqlite_path) if sqlite_path is not None else None
+        # Queryable database serving filters, statistics and integrity checks (Postgres preferred)
+        self._database: PostgresAuditBackend | SQLiteAuditBackend | None = self._postgres or self._sqlite
+        self._database_name = "postgres" if self._postgres is not None else "sqlite"
+        # Record relationships, embedded on request unless a graph database is configured
+        self._graph = ProvenanceGraph(graph_path) if (enable_graph or graph_path is not None) and not dgraph_url else None
+
+        # Slower backends, written concurrently (through a bounded queue each in write-behind mode)
+        self._writers = self._backend_writers()
+        self.write_behind = write_behind
+        self._queues = (
+            {name: WriteBehindQueue(name, write, write_queue_size, write_batch_size) for name, write in self._writers.items()} if write_behind else {}
+        )
 
         # In-memory fallback when databases not configured
         self._memory_store: dict[str, AuditRecord] = {}
+        # Without a database, records evicted from memory are paged out to disk instead of dropped
+        self._spill = SpillStore(spill_path) if max_memory_records is not None and self._database is None else None
+        # (timestamp, record_id) keys in ascending order for keyset pagination
+        self._order: list[tuple[datetime, str]] = []
+        # Target -> chronological record ids for provenance lookups
+        self._targets = TargetIndex()
+        # Counters maintained on store so statistics are O(1)
+        self._stats = AuditStatistics()
+        self._rollups = AuditRollups()
+        # Reloaded spilled records are read once for every lookup
+        for record in self._spill or ():
+            self._order.append((record.timestamp, record.record_id))
+            self._targets.add(record)
+            self._stats.add(record)
+            self._rollups.add([record])
+        self._order.sort()
 
         logger.info(
             f"Audit store initialized (postgres={'configured' if postgres_url else 'memory'}, "
-            f"dgraph={'configured' if dgraph_url else 'memory'}, "
-            f"cache={'enabled' if enable_cache else 'disabled'})"
+            f"sqlite={self._sqlite.path if self._sqlite else 'disabled'}, "
+            f"dgraph={'configured' if dgraph_url else 'embedded' if self._graph is not None else 'disabled'}, "
+            f"cache={'enabled' if enable_cache else 'disabled'}, "
+            f"write_behind={'enabled' if write_behind else 'disabled'})"
         )
 
     async def store_record(self, record: AuditRecord) -> None:
@@ -63,21 +158,34 @@ class AuditStore:
             raise ValueError(msg)
 
         # Store in memory (always available)
-        self._memory_store[record.record_id] = record
+        self._store_memory([record])
 
-        # TODO: Store in Postgres when configured
-        if self.postgres_url:
-            await self._store_postgres(record)
+        await self._store_backends([record])
 
-        # TODO: Store in Dgraph when configured
-        if self.dgraph_url:
-            await self._store_dgraph(record)
+        logger.debug(f"Stored audit record: {record.record_id} (action={record.action}, target={record.target})")
 
-        # TODO: Cache in Redis when configured
-        if self.enable_cache and self.redis_url:
-            await self._cache_redis(record)
+    async def store_records(self, records: list[AuditRecord]) -> None:
+        """
+        Store a batch of audit records as one bulk write per backend.
 
-        logger.debug(f"Stored audit record: {record.record_id} (action={record.action}, target={record.target})")
+        Args:
+            records: Audit records to store
+
+        Raises:
+            ValueError: If any record is invalid (nothing is stored)
+        """
+        # Verify the whole batch before storing any of it
+        for record in records:
+            if not record.verify():
+                msg = f"Cannot store invalid record: {record.record_id}"
+                raise ValueError(msg)
+
+        # Store in memory (always available)
+        self._store_memory(records)
+
+        await self._store_backends(records)
+
+        logger.debug(f"Stored {len(records)} audit records in bulk")
 
     async def get_record(self, record_id: str) -> AuditRecord | None:
         """
@@ -90,18 +198,23 @@ class AuditStore:
             Audit record if found, None otherwise
         """
         # Try cache first
-        if self.enable_cache and self.redis_url:
-            cached = await self._get_redis(record_id)
+        if self._cache is not None:
+            cached = await self._cache.get(record_id)
             if cached:
                 return cached
 
-        # Try memory store
-        if record_id in self._memory_store:
-            return self._memory_store[record_id]
+        # Try memory store, then records spilled to disk
+        record = self._load(record_id)
+        if record is not None:
+            return record
 
-        # Try Postgres
-        if self.postgres_url:
-            return await self._get_postgres(record_id)
+        # Try the database, caching what it returns
+        if self._database is not None:
+            await self._catch_up()
+            record = await self._database.get_record(record_id)
+            if record is not None and self._cache is not None:
+                await self._cache.put([record])
+            return record
 
         return None
 
@@ -113,116 +226,385 @@ class AuditStore:
             audit_filter: Filter criteria
 
         Returns:
-            List of matching audit records
+            List of matching audit records, newest first
+
+        Raises:
+            ValueError: If the filter's cursor is malformed
         """
-        # For now, use in-memory filtering
-        # TODO: Push filters to database for efficiency
+        # Push filters down to SQL when a database is configured
+        if self._database is not None:
+            await self._catch_up()
+            return await self._database.query_records(audit_filter)
+
+        # Keys are walked newest first, so the executor stops as soon as the page is full
+        return select_top_k(self._memory_candidates(audit_filter), audit_filter)
 
-        all_records = list(self._memory_store.values())
+    async def stream_records(self, audit_filter: AuditFilter, page_size: int = DEFAULT_STREAM_PAGE_SIZE) -> AsyncIterator[AuditRecord]:
+        """
+        Stream records matching a filter, newest first.
 
-        # Apply filters
-        matches = [record for record in all_records if audit_filter.matches(record)]
+        Records are fetched one keyset page at a time, so memory stays bounded
+        by the page size however many records match.
 
-        # Sort by timestamp (newest first)
-        matches.sort(key=lambda r: r.timestamp, reverse=True)
+        Args:
+            audit_filter: Filter criteria; limit caps the total number of records streamed
+            page_size: Records fetched per page
 
-        # Apply limit and offset
-        return matches[audit_filter.offset : audit_filter.offset + audit_filter.limit]
+        Yields:
+            Matching audit records, newest first
 
-    async def get_provenance_chain(self, target: str) -> list[AuditRecord]:
+        Raises:
+            ValueError: If the filter's cursor is malformed
+        """
+        remaining = audit_filter.limit
+        page_filter: AuditFilter | None = audit_filter
+        while page_filter is not None and remaining > 0:
+            page_filter = page_filter.model_copy(update={"limit": min(page_size, remaining)})
+            page = await self.query_records(page_filter)
+            for record in page:
+                yield record
+            remaining -= len(page)
+            page_filter = page_filter.next_page(page) if len(page) == page_filter.limit else None
+
+    async def get_provenance_chain(self, target: str, prefix: bool = False) -> list[AuditRecord]:
         """
         Get complete provenance chain for a target.
 
         Args:
             target: Target identifier (file path, module name, etc.)
+            prefix: Include every target under ``target``, e.g. a directory or module path
 
         Returns:
             List of audit records affecting this target, in chronological order
         """
-        # Query all records for this target
-        audit_filter = AuditFilter(limit=10000)  # Large limit for complete history
-
-        all_records = await self.query_records(audit_filter)
+        # Hot targets are answered from the cache, which stays current on write-through
+        if self._cache is not None and not prefix:
+            cached = self._cache.get_provenance(target)
+            if cached is not None:
+                return cached
 
-        # Filter by target
-        provenance = [record for record in all_records if record.target == target]
+        if self._database is not None:
+            await self._catch_up()
+            provenance = await self._database.get_provenance(target, prefix)
+        else:
+            record_ids = self._targets.prefix_chain(target) if prefix else self._targets.chain(target)
+            provenance = [record for record in map(self._load, record_ids) if record is not None]
 
-        # Sort chronologically (oldest first for provenance)
-        provenance.sort(key=lambda r: r.timestamp)
+        logger.debug(f"Found {len(provenance)} provenance records for target{' prefix' if prefix else ''}: {target}")
 
-        logger.debug(f"Found {len(provenance)} provenance records for target: {target}")
+        if self._cache is not None and not prefix:
+            self._cache.put_provenance(target, provenance)
 
         return provenance
 
-    async def verify_integrity(self) -> bool:
+    async def get_related_records(self, node: str, max_hops: int = 3, predicates: Collection[str] | None = None) -> list[AuditRecord]:
         """
-        Verify integrity of stored records.
+        Find records related to a record, target, actor, finding, violation or signer.
+
+        Follows relationships in the provenance graph in either direction, so
+        records are never scanned. For example, the records reachable from a
+        violation's file within 3 hops are
+        ``get_related_records(ProvenanceGraph.node("violation", violation_id))``.
+
+        Args:
+            node: Start node id from ``ProvenanceGraph.node``
+            max_hops: Maximum number of relationships followed from the start node
+            predicates: Only follow these relationships (all of ``PREDICATES`` if None)
 
         Returns:
-            True if all stored records are valid
+            Related records ordered by distance from the start node
+
+        Raises:
+            RuntimeError: If the embedded graph is not enabled (or a Dgraph server is configured instead)
         """
-        invalid_count = 0
+        if self._graph is None:
+            msg = "Relationship queries are only supported by the embedded provenance graph (enable_graph=True)"
+            raise RuntimeError(msg)
+
+        await self._catch_up("graph")
+        records = []
+        for record_id in self._graph.reachable_records(node, max_hops, predicates):
+            record = await self.get_record(record_id)
+            if record is not None:
+                records.append(record)
+        return records
+
+    async def verify_integrity(self, parallel: bool = False, workers: int | None = None, chunk_size: int = DEFAULT_VERIFY_CHUNK_SIZE) -> bool:
+        """
+        Verify integrity of stored records.
 
-        for record_id, record in self._memory_store.items():
-            if not record.verify():
-                logger.error(f"Record {record_id} failed integrity check")
-                invalid_count += 1
+        Args:
+            parallel: Verify chunks of records across a process pool
+            workers: Worker processes in parallel mode (defaults to CPU count)
+            chunk_size: Records per chunk in parallel mode
 
-        if invalid_count > 0:
-            logger.error(f"Found {invalid_count} invalid records in store")
+        Returns:
+            True if all stored records are valid
+        """
+        if self._database is not None:
+            # The database also holds records stored before this process started
+            await self._catch_up()
+
+        # Check chunks as they stream in, keeping only a bounded number in flight
+        checked = invalid = 0
+        if parallel:
+            loop = asyncio.get_running_loop()
+            max_pending = 2 * (workers or os.cpu_count() or 1)
+            pending: deque[asyncio.Future[list[str]]] = deque()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                async for chunk in self._integrity_chunks(chunk_size):
+                    checked += len(chunk)
+                    pending.append(loop.run_in_executor(pool, find_invalid_records, chunk))
+                    if len(pending) >= max_pending:
+                        invalid += _log_invalid(await pending.popleft())
+                for future in pending:
+                    invalid += _log_invalid(await future)
+        else:
+            async for chunk in self._integrity_chunks(chunk_size):
+                checked += len(chunk)
+                invalid += _log_invalid(find_invalid_records(chunk))
+
+        if invalid:
+            logger.error(f"Found {invalid} invalid records in store")
             return False
 
-        logger.info(f"All {len(self._memory_store)} records verified successfully")
+        logger.info(f"All {checked} records verified successfully")
         return True
 
+    async def _integrity_chunks(self, chunk_size: int) -> AsyncIterator[list[AuditRecord]]:
+        """Yield every stored record in chunks: database batches if there is a database, else memory then spilled records."""
+        if self._database is not None:
+            async for batch in self._database.iter_records(chunk_size):
+                yield batch
+            return
+        # Snapshot the in-memory references so stores made while checking cannot resize the dict mid-iteration
+        for records in (iter(list(self._memory_store.values())), iter(self._spill or ())):
+            while chunk := list(islice(records, chunk_size)):
+                yield chunk
+
     async def get_statistics(self) -> dict[str, Any]:
         """
         Get storage statistics.
 
         Returns:
-            Dictionary with storage metrics
-        """
-        records = list(self._memory_store.values())
-
-        if not records:
-            return {
-                "total_records": 0,
-                "storage_backend": "memory",
-            }
-
-        return {
-            "total_records": len(records),
-            "storage_backend": "memory",
-            "earliest_record": min(r.timestamp for r in records).isoformat(),
-            "latest_record": max(r.timestamp for r in records).isoformat(),
-            "total_findings": sum(len(r.findings) for r in records),
-            "total_violations": sum(len(r.violations) for r in records),
-            "signed_records": sum(1 for r in records if r.signatures),
-        }
-
-    # Private helper methods for database backends (to be implemented)
-
-    async def _store_postgres(self, record: AuditRecord) -> None:
-        """Store record in PostgreSQL."""
-        # TODO: Implement PostgreSQL storage
-        logger.debug(f"PostgreSQL storage not yet implemented for {record.record_id}")
-
-    async def _store_dgraph(self, record: AuditRecord) -> None:
-        """Store record in Dgraph."""
-        # TODO: Implement Dgraph storage
-        logger.debug(f"Dgraph storage not yet implemented for {record.record_id}")
+            Dictionary with storage metrics (plus cache counters when caching is enabled
+            and per-backend pending records and lag in write-behind mode)
+        """
+        stats = await self._storage_statistics()
+        if self._cache is not None:
+            stats["cache"] = self._cache.statistics()
+        if self._graph is not None:
+            stats["graph"] = self._graph.statistics()
+        if self._queues:
+            stats["write_behind"] = {name: queue.statistics() for name, queue in self._queues.items()}
+        return stats
+
+    async def get_rollups(
+        self,
+        granularity: str,
+        dimension: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        values: Sequence[str] | None = None,
+        severity: AuditSeverity | str | None = None,
+    ) -> list[RollupBucket]:
+        """
+        Read time-bucketed counts without reading records.
 
-    async def _cache_redis(self, record: AuditRecord) -> None:
-        """Cache record in Redis."""
-        # TODO: Implement Redis caching
-        logger.debug(f"Redis caching not yet implemented for {record.record_id}")
+        Buckets are materialized as records are stored: in memory, or in the
+        database's ``audit_rollups`` table. The ``rule`` dimension counts
+        violations by rule; the others count records. Actor, action,
+        target_type and rule counts are also kept per severity, so errors per
+        hour per actor is ``get_rollups("hour", "actor", severity="error")``.
+        A database filled before severity splits existed needs
+        ``rebuild_rollups`` to answer split queries.
 
-    async def _get_redis(self, _record_id: str) -> AuditRecord | None:
-        """Get record from Redis cache."""
-        # TODO: Implement Redis retrieval
-        return None
+        Args:
+            granularity: Bucket width: minute, hour or day
+            dimension: severity, actor, action, target_type or rule
+            since: Earliest bucket start (inclusive, unbounded if None)
+            until: Latest bucket start (inclusive, unbounded if None)
+            values: Only these dimension values, e.g. ``["error"]`` for severity (all if None)
+            severity: Only count records (violations, for rules) of this severity (all if None)
 
-    async def _get_postgres(self, _record_id: str) -> AuditRecord | None:
-        """Get record from PostgreSQL."""
-        # TODO: Implement PostgreSQL retrieval
-        return None
+        Returns:
+            Buckets ordered by start, then value
+
+        Raises:
+            ValueError: If the granularity or dimension is unknown, or a severity split is requested for severity itself
+        """
+        validate_rollup_query(granularity, dimension, severity)
+        if self._database is not None:
+            await self._catch_up()
+            return await self._database.get_rollups(granularity, dimension, since, until, values, severity)
+        return self._rollups.query(granularity, dimension, since, until, values, severity)
+
+    async def rebuild_rollups(self) -> None:
+        """Recount every rollup bucket from the stored records (e.g. for a database written before rollups existed)."""
+        if self._database is not None:
+            await self._catch_up()
+            await self._database.rebuild_rollups()
+            return
+        self._rollups = AuditRollups(self._memory_store.values())
+        if self._spill is not None:
+            self._rollups.add(self._spill)
+
+    async def flush(self) -> None:
+        """Wait until background writes have reached every backend (no-op without write-behind)."""
+        await asyncio.gather(*(queue.flush() for queue in self._queues.values()))
+
+    async def _storage_statistics(self) -> dict[str, Any]:
+        """Compute metrics of the database, or read the maintained in-memory counters."""
+        if self._database is not None:
+            await self._catch_up()
+            return await self._database.get_statistics()
+
+        stats = self._stats.store_statistics()
+        if self._spill is not None:
+            stats["spilled_records"] = len(self._spill)
+        return stats
+
+    async def verify_statistics(self) -> bool:
+        """
+        Check the maintained statistics against a full recount, replacing them if they drifted.
+
+        Statistics of a database-backed store are computed by the database, so
+        there is nothing to check.
+
+        Returns:
+            True if the maintained counters matched the recount
+        """
+        if self._database is not None:
+            return True
+
+        rebuilt = AuditStatistics(self._memory_store.values())
+        for record in self._spill or ():
+            rebuilt.add(record)
+        consistent = self._stats == rebuilt
+        if not consistent:
+            logger.warning("Audit store statistics drifted from a full recount; rebuilt them")
+        self._stats = rebuilt
+        return consistent
+
+    async def close(self) -> None:
+        """Flush background writes, then close database and cache connections."""
+        await self.flush()
+        if self._cache is not None:
+            await self._cache.close()
+        if self._postgres is not None:
+            await self._postgres.close()
+        if self._sqlite is not None:
+            self._sqlite.close()
+        if self._spill is not None:
+            self._spill.close()
+        if self._graph is not None:
+            self._graph.close()
+
+    def _store_memory(self, records: list[AuditRecord]) -> None:
+        """Hold records in memory, evicting the oldest ones beyond the memory budget."""
+        for record in records:
+            if self._database is None:
+                # Queries and statistics are served by the database when one is configured
+                self._index_record(record)
+            if self._spill is not None:
+                self._spill.discard(record.record_id)
+            self._memory_store[record.record_id] = record
+
+        if self._memory_budget is None or len(self._memory_store) <= self._memory_budget:
+            return
+        # Evict down to 90% of the budget so eviction is batched rather than per store
+        excess = len(self._memory_store) - (self._memory_budget - self._memory_budget // 10)
+        evicted = [self._memory_store.pop(record_id) for record_id in list(islice(self._memory_store, excess))]
+        if self._spill is not None:
+            self._spill.extend(evicted)
+        logger.debug(f"Evicted {len(evicted)} audit records from memory ({'spilled to disk' if self._spill is not None else 'kept in database'})")
+
+    def _memory_candidates(self, audit_filter: AuditFilter) -> Iterator[AuditRecord]:
+        """Yield records held in memory or spilled, newest first, from the cursor (or until bound) down to the since bound."""
+        hi = len(self._order)
+        cursor_key = audit_filter.cursor_key()
+        if cursor_key is not None:
+            hi = bisect_left(self._order, cursor_key)
+        if audit_filter.until:
+            hi = min(hi, bisect_right(self._order, audit_filter.until, key=lambda key: key[0]))
+
+        for i in range(hi - 1, -1, -1):
+            timestamp, record_id = self._order[i]
+            if audit_filter.since and timestamp < audit_filter.since:
+                return
+            record = self._load(record_id)
+            if record is not None:
+                yield record
+
+    def _load(self, record_id: str) -> AuditRecord | None:
+        """Return a record held in memory or paged back from the spill store."""
+        record = self._memory_store.get(record_id)
+        if record is None and self._spill is not None:
+            record = self._spill.get(record_id)
+        return record
+
+    def _index_record(self, record: AuditRecord) -> None:
+        """Add a record to the time-ordered keys, target index and statistics, or recount it if already stored."""
+        previous = self._load(record.record_id)
+        if previous is not None:
+            self._stats.replace(previous, record)
+            return
+
+        key = (record.timestamp, record.record_id)
+        if not self._order or self._order[-1] < key:
+            self._order.append(key)
+        else:
+            insort(self._order, key)
+        self._targets.add(record)
+        self._stats.add(record)
+        self._rollups.add([record])
+
+    async def _catch_up(self, backend: str | None = None) -> None:
+        """Wait for background writes to a backend (the database by default) so reads see every stored record."""
+        queue = self._queues.get(backend or self._database_name)
+        if queue is not None:
+            await queue.flush()
+
+    def _backend_writers(self) -> dict[str, Callable[[list[AuditRecord]], Awaitable[None]]]:
+        """Map each configured backend beyond memory to its bulk write."""
+        writers: dict[str, Callable[[list[AuditRecord]], Awaitable[None]]] = {}
+        if self._sqlite is not None:
+            writers["sqlite"] = self._sqlite.store_records
+        if self._postgres is not None:
+            writers["postgres"] = self._postgres.store_records
+        # TODO: Store in Dgraph when configured
+        if self.dgraph_url:
+            writers["dgraph"] = self._store_dgraph
+        if self._graph is not None:
+            writers["graph"] = self._store_graph
+        if self._cache is not None and self._cache.remote is not None:
+            writers["redis"] = self._cache.remote.set
+        return writers
+
+    async def _store_backends(self, records: list[AuditRecord]) -> None:
+        """Write records to every configured backend concurrently, or queue them in write-behind mode."""
+        # The in-process cache tier is written synchronously, like memory
+        if self._cache is not None:
+            self._cache.put_local(records)
+
+        if self._queues:
+            await asyncio.gather(*(queue.put(records) for queue in self._queues.values()))
+        else:
+            await asyncio.gather(*(write(records) for write in self._writers.values()))
+
+    async def _store_graph(self, records: list[AuditRecord]) -> None:
+        """Link records in the embedded provenance graph."""
+        if self._graph is not None:
+            self._graph.add_records(records)
+
+    async def _store_dgraph(self, records: list[AuditRecord]) -> None:
+        """Store records in Dgraph."""
+        # TODO: Implement Dgraph storage
+        logger.debug(f"Dgraph storage not yet implemented for {len(records)} records")
+
+
+def _log_invalid(record_ids: list[str]) -> int:
+    """Log each record id that failed the integrity check and return how many there were."""
+    for record_id in record_ids:
+        logger.error(f"Record {record_id} failed integrity check")
+    return len(record_ids)
@@ -0,0 +1,380 @@
+"""Tiered read cache for audit records: in-process LRU/TTL plus an optional Redis-protocol tier."""
+
+import asyncio
+import time
+from bisect import insort
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .models import AuditRecord
+from .serialization import decode_record, encode_record
+
+DEFAULT_CACHE_SIZE = 10000  # Records held by the in-process tier
+DEFAULT_PROVENANCE_CACHE_SIZE = 1000  # Targets whose provenance chain is held in process
+DEFAULT_PROVENANCE_CACHE_RECORDS = 10000  # Records across all provenance chains held in process
+DEFAULT_REDIS_PORT = 6379
+REDIS_KEY_PREFIX = "audit:record:"
+
+
+class LRUCacheTier:
+    """
+    Size-bounded in-process cache with least-recently-used eviction and optional TTL.
+
+    Entries may carry a weight, such as the number of records in a cached
+    list, and the tier can be bounded by total weight as well as by entries.
+    Expired entries are dropped when they are read, and count as evictions.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float | None = None, max_weight: int | None = None) -> None:
+        """
+        Initialize LRU tier.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            ttl: Seconds an entry stays valid (no expiry if None)
+            max_weight: Maximum total weight of cached entries (unbounded if None)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[key]
+            self._weight -= entry[2]
+            self.evictions += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key: str) -> Any | None:
+        """Return a live entry without touching recency or counters."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None and entry[0] >= time.monotonic() else None
+
+    def set(self, key: str, value: Any, weight: int = 1) -> None:
+        """
+        Insert or replace an entry, evicting the least recently used ones if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            weight: Entry's share of ``max_weight``
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._weight -= previous[2]
+        self._entries[key] = (expires_at, value, weight)
+        self._weight += weight
+        self._evict()
+
+    def reweigh(self, key: str, weight: int) -> None:
+        """
+        Update the weight of an entry whose value grew in place, evicting if now over budget.
+
+        Args:
+            key: Cache key
+            weight: New weight
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], entry[1], weight)
+            self._weight += weight - entry[2]
+            self._evict()
+
+    def statistics(self) -> dict[str, int]:
+        """Return hit, miss and eviction counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within both bounds."""
+        while self._entries and (len(self._entries) > self.max_entries or (self.max_weight is not None and self._weight > self.max_weight)):
+            self._weight -= self._entries.popitem(last=False)[1][2]
+            self.evictions += 1
+
+
+class RedisCacheTier:
+    """
+    Out-of-process record cache speaking the Redis protocol (RESP).
+
+    Works with Redis or any compatible server. Records are stored in their
+    compact serialized form; eviction is left to the server's TTL and
+    ``maxmemory`` policy. Connection failures degrade to cache misses so the
+    cache can never fail a store or a read.
+    """
+
+    def __init__(self, url: str, ttl: float | None = None, key_prefix: str = REDIS_KEY_PREFIX) -> None:
+        """
+        Initialize Redis tier (connects on first use).
+
+        Args:
+            url: Server URL, e.g. ``redis://:password@localhost:6379/0``
+            ttl: Seconds an entry stays valid (no expiry if None)
+            key_prefix: Prefix for record keys
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or DEFAULT_REDIS_PORT
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def get(self, record_id: str) -> AuditRecord | None:
+        """
+        Look up a record.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Cached record, or None on a miss or connection failure
+        """
+        replies = await self._execute([("GET", self.key_prefix + record_id)])
+        if not replies or replies[0] is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_record(replies[0])
+
+    async def set(self, records: list[AuditRecord]) -> None:
+        """
+        Write records in one pipelined round trip.
+
+        Args:
+            records: Records to cache
+        """
+        expiry = ("PX", str(int(self.ttl * 1000))) if self.ttl is not None else ()
+        await self._execute([("SET", self.key_prefix + record.record_id, encode_record(record), *expiry) for record in records])
+
+    def statistics(self) -> dict[str, int]:
+        """Return hit, miss and error counters."""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None and self._loop is asyncio.get_running_loop():
+            self._writer.close()
+            await self._writer.wait_closed()
+        self._reader = self._writer = None
+
+    async def _execute(self, commands: list[tuple[str | bytes, ...]]) -> list[Any] | None:
+        """Send pipelined commands and read their replies; None if the server is unreachable."""
+        if not commands:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams and locks are bound to the loop that created them
+            self._loop, self._lock = loop, asyncio.Lock()
+            self._reader = self._writer = None
+
+        assert self._lock is not None
+        async with self._lock:
+            try:
+                reader, writer = await self._connect()
+                writer.write(b"".join(_encode_command(command) for command in commands))
+                await writer.drain()
+                return [await _read_reply(reader) for _ in commands]
+            except (OSError, asyncio.IncompleteReadError, RuntimeError) as exc:
+                self.errors += 1
+                self._reader = self._writer = None
+                logger.warning(f"Redis cache unavailable at {self.host}:{self.port}: {exc}")
+                return None
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open the connection if needed, authenticating and selecting the database."""
+        if self._reader is None or self._writer is None or self._writer.is_closing():
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            setup: list[tuple[str | bytes, ...]] = []
+            if self.password:
+                setup.append(("AUTH", self.password))
+            if self.db:
+                setup.append(("SELECT", str(self.db)))
+            writer.write(b"".join(_encode_command(command) for command in setup))
+            for _ in setup:
+                await _read_reply(reader)
+            self._reader, self._writer = reader, writer
+        return self._reader, self._writer
+
+
+def _encode_command(command: tuple[str | bytes, ...]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [f"*{len(command)}\r\n".encode()]
+    for arg in command:
+        data = arg.encode() if isinstance(arg, str) else arg
+        parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply."""
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        msg = f"Redis error: {payload.decode()}"
+        raise RuntimeError(msg)
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [await _read_reply(reader) for _ in range(length)]
+    msg = f"Unexpected Redis reply: {line!r}"
+    raise RuntimeError(msg)
+
+
+class TieredCache:
+    """
+    Read-through, write-through record cache over an in-process tier and an optional Redis tier.
+
+    Hits in the Redis tier are promoted into the in-process tier. Provenance
+    chains of hot targets are cached in process and kept current as records
+    are written through, so repeated lookups never reach the durable backend.
+    The provenance tier is bounded by targets and by records across chains.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: float | None = None,
+        redis_url: str | None = None,
+        max_provenance_targets: int = DEFAULT_PROVENANCE_CACHE_SIZE,
+        max_provenance_records: int = DEFAULT_PROVENANCE_CACHE_RECORDS,
+    ) -> None:
+        """
+        Initialize tiered cache.
+
+        Args:
+            max_entries: Records held in process
+            ttl: Seconds an entry stays valid in every tier (no expiry if None)
+            redis_url: Redis-protocol server for the shared tier (in-process only if None)
+            max_provenance_targets: Targets whose provenance chain is held in process
+            max_provenance_records: Records across all provenance chains held in process
+        """
+        self.local = LRUCacheTier(max_entries, ttl)
+        self.remote = RedisCacheTier(redis_url, ttl) if redis_url else None
+        # Entries are (chronological records, their ids), weighted by record count
+        self.provenance = LRUCacheTier(max_provenance_targets, ttl, max_provenance_records)
+
+    async def get(self, record_id: str) -> AuditRecord | None:
+        """
+        Look up a record in each tier in turn.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Cached record, or None if no tier has it
+        """
+        record = self.local.get(record_id)
+        if record is None and self.remote is not None:
+            record = await self.remote.get(record_id)
+            if record is not None:
+                self.local.set(record_id, record)
+        return record
+
+    async def put(self, records: list[AuditRecord]) -> None:
+        """
+        Write records through every tier and into cached provenance chains.
+
+        Args:
+            records: Newly stored records
+        """
+        self.put_local(records)
+        if self.remote is not None:
+            await self.remote.set(records)
+
+    def put_local(self, records: list[AuditRecord]) -> None:
+        """
+        Write records into the in-process tier and cached provenance chains only.
+
+        Args:
+            records: Newly stored records
+        """
+        for record in records:
+            self.local.set(record.record_id, record)
+            entry = self.provenance.peek(record.target)
+            if entry is None or record.record_id in entry[1]:
+                continue
+            chain, record_ids = entry
+            record_ids.add(record.record_id)
+            key = (record.timestamp, record.record_id)
+            if not chain or (chain[-1].timestamp, chain[-1].record_id) < key:
+                chain.append(record)
+            else:
+                insort(chain, record, key=lambda r: (r.timestamp, r.record_id))
+            self.provenance.reweigh(record.target, len(chain))
+
+    def get_provenance(self, target: str) -> list[AuditRecord] | None:
+        """
+        Look up the cached provenance chain of a target.
+
+        Args:
+            target: Target identifier
+
+        Returns:
+            Copy of the chronological chain, or None if not cached
+        """
+        entry = self.provenance.get(target)
+        return list(entry[0]) if entry is not None else None
+
+    def put_provenance(self, target: str, records: list[AuditRecord]) -> None:
+        """
+        Cache the provenance chain of a target.
+
+        Args:
+            target: Target identifier
+            records: Records affecting the target in chronological order
+        """
+        self.provenance.set(target, (list(records), {record.record_id for record in records}), len(records))
+
+    def statistics(self) -> dict[str, dict[str, int]]:
+        """Return counters for each tier."""
+        stats = {"local": self.local.statistics(), "provenance": self.provenance.statistics()}
+        if self.remote is not None:
+            stats["redis"] = self.remote.statistics()
+        return stats
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self.remote is not None:
+            await self.remote.close()
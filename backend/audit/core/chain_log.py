@@ -0,0 +1,332 @@
+"""Disk-backed segmented append-only log for audit chain records."""
+
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO, overload
+
+from loguru import logger
+
+from .models import AuditRecord
+from .serialization import decode_record, encode_record
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024  # 64 MiB per segment file
+
+# Frame layout in a segment file: payload length, CRC32 of payload, payload
+_FRAME_HEADER = struct.Struct("<II")
+# Entry layout in an index file: byte offset of the frame within its segment
+_INDEX_ENTRY = struct.Struct("<Q")
+
+_LOG_SUFFIX = ".log"
+_INDEX_SUFFIX = ".idx"
+
+
+class _Segment:
+    """Single segment: a frame file plus its fixed-width offset index."""
+
+    __slots__ = ("_index_map", "_log_map", "base_index", "count", "index_path", "log_path", "size")
+
+    def __init__(self, directory: Path, base_index: int) -> None:
+        self.base_index = base_index
+        self.log_path = directory / f"{base_index:020d}{_LOG_SUFFIX}"
+        self.index_path = directory / f"{base_index:020d}{_INDEX_SUFFIX}"
+        self.count = 0
+        self.size = 0
+        self._log_map: mmap.mmap | None = None
+        self._index_map: mmap.mmap | None = None
+
+    def read(self, local_index: int) -> bytes:
+        """Read the payload of the frame at ``local_index`` through the memory maps."""
+        index_map = self._index_map = _ensure_map(self._index_map, self.index_path, (local_index + 1) * _INDEX_ENTRY.size)
+        (offset,) = _INDEX_ENTRY.unpack_from(index_map, local_index * _INDEX_ENTRY.size)
+
+        log_map = self._log_map = _ensure_map(self._log_map, self.log_path, offset + _FRAME_HEADER.size)
+        length, checksum = _FRAME_HEADER.unpack_from(log_map, offset)
+        start = offset + _FRAME_HEADER.size
+        log_map = self._log_map = _ensure_map(log_map, self.log_path, start + length)
+
+        payload = log_map[start : start + length]
+        if zlib.crc32(payload) != checksum:
+            msg = f"Corrupt frame {self.base_index + local_index} in {self.log_path.name}"
+            raise ValueError(msg)
+        return payload
+
+    def unmap(self) -> None:
+        """Release memory maps held for this segment."""
+        for mapped in (self._log_map, self._index_map):
+            if mapped is not None:
+                mapped.close()
+        self._log_map = None
+        self._index_map = None
+
+
+def _ensure_map(current: mmap.mmap | None, path: Path, required: int) -> mmap.mmap:
+    """Return a read-only map of ``path`` covering at least ``required`` bytes, remapping if it grew."""
+    if current is not None and len(current) >= required:
+        return current
+    if current is not None:
+        current.close()
+    with path.open("rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < required:
+        mapped.close()
+        msg = f"Segment file {path.name} is shorter than its index"
+        raise ValueError(msg)
+    return mapped
+
+
+class SegmentedChainLog:
+    """
+    Append-only sequence of audit records persisted as fixed-size segment files.
+
+    Each segment is a pair of files named after the chain index of its first
+    record: ``<base>.log`` holds length-prefixed, CRC-checked record frames and
+    ``<base>.idx`` holds one fixed-width frame offset per record. Opening the
+    log only stats the segment files and recovers the tail of the active
+    segment, so it is independent of chain length. Reads go through
+    memory-mapped segments and only the latest record is kept on the heap.
+    """
+
+    def __init__(self, path: str | Path, segment_size: int = DEFAULT_SEGMENT_SIZE, sync: bool = False, read_only: bool = False) -> None:
+        """
+        Open or create a segmented chain log.
+
+        Args:
+            path: Directory holding the segment files
+            segment_size: Maximum size in bytes of a segment before rolling to a new one
+            sync: fsync segment and index files after every append
+            read_only: Open without tail recovery for concurrent readers (appends are rejected)
+        """
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.sync = sync
+        self.read_only = read_only
+        if not read_only:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+        self._segments: list[_Segment] = []
+        self._bases: list[int] = []
+        self._length = 0
+        self._latest: AuditRecord | None = None
+        self._log_handle: BinaryIO | None = None
+        self._index_handle: BinaryIO | None = None
+
+        for log_path in sorted(self.path.glob(f"*{_LOG_SUFFIX}")):
+            segment = _Segment(self.path, int(log_path.stem))
+            segment.size = log_path.stat().st_size
+            segment.count = segment.index_path.stat().st_size // _INDEX_ENTRY.size if segment.index_path.exists() else 0
+            self._segments.append(segment)
+            self._bases.append(segment.base_index)
+
+        if self._segments:
+            if not read_only:
+                self._recover_tail(self._segments[-1])
+            last = self._segments[-1]
+            self._length = last.base_index + last.count
+
+        logger.debug(f"Opened chain log at {self.path} ({self._length} records, {len(self._segments)} segments)")
+
+    def __len__(self) -> int:
+        """Return number of records in the log."""
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> AuditRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[AuditRecord]: ...
+
+    def __getitem__(self, index: int | slice) -> AuditRecord | list[AuditRecord]:
+        """Read record(s) by chain position."""
+        if isinstance(index, slice):
+            return [self._read(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            msg = "chain log index out of range"
+            raise IndexError(msg)
+        return self._read(index)
+
+    def __iter__(self) -> Iterator[AuditRecord]:
+        """Iterate records from oldest to newest."""
+        return self.iter_from(0)
+
+    def __reversed__(self) -> Iterator[AuditRecord]:
+        """Iterate records from newest to oldest."""
+        for i in range(self._length - 1, -1, -1):
+            yield self._read(i)
+
+    def iter_from(self, start: int) -> Iterator[AuditRecord]:
+        """
+        Iterate records from ``start`` to the end of the log.
+
+        Args:
+            start: Chain position of the first record to yield
+
+        Yields:
+            Audit records in chain order
+        """
+        for i in range(max(start, 0), self._length):
+            yield self._read(i)
+
+    def append(self, record: AuditRecord) -> None:
+        """
+        Append record to the active segment, rolling to a new segment when full.
+
+        Args:
+            record: Audit record to append
+        """
+        self.extend([record])
+
+    def extend(self, records: list[AuditRecord]) -> None:
+        """
+        Append records as one group commit with a single flush (and fsync).
+
+        Args:
+            records: Audit records to append in order
+
+        Raises:
+            ValueError: If the log was opened read-only
+        """
+        if self.read_only:
+            msg = f"Chain log at {self.path} is open read-only"
+            raise ValueError(msg)
+        if not records:
+            return
+
+        for record in records:
+            payload = encode_record(record)
+            frame = _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+            active = self._segments[-1] if self._segments else None
+            if active is None or (active.count > 0 and active.size + len(frame) > self.segment_size):
+                active = self._roll()
+
+            log_handle, index_handle = self._open_handles(active)
+            log_handle.write(frame)
+            index_handle.write(_INDEX_ENTRY.pack(active.size))
+
+            active.size += len(frame)
+            active.count += 1
+            self._length += 1
+
+        self._flush_handles()
+        self._latest = records[-1]
+
+    def close(self) -> None:
+        """Close open file handles and release memory maps."""
+        for handle in (self._log_handle, self._index_handle):
+            if handle is not None:
+                handle.close()
+        self._log_handle = None
+        self._index_handle = None
+        for segment in self._segments:
+            segment.unmap()
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segment files in the log."""
+        return len(self._segments)
+
+    def _read(self, index: int) -> AuditRecord:
+        """Decode record at a validated chain position."""
+        if index == self._length - 1 and self._latest is not None:
+            return self._latest
+        segment = self._segments[bisect_right(self._bases, index) - 1]
+        record = decode_record(segment.read(index - segment.base_index))
+        if index == self._length - 1:
+            self._latest = record
+        return record
+
+    def _roll(self) -> _Segment:
+        """Seal the active segment and start a new one."""
+        self._flush_handles()
+        for handle in (self._log_handle, self._index_handle):
+            if handle is not None:
+                handle.close()
+        self._log_handle = None
+        self._index_handle = None
+
+        segment = _Segment(self.path, self._length)
+        segment.log_path.touch()
+        segment.index_path.touch()
+        self._segments.append(segment)
+        self._bases.append(segment.base_index)
+        logger.debug(f"Rolled chain log to new segment {segment.log_path.name}")
+        return segment
+
+    def _flush_handles(self) -> None:
+        """Flush pending writes on the active segment, fsyncing if configured."""
+        for handle in (self._log_handle, self._index_handle):
+            if handle is not None:
+                handle.flush()
+                if self.sync:
+                    os.fsync(handle.fileno())
+
+    def _open_handles(self, segment: _Segment) -> tuple[BinaryIO, BinaryIO]:
+        """Open append handles on the active segment if not already open."""
+        if self._log_handle is None or self._index_handle is None:
+            self._log_handle = segment.log_path.open("ab")
+            self._index_handle = segment.index_path.open("ab")
+        return self._log_handle, self._index_handle
+
+    def _recover_tail(self, segment: _Segment) -> None:
+        """
+        Repair the active segment after an interrupted append.
+
+        Only the tail is inspected: index entries whose frames are torn are
+        dropped, complete frames written after the last index entry are
+        indexed, and any trailing partial frame is truncated.
+        """
+        valid = segment.count
+        end = 0
+        appended: list[int] = []
+        with segment.log_path.open("rb") as log_handle:
+            if valid:
+                with segment.index_path.open("rb") as index_handle:
+                    while valid:
+                        index_handle.seek((valid - 1) * _INDEX_ENTRY.size)
+                        (offset,) = _INDEX_ENTRY.unpack(index_handle.read(_INDEX_ENTRY.size))
+                        frame_end = _read_frame_end(log_handle, offset)
+                        if frame_end is not None:
+                            end = frame_end
+                            break
+                        valid -= 1
+
+            while (frame_end := _read_frame_end(log_handle, end)) is not None:
+                appended.append(end)
+                end = frame_end
+
+        index_size = segment.index_path.stat().st_size if segment.index_path.exists() else 0
+        if valid == segment.count and not appended and end == segment.size and index_size == valid * _INDEX_ENTRY.size:
+            return
+
+        logger.warning(
+            f"Recovering chain log segment {segment.log_path.name}: {segment.count} -> {valid + len(appended)} records, {segment.size} -> {end} bytes"
+        )
+        with segment.log_path.open("r+b") as handle:
+            handle.truncate(end)
+        with segment.index_path.open("a+b") as handle:
+            handle.truncate(valid * _INDEX_ENTRY.size)
+            handle.write(b"".join(_INDEX_ENTRY.pack(offset) for offset in appended))
+        segment.count = valid + len(appended)
+        segment.size = end
+
+
+def _read_frame_end(handle: BinaryIO, offset: int) -> int | None:
+    """Return end offset of the intact frame starting at ``offset``, or None if torn or corrupt."""
+    handle.seek(offset)
+    header = handle.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+    length: int
+    checksum: int
+    length, checksum = _FRAME_HEADER.unpack(header)
+    payload = handle.read(length)
+    if len(payload) < length or zlib.crc32(payload) != checksum:
+        return None
+    return offset + _FRAME_HEADER.size + length
@@ -0,0 +1,268 @@
+"""Streaming export of audit records to files and writers."""
+
+import csv
+import gzip
+import inspect
+import json
+import zlib
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from contextlib import ExitStack
+from datetime import datetime
+from enum import Enum
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol, TextIO
+
+import yaml
+
+from .models import AuditRecord
+from .schema import FINDING_COLUMNS, RECORD_COLUMNS, VIOLATION_COLUMNS
+
+EXPORT_FORMATS = ("jsonl", "json", "yaml")
+
+# Encoded output is gathered into chunks of about this size before each write
+DEFAULT_EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Tabular export: one file per table, with the columns of the matching SQL table. Child rows are written in list
+# order, so the storage-only ordinal column is left out.
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "records": RECORD_COLUMNS,
+    "findings": FINDING_COLUMNS[:-1],
+    "violations": VIOLATION_COLUMNS[:-1],
+}
+
+# libyaml's emitter when PyYAML was built with it, else the pure-Python one
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class AsyncWriter(Protocol):
+    """Destination with an awaitable ``write``, such as an aiofiles handle."""
+
+    async def write(self, data: bytes) -> Any:
+        """Write bytes."""
+
+
+class ExportWriter:
+    """
+    Incremental encoder for one export, emitting bounded chunks of output.
+
+    Records are encoded one at a time as JSON Lines, one JSON array or
+    multi-document YAML, optionally gzip-compressed, so memory stays at about
+    one chunk however many records pass through.
+    """
+
+    def __init__(self, export_format: str = "jsonl", compress: bool = False, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> None:
+        """
+        Initialize writer.
+
+        Args:
+            export_format: One of ``EXPORT_FORMATS``
+            compress: gzip the output
+            chunk_size: Approximate bytes gathered before a chunk is emitted
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if export_format not in EXPORT_FORMATS:
+            msg = f"Unsupported export format: {export_format} (expected one of {', '.join(EXPORT_FORMATS)})"
+            raise ValueError(msg)
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 writes a gzip container
+        self._buffer: list[bytes] = [b"[\n"] if export_format == "json" else []
+        self._buffered = sum(map(len, self._buffer))
+
+    def add(self, record: AuditRecord) -> bytes:
+        """
+        Encode a record.
+
+        Args:
+            record: Audit record
+
+        Returns:
+            A chunk of output once enough has been gathered, else empty bytes
+        """
+        data = record.model_dump(mode="json")
+        if self.export_format == "yaml":
+            encoded = yaml.dump(data, Dumper=_YAML_DUMPER, explicit_start=True, default_flow_style=False, sort_keys=False).encode()
+        else:
+            separator = b",\n" if self.export_format == "json" and self.count else b""
+            encoded = separator + json.dumps(data, default=str, separators=(",", ":")).encode()
+            if self.export_format == "jsonl":
+                encoded += b"\n"
+        self.count += 1
+        self._buffer.append(encoded)
+        self._buffered += len(encoded)
+        return self._drain() if self._buffered >= self.chunk_size else b""
+
+    def finish(self) -> bytes:
+        """
+        Close the export.
+
+        Returns:
+            The remaining output, including any closing bracket and gzip trailer
+        """
+        if self.export_format == "json":
+            self._buffer.append(b"\n]\n")
+        output = self._drain()
+        if self._compressor is not None:
+            output += self._compressor.flush()
+        return output
+
+    def _drain(self) -> bytes:
+        """Take the gathered output, compressing it if enabled."""
+        output = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        return self._compressor.compress(output) if self._compressor is not None else output
+
+
+async def export_records(
+    records: Iterable[AuditRecord],
+    destination: str | Path | BinaryIO | AsyncWriter,
+    export_format: str = "jsonl",
+    compress: bool = False,
+) -> int:
+    """
+    Stream records to a file or writer without holding the export in memory.
+
+    Args:
+        records: Records in export order (consumed lazily)
+        destination: File path, binary file object, or writer whose ``write``
+            is awaitable (an ``asyncio.StreamWriter`` is drained after each chunk)
+        export_format: One of ``EXPORT_FORMATS``
+        compress: gzip the output
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    writer = ExportWriter(export_format, compress)
+    if isinstance(destination, str | Path):
+        with Path(destination).open("wb") as handle:
+            return await _write_all(writer, records, handle)
+    return await _write_all(writer, records, destination)
+
+
+async def _write_all(writer: ExportWriter, records: Iterable[AuditRecord], destination: BinaryIO | AsyncWriter) -> int:
+    """Encode every record and write each chunk to the destination."""
+    drain = getattr(destination, "drain", None)
+
+    async def write(chunk: bytes) -> None:
+        result = destination.write(chunk)
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
+
+    for record in records:
+        chunk = writer.add(record)
+        if chunk:
+            await write(chunk)
+    chunk = writer.finish()
+    if chunk:
+        await write(chunk)
+    return writer.count
+
+
+def write_tables(
+    records: Iterable[AuditRecord],
+    directory: str | Path,
+    columns: Mapping[str, Sequence[str]] | None = None,
+    compress: bool = False,
+) -> dict[str, int]:
+    """
+    Stream records as CSV tables: records, and findings and violations exploded one row each, keyed by record_id.
+
+    Rows are written as records arrive, so memory stays constant. Only the
+    projected columns are read from each record; context and metadata, for
+    example, are serialized only when selected.
+
+    Args:
+        records: Records in export order (consumed lazily)
+        directory: Directory receiving ``<table>.csv`` (or ``.csv.gz``)
+        columns: Columns to write per table, in order (every table and column if None; tables not listed are skipped)
+        compress: gzip each file
+
+    Returns:
+        Number of rows written per table
+
+    Raises:
+        ValueError: If a table or column is unknown
+    """
+    projection = {table: tuple(selected) for table, selected in (TABLE_COLUMNS if columns is None else columns).items()}
+    for table, selected in projection.items():
+        if table not in TABLE_COLUMNS:
+            msg = f"Unknown export table: {table} (expected one of {', '.join(TABLE_COLUMNS)})"
+            raise ValueError(msg)
+        unknown = [column for column in selected if column not in TABLE_COLUMNS[table]]
+        if unknown or not selected:
+            msg = f"Unknown or no columns for export table {table}: {', '.join(unknown)} (expected some of {', '.join(TABLE_COLUMNS[table])})"
+            raise ValueError(msg)
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    counts = dict.fromkeys(projection, 0)
+    with ExitStack() as stack:
+        writers = {}
+        for table, selected in projection.items():
+            handle = stack.enter_context(_open_table(directory / f"{table}.csv{'.gz' if compress else ''}", compress))
+            writers[table] = csv.writer(handle)
+            writers[table].writerow(selected)
+
+        record_cells = _cell_getters(projection.get("records", ()), child=False)
+        finding_cells = _cell_getters(projection.get("findings", ()), child=True)
+        violation_cells = _cell_getters(projection.get("violations", ()), child=True)
+        for record in records:
+            if "records" in writers:
+                writers["records"].writerow([cell(record, record) for cell in record_cells])
+                counts["records"] += 1
+            for table, cells, children in (("findings", finding_cells, record.findings), ("violations", violation_cells, record.violations)):
+                if table in writers and children:
+                    writers[table].writerows([cell(child, record) for cell in cells] for child in children)
+                    counts[table] += len(children)
+    return counts
+
+
+def _open_table(path: Path, compress: bool) -> TextIO:
+    """Open a CSV file for writing, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return path.open("w", encoding="utf-8", newline="")
+
+
+_Cell = Callable[[Any, AuditRecord], Any]
+
+
+def _cell_getters(selected: Sequence[str], child: bool) -> list[_Cell]:
+    """Build one formatter per projected column, taking the row's object (record, finding or violation) and its record."""
+    return [_parent_id if child and column == "record_id" else _field_cell(column) for column in selected]
+
+
+def _parent_id(item: Any, record: AuditRecord) -> str:
+    """Key a finding or violation row by its record."""
+    return record.record_id
+
+
+def _field_cell(column: str) -> _Cell:
+    """Build the formatter reading one field."""
+    get = attrgetter(column)
+
+    def cell(item: Any, record: AuditRecord) -> Any:
+        return _cell(get(item))
+
+    return cell
+
+
+def _cell(value: Any) -> Any:
+    """Format a field value as a CSV cell: enums by value, timestamps as ISO-8601, dicts as JSON, None as empty."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return json.dumps(value, default=str, separators=(",", ":"))
+    return value
@@ -0,0 +1,151 @@
+"""Merkle trees over audit record hashes for checkpoints and inclusion proofs."""
+
+import hashlib
+from collections.abc import Sequence
+
+from pydantic import BaseModel
+
+from .models import AuditRecord
+
+# Domain separation between leaves and interior nodes (as in RFC 6962)
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def _leaf_hash(record_hash: str) -> bytes:
+    """Hash a record hash into a tree leaf."""
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(record_hash)).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash two child nodes into their parent."""
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: list[bytes]) -> list[bytes]:
+    """Pair up nodes into the next level; an odd trailing node is promoted unchanged."""
+    parents = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(record_hashes: Sequence[str]) -> str:
+    """
+    Compute the Merkle root of a sequence of record hashes.
+
+    Args:
+        record_hashes: Hex record hashes in chain order
+
+    Returns:
+        Hex digest of the Merkle root
+    """
+    if not record_hashes:
+        return hashlib.sha256(b"").hexdigest()
+    level = [_leaf_hash(record_hash) for record_hash in record_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0].hex()
+
+
+def merkle_path(record_hashes: Sequence[str], leaf_index: int) -> list[str]:
+    """
+    Collect the sibling hashes proving inclusion of one leaf.
+
+    Args:
+        record_hashes: Hex record hashes in chain order
+        leaf_index: Position of the proven record within ``record_hashes``
+
+    Returns:
+        Sibling hashes from the leaf level up to the root
+    """
+    level = [_leaf_hash(record_hash) for record_hash in record_hashes]
+    index = leaf_index
+    path = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(level[sibling].hex())
+        level = _next_level(level)
+        index //= 2
+    return path
+
+
+def root_from_path(record_hash: str, leaf_index: int, leaf_count: int, path: Sequence[str]) -> str | None:
+    """
+    Recompute the Merkle root from a leaf and its sibling path.
+
+    Args:
+        record_hash: Hex hash of the proven record
+        leaf_index: Position of the record among the checkpoint's leaves
+        leaf_count: Number of leaves under the checkpoint
+        path: Sibling hashes from the leaf level up to the root
+
+    Returns:
+        Hex digest of the recomputed root, or None if the path is malformed
+    """
+    if not 0 <= leaf_index < leaf_count:
+        return None
+    try:
+        node = _leaf_hash(record_hash)
+        siblings = iter(path)
+        index, count = leaf_index, leaf_count
+        while count > 1:
+            if index % 2:
+                node = _node_hash(bytes.fromhex(next(siblings)), node)
+            elif index + 1 < count:
+                node = _node_hash(node, bytes.fromhex(next(siblings)))
+            index //= 2
+            count = (count + 1) // 2
+    except (StopIteration, ValueError):
+        return None
+    if next(siblings, None) is not None:
+        return None
+    return node.hex()
+
+
+class MerkleProof(BaseModel):
+    """Inclusion proof of one record under a Merkle checkpoint record."""
+
+    record_id: str
+    record_hash: str
+    leaf_index: int
+    leaf_count: int
+    path: list[str]
+    merkle_root: str
+    checkpoint: AuditRecord
+
+    class Config:
+        """Pydantic config."""
+
+        frozen = True
+
+
+def verify_inclusion_proof(
+    proof: MerkleProof,
+    record: AuditRecord | None = None,
+    trusted_checkpoint_hash: str | None = None,
+) -> bool:
+    """
+    Verify an inclusion proof without access to the chain.
+
+    Args:
+        proof: Proof returned by ``AuditChain.get_inclusion_proof``
+        record: Record content to check against the proven hash (optional)
+        trusted_checkpoint_hash: Independently known checkpoint hash to anchor the proof (optional)
+
+    Returns:
+        True if the proof is valid
+    """
+    if record is not None and (record.record_id != proof.record_id or record.record_hash != proof.record_hash or not record.verify()):
+        return False
+
+    checkpoint = proof.checkpoint
+    if not checkpoint.verify() or checkpoint.context.get("merkle_root") != proof.merkle_root:
+        return False
+    if checkpoint.context.get("leaf_count") != proof.leaf_count:
+        return False
+    if trusted_checkpoint_hash is not None and checkpoint.record_hash != trusted_checkpoint_hash:
+        return False
+
+    return root_from_path(proof.record_hash, proof.leaf_index, proof.leaf_count, proof.path) == proof.merkle_root
@@ -0,0 +1,132 @@
+"""Prefix-hash proof-of-work engine for audit records."""
+
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_HEX_DIGIT_LIMIT = 0x10  # A byte below this has a leading zero hex digit
+_MIN_CHUNK_SIZE = 4096  # Keep per-task work well above process dispatch overhead
+
+
+def meets_difficulty(digest: bytes, difficulty: int) -> bool:
+    """
+    Check whether a raw SHA-256 digest has ``difficulty`` leading zero hex digits.
+
+    Args:
+        digest: Raw digest bytes
+        difficulty: Number of leading zero hex digits required
+
+    Returns:
+        True if the digest satisfies the difficulty
+    """
+    full_bytes, half_byte = divmod(difficulty, 2)
+    if any(digest[:full_bytes]):
+        return False
+    return not half_byte or digest[full_bytes] < _HEX_DIGIT_LIMIT
+
+
+def mine_nonce(
+    prefix: bytes,
+    suffix: bytes,
+    start_nonce: int,
+    difficulty: int,
+    stride: int = 1,
+    max_attempts: int | None = None,
+) -> tuple[int, str] | None:
+    """
+    Search for a nonce whose canonical record hash meets the difficulty.
+
+    The canonical record serialization is ``prefix + str(nonce) + suffix``.
+    The prefix is fed into a SHA-256 state once and every attempt only hashes
+    the nonce digits and the suffix on a copy of that state.
+
+    Args:
+        prefix: Canonical serialization up to the nonce value
+        suffix: Canonical serialization after the nonce value
+        start_nonce: First nonce to try
+        difficulty: Number of leading zero hex digits required
+        stride: Step between attempted nonces (for interleaved searches)
+        max_attempts: Give up after this many attempts (unbounded if None)
+
+    Returns:
+        Tuple of (nonce, hex digest), or None if max_attempts was exhausted
+    """
+    base = hashlib.sha256(prefix)
+    nonce = start_nonce
+    attempts = 0
+    while max_attempts is None or attempts < max_attempts:
+        state = base.copy()
+        state.update(b"%d" % nonce)
+        state.update(suffix)
+        digest = state.digest()
+        if meets_difficulty(digest, difficulty):
+            return nonce, digest.hex()
+        nonce += stride
+        attempts += 1
+    return None
+
+
+class ParallelMiner:
+    """
+    Proof-of-work search split across a process pool.
+
+    The nonce space is cut into contiguous chunks which are mined in worker
+    processes. Chunks are resolved in nonce order, so the nonce returned is
+    the smallest valid one, identical to what a serial search would find.
+    Awaiting ``mine`` never blocks the event loop.
+    """
+
+    def __init__(self, workers: int | None = None, chunk_size: int | None = None) -> None:
+        """
+        Initialize parallel miner.
+
+        Args:
+            workers: Number of worker processes (defaults to CPU count)
+            chunk_size: Nonces per task (defaults to expected attempts per worker)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def mine(self, prefix: bytes, suffix: bytes, start_nonce: int, difficulty: int) -> tuple[int, str]:
+        """
+        Find the smallest nonce at or after ``start_nonce`` that meets the difficulty.
+
+        Args:
+            prefix: Canonical serialization up to the nonce value
+            suffix: Canonical serialization after the nonce value
+            start_nonce: First nonce to try
+            difficulty: Number of leading zero hex digits required
+
+        Returns:
+            Tuple of (nonce, hex digest)
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunk = self.chunk_size or max(16**difficulty // self.workers, _MIN_CHUNK_SIZE)
+
+        base = start_nonce
+        while True:
+            futures = [loop.run_in_executor(executor, mine_nonce, prefix, suffix, base + k * chunk, difficulty, 1, chunk) for k in range(self.workers)]
+            try:
+                for future in futures:
+                    result = await future
+                    if result is not None:
+                        return result
+            finally:
+                for future in futures:
+                    future.cancel()
+            base += self.workers * chunk
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
@@ -1,14 +1,24 @@
 """Core audit data models and enumerations."""
 
+import base64
+import binascii
 import hashlib
 import json
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Any
+from functools import cache
+from typing import Any, TypeVar
 
 from base.backend.utils.uuid_utils import uuid7
 from pydantic import BaseModel, Field
 
+from .mining import mine_nonce
+
+_Model = TypeVar("_Model", bound=BaseModel)
+
+# previous_hash of a record not linked to a predecessor, such as a chain's genesis record
+GENESIS_PREVIOUS_HASH = "0"
+
 
 class AuditTargetType(str, Enum):
     """Type of audit target."""
@@ -118,7 +128,7 @@ class AuditRecord(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
     # Chain linkage
-    previous_hash: str = "0"
+    previous_hash: str = GENESIS_PREVIOUS_HASH
     nonce: int = 0
 
     # Signatures
@@ -141,15 +151,47 @@ class AuditRecord(BaseModel):
         if not self.record_hash:
             object.__setattr__(self, "record_hash", self.calculate_hash())
 
-    def calculate_hash(self) -> str:
+    @classmethod
+    def unhashed(cls, **data: Any) -> "AuditRecord":
         """
-        Calculate SHA-256 hash of record content.
+        Create a validated record without calculating its hash.
+
+        For records about to be passed to ``AuditChain.add_record``, which links
+        and rehashes them anyway. ``record_hash`` stays empty, and ``verify()``
+        fails, until then.
+
+        Args:
+            **data: Record fields, as for the constructor
 
         Returns:
-            Hex digest of record hash
+            Audit record with an empty hash
+        """
+        record = cls.__new__(cls)
+        BaseModel.__init__(record, **data)
+        return record
+
+    @classmethod
+    def trusted(cls, data: dict[str, Any]) -> "AuditRecord":
+        """
+        Rebuild a record read back from our own storage, skipping validation and hashing.
+
+        The stored hash is kept as is and only recalculated when ``verify()``
+        is called, so tampering is still detected there.
+
+        Args:
+            data: Every record field with its final type (enums, datetimes, nested models), taken over as the record's state
+
+        Returns:
+            Audit record
+
+        Raises:
+            ValueError: If fields are missing or unknown
         """
-        # Create deterministic JSON representation
-        hash_content = {
+        return construct_trusted(cls, data)
+
+    def _hash_content(self) -> dict[str, Any]:
+        """Build the dictionary of fields covered by the record hash."""
+        return {
             "record_id": self.record_id,
             "timestamp": self.timestamp.isoformat(),
             "actor": self.actor,
@@ -167,10 +209,36 @@ class AuditRecord(BaseModel):
             "status": self.status.value,
         }
 
+    def calculate_hash(self) -> str:
+        """
+        Calculate SHA-256 hash of record content.
+
+        Returns:
+            Hex digest of record hash
+        """
         # Sort keys for deterministic output
-        json_str = json.dumps(hash_content, sort_keys=True, default=str)
+        json_str = json.dumps(self._hash_content(), sort_keys=True, default=str)
         return hashlib.sha256(json_str.encode()).hexdigest()
 
+    def canonical_hash_parts(self) -> tuple[bytes, bytes]:
+        """
+        Split the canonical hash input around the nonce value.
+
+        ``prefix + str(nonce).encode() + suffix`` is byte-for-byte the input
+        hashed by ``calculate_hash``, so mining can serialize the record once.
+
+        Returns:
+            Tuple of (prefix, suffix) bytes
+        """
+        content = self._hash_content()
+        del content["nonce"]
+        head = {key: value for key, value in content.items() if key < "nonce"}
+        tail = {key: value for key, value in content.items() if key > "nonce"}
+
+        prefix = json.dumps(head, sort_keys=True, default=str)[:-1] + ', "nonce": '
+        suffix = ", " + json.dumps(tail, sort_keys=True, default=str)[1:]
+        return prefix.encode(), suffix.encode()
+
     def mine_block(self, difficulty: int = 2) -> None:
         """
         Perform proof-of-work mining to add computational cost.
@@ -178,10 +246,17 @@ class AuditRecord(BaseModel):
         Args:
             difficulty: Number of leading zeros required in hash
         """
-        target = "0" * difficulty
-        while not self.record_hash.startswith(target):
-            object.__setattr__(self, "nonce", self.nonce + 1)
-            object.__setattr__(self, "record_hash", self.calculate_hash())
+        if self.record_hash.startswith("0" * difficulty):
+            return
+
+        prefix, suffix = self.canonical_hash_parts()
+        result = mine_nonce(prefix, suffix, self.nonce + 1, difficulty)
+        if result is None:
+            msg = f"Mining failed for record {self.record_id}"
+            raise RuntimeError(msg)
+        nonce, record_hash = result
+        object.__setattr__(self, "nonce", nonce)
+        object.__setattr__(self, "record_hash", record_hash)
 
     def verify(self) -> bool:
         """
@@ -249,17 +324,54 @@ class AuditRecord(BaseModel):
         use_enum_values = False
 
 
+def construct_trusted(model: type[_Model], data: dict[str, Any]) -> _Model:
+    """
+    Build a model instance from already-typed field values without validation.
+
+    Much cheaper than ``model_validate`` or ``model_construct`` (which still
+    resolves defaults per field), for data this package wrote itself.
+
+    Args:
+        model: Model class
+        data: Value of every field, taken over as the instance's state
+
+    Returns:
+        Model instance
+
+    Raises:
+        ValueError: If fields are missing or unknown
+    """
+    fields = _field_names(model)
+    if data.keys() != fields:
+        msg = f"Trusted {model.__name__} fields do not match the model: {sorted(data.keys() ^ fields)}"
+        raise ValueError(msg)
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", data)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(data))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+@cache
+def _field_names(model: type[BaseModel]) -> frozenset[str]:
+    """Return a model's field names (the ``model_fields`` class property is slow to read per instance)."""
+    return frozenset(model.model_fields)
+
+
 class AuditFilter(BaseModel):
     """Filter criteria for querying audit records."""
 
     target_type: AuditTargetType | None = None
     action: str | None = None
     actor: str | None = None
+    target: str | None = None
     severity: AuditSeverity | None = None
     since: datetime | None = None
     until: datetime | None = None
     limit: int = 100
     offset: int = 0
+    cursor: str | None = None  # Opaque keyset cursor from next_page(); offset is ignored when set
 
     def matches(self, record: AuditRecord) -> bool:
         """
@@ -280,6 +392,9 @@ class AuditFilter(BaseModel):
         if self.actor and record.actor != self.actor:
             return False
 
+        if self.target and record.target != self.target:
+            return False
+
         if self.severity and record.severity != self.severity:
             return False
 
@@ -288,6 +403,41 @@ class AuditFilter(BaseModel):
 
         return not (self.until and record.timestamp > self.until)
 
+    def cursor_key(self) -> tuple[datetime, str] | None:
+        """
+        Decode the keyset cursor.
+
+        Returns:
+            (timestamp, record_id) of the last record of the previous page, or None
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if self.cursor is None:
+            return None
+        try:
+            timestamp, record_id = base64.urlsafe_b64decode(self.cursor.encode()).decode().split("|", 1)
+            return datetime.fromisoformat(timestamp), record_id
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            msg = f"Invalid audit cursor: {self.cursor}"
+            raise ValueError(msg) from exc
+
+    def next_page(self, records: list[AuditRecord]) -> "AuditFilter | None":
+        """
+        Build the filter for the page after ``records``.
+
+        Args:
+            records: Page returned for this filter (newest first)
+
+        Returns:
+            Filter resuming after the last record, or None if the page was empty
+        """
+        if not records:
+            return None
+        last = records[-1]
+        cursor = base64.urlsafe_b64encode(f"{last.timestamp.isoformat()}|{last.record_id}".encode()).decode()
+        return self.model_copy(update={"cursor": cursor, "offset": 0})
+
 
 class AuditOptions(BaseModel):
     """Options for audit collection."""
@@ -0,0 +1,329 @@
+"""Pooled async PostgreSQL backend for the audit store."""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+
+from .models import AuditFilter, AuditRecord, AuditSeverity
+from .rollups import RollupBucket, rollup_counts, rollup_dimension, validate_rollup_query
+from .schema import (
+    CHILD_STATISTICS_SQL,
+    FINDING_COLUMNS,
+    RECORD_COLUMNS,
+    RECORD_STATISTICS_SQL,
+    SCHEMA_STATEMENTS,
+    SIGNATURE_COLUMNS,
+    VIOLATION_COLUMNS,
+    compile_filter,
+    compile_provenance,
+    compile_rollup_query,
+    finding_rows,
+    record_from_row,
+    record_row,
+    rollup_upsert_sql,
+    signature_rows,
+    violation_rows,
+)
+
+DEFAULT_MIN_POOL_SIZE = 1
+DEFAULT_MAX_POOL_SIZE = 10
+DEFAULT_SCAN_BATCH_SIZE = 1000
+
+_RECORD_TIMESTAMP = RECORD_COLUMNS.index("timestamp")
+_SIGNATURE_TIMESTAMP = SIGNATURE_COLUMNS.index("timestamp")
+
+# (table, columns, timestamp column position or None) in foreign key order
+_TABLES = (
+    ("audit_records", RECORD_COLUMNS, _RECORD_TIMESTAMP),
+    ("audit_findings", FINDING_COLUMNS, None),
+    ("audit_violations", VIOLATION_COLUMNS, None),
+    ("audit_signatures", SIGNATURE_COLUMNS, _SIGNATURE_TIMESTAMP),
+)
+
+
+_ROLLUP_UPSERT_SQL = rollup_upsert_sql(lambda n: f"${n}")
+
+_NONCE_TYPE_SQL = (
+    "SELECT data_type FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = 'audit_records' AND column_name = 'nonce'"
+)
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Convert a timestamp to the naive UTC value stored in TIMESTAMP columns."""
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _from_utc(row: Sequence[Any], index: int) -> list[Any]:
+    """Copy a fetched row, marking its naive TIMESTAMP column as UTC."""
+    values = list(row)
+    values[index] = values[index].replace(tzinfo=UTC)
+    return values
+
+
+class PostgresAuditBackend:
+    """
+    Audit record storage in PostgreSQL using the SPEC-AUDIT schema.
+
+    Connections come from a bounded asyncpg pool. Bulk ingest streams rows
+    into session-local staging tables with binary COPY and moves them into the
+    spec tables with one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` per
+    table, so re-storing a record (for example after signing it) is
+    idempotent. Filters are pushed down to indexed SQL.
+
+    Timestamps are stored as UTC in the spec's TIMESTAMP columns and read back
+    as UTC, so records created with UTC timestamps (the default) keep their hash.
+    """
+
+    def __init__(self, url: str, min_size: int = DEFAULT_MIN_POOL_SIZE, max_size: int = DEFAULT_MAX_POOL_SIZE) -> None:
+        """
+        Initialize PostgreSQL backend (the pool is created on first use).
+
+        Args:
+            url: PostgreSQL connection URL
+            min_size: Minimum pooled connections
+            max_size: Maximum pooled connections
+        """
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def store_records(self, records: list[AuditRecord]) -> None:
+        """
+        Bulk insert records and their findings, violations and signatures in one transaction.
+
+        Args:
+            records: Audit records to store
+        """
+        if not records:
+            return
+        rows = (
+            [_with_utc(record_row(record), _RECORD_TIMESTAMP) for record in records],
+            finding_rows(records),
+            violation_rows(records),
+            [_with_utc(row, _SIGNATURE_TIMESTAMP) for row in signature_rows(records)],
+        )
+
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            inserted: set[str] = set()
+            for (table, columns, _), table_rows in zip(_TABLES, rows, strict=True):
+                if not table_rows:
+                    continue
+                stage = f"_stage_{table}"
+                await conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+                await conn.copy_records_to_table(stage, records=table_rows, columns=columns)
+                column_list = ", ".join(columns)
+                sql = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage} ON CONFLICT DO NOTHING"
+                if table == "audit_records":
+                    # Only records not stored before are counted into the rollups
+                    inserted = {str(row[0]) for row in await conn.fetch(f"{sql} RETURNING record_id")}
+                else:
+                    await conn.execute(sql)
+            await self._upsert_rollups(conn, [record for record in records if record.record_id in inserted])
+
+        logger.debug(f"PostgreSQL stored {len(records)} audit records via COPY")
+
+    async def get_record(self, record_id: str) -> AuditRecord | None:
+        """
+        Retrieve record by ID.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Audit record if found, None otherwise
+        """
+        records = await self._select("WHERE record_id = $1", [record_id])
+        return records[0] if records else None
+
+    async def query_records(self, audit_filter: AuditFilter) -> list[AuditRecord]:
+        """
+        Query records with the filter compiled to indexed SQL.
+
+        Args:
+            audit_filter: Filter criteria
+
+        Returns:
+            Matching records, newest first
+
+        Raises:
+            ValueError: If the filter's cursor is malformed
+        """
+        clause, params = compile_filter(audit_filter, lambda n: f"${n}", _to_utc)
+        return await self._select(clause, params)
+
+    async def get_provenance(self, target: str, prefix: bool = False) -> list[AuditRecord]:
+        """
+        Read the complete provenance chain of a target from the target index.
+
+        Args:
+            target: Target identifier, or a target prefix
+            prefix: Include every target starting with ``target``
+
+        Returns:
+            Records affecting the target(s), oldest first
+        """
+        clause, params = compile_provenance(target, prefix, lambda n: f"${n}")
+        return await self._select(clause, params)
+
+    async def iter_records(self, batch_size: int = DEFAULT_SCAN_BATCH_SIZE) -> AsyncIterator[list[AuditRecord]]:
+        """
+        Read every stored record in batches.
+
+        Args:
+            batch_size: Records per batch
+
+        Yields:
+            Batches of records ordered by record_id
+        """
+        last_id: str | None = None
+        while True:
+            clause = "ORDER BY record_id LIMIT $1" if last_id is None else "WHERE record_id > $2 ORDER BY record_id LIMIT $1"
+            records = await self._select(clause, [batch_size] if last_id is None else [batch_size, last_id])
+            if not records:
+                return
+            last_id = records[-1].record_id
+            yield records
+
+    async def get_statistics(self) -> dict[str, Any]:
+        """
+        Compute storage statistics with SQL aggregates.
+
+        Returns:
+            Dictionary with storage metrics
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            total, earliest, latest = await conn.fetchrow(RECORD_STATISTICS_SQL)
+            stats: dict[str, Any] = {"total_records": total, "storage_backend": "postgres"}
+            if not total:
+                return stats
+            findings, violations, signed = await conn.fetchrow(CHILD_STATISTICS_SQL)
+
+        stats.update(
+            earliest_record=earliest.replace(tzinfo=UTC).isoformat(),
+            latest_record=latest.replace(tzinfo=UTC).isoformat(),
+            total_findings=findings,
+            total_violations=violations,
+            signed_records=signed,
+        )
+        return stats
+
+    async def get_rollups(
+        self,
+        granularity: str,
+        dimension: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        values: Sequence[str] | None = None,
+        severity: AuditSeverity | str | None = None,
+    ) -> list[RollupBucket]:
+        """
+        Read materialized rollup buckets in a time range.
+
+        Args:
+            granularity: One of ``GRANULARITIES``
+            dimension: One of ``ROLLUP_DIMENSIONS``
+            since: Earliest bucket start (inclusive, unbounded if None)
+            until: Latest bucket start (inclusive, unbounded if None)
+            values: Only these dimension values (all if None)
+            severity: Only count records (violations, for rules) of this severity (all if None)
+
+        Returns:
+            Buckets ordered by start, then value
+
+        Raises:
+            ValueError: If the granularity, dimension or severity split is unknown
+        """
+        split = validate_rollup_query(granularity, dimension, severity)
+        sql, params = compile_rollup_query(granularity, rollup_dimension(dimension, split), since, until, values, lambda n: f"${n}", _to_utc)
+        pool = await self._get_pool()
+        rows = await pool.fetch(sql, *params)
+        return [
+            RollupBucket(granularity=row[0], dimension=dimension, severity=split, bucket_start=row[2].replace(tzinfo=UTC), value=row[3], count=row[4])
+            for row in rows
+        ]
+
+    async def rebuild_rollups(self) -> None:
+        """Recount the rollup table from every stored record (for databases written before rollups existed)."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            # Writers wait on the lock before committing, so their records are counted exactly once: after the rebuild
+            await conn.execute("LOCK TABLE audit_rollups IN EXCLUSIVE MODE")
+            await conn.execute("DELETE FROM audit_rollups")
+            async for records in self.iter_records():
+                await self._upsert_rollups(conn, records)
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _get_pool(self) -> Any:
+        """Return the connection pool for the running loop, creating it and the schema on first use."""
+        loop = asyncio.get_running_loop()
+        if self._pool is not None and self._loop is loop:
+            return self._pool
+        if self._pool is not None:
+            # Pools are bound to the loop that created them (AuditContext commits on short-lived loops)
+            self._pool.terminate()
+
+        try:
+            import asyncpg
+        except ImportError as exc:
+            msg = "PostgreSQL backend requires asyncpg (install the 'postgres' extra)"
+            raise RuntimeError(msg) from exc
+
+        self._pool = await asyncpg.create_pool(self.url, min_size=self.min_size, max_size=self.max_size)
+        self._loop = loop
+        async with self._pool.acquire() as conn, conn.transaction():
+            # Serialize concurrent first-time schema creation across processes
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('audit_schema'))")
+            for statement in SCHEMA_STATEMENTS:
+                await conn.execute(statement)
+            # Tables created before nonces were widened hold them as 32-bit integers, which parallel mining can overflow
+            if await conn.fetchval(_NONCE_TYPE_SQL) == "integer":
+                await conn.execute("ALTER TABLE audit_records ALTER COLUMN nonce TYPE BIGINT")
+        logger.info(f"PostgreSQL audit backend connected (pool {self.min_size}-{self.max_size})")
+        return self._pool
+
+    async def _upsert_rollups(self, conn: Any, records: list[AuditRecord]) -> None:
+        """Add newly stored records to the rollup buckets."""
+        # Sorted so concurrent writers lock shared buckets in the same order
+        counts = sorted(rollup_counts(records).items())
+        rows = [(granularity, dimension, _to_utc(start), value, count) for (granularity, dimension, start, value), count in counts]
+        if rows:
+            await conn.executemany(_ROLLUP_UPSERT_SQL, rows)
+
+    async def _select(self, clause: str, params: list[Any]) -> list[AuditRecord]:
+        """Select records and attach their child rows."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = [_from_utc(row, _RECORD_TIMESTAMP) for row in await conn.fetch(f"SELECT {', '.join(RECORD_COLUMNS)} FROM audit_records {clause}", *params)]
+            if not rows:
+                return []
+
+            record_ids = [row[0] for row in rows]
+            children: list[dict[Any, list[Sequence[Any]]]] = []
+            for table, columns, timestamp_index in _TABLES[1:]:
+                grouped: dict[Any, list[Sequence[Any]]] = defaultdict(list)
+                sql = f"SELECT {', '.join(columns)} FROM {table} WHERE record_id = ANY($1::uuid[]) ORDER BY record_id, ordinal"
+                for row in await conn.fetch(sql, record_ids):
+                    grouped[row[1]].append(row if timestamp_index is None else _from_utc(row, timestamp_index))
+                children.append(grouped)
+
+        return [record_from_row(row, *(child[row[0]] for child in children)) for row in rows]
+
+
+def _with_utc(row: tuple[Any, ...], index: int) -> tuple[Any, ...]:
+    """Replace a row's ISO timestamp text with the naive UTC datetime COPY expects."""
+    values = list(row)
+    values[index] = _to_utc(datetime.fromisoformat(values[index]))
+    return tuple(values)
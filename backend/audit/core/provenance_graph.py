@@ -0,0 +1,253 @@
+"""Embedded adjacency-list graph of audit record relationships."""
+
+import json
+import os
+from collections import deque
+from collections.abc import Collection, Iterable
+from pathlib import Path
+from typing import Any, TextIO
+
+from loguru import logger
+
+from .models import GENESIS_PREVIOUS_HASH, AuditRecord
+
+# Node kinds; a node id is "<kind>:<key>"
+NODE_KINDS = ("record", "target", "actor", "finding", "violation", "signer")
+
+# Edge predicates, all pointing away from a record except in_file (violation -> target)
+PREDICATES = ("affects", "performed_by", "previous_record", "has_finding", "has_violation", "in_file", "signed_by")
+
+# Missing predecessors waited for at once; stores follow chain commits closely, so older ones are never coming
+DEFAULT_REORDER_WINDOW = 1024
+
+
+class ProvenanceGraph:
+    """
+    Persistent adjacency-list graph linking records, targets, actors, findings and violations.
+
+    An embedded stand-in for the Dgraph provenance schema. Each node keeps the
+    set of (predicate, neighbor) pairs in both directions, so a traversal
+    touches only the edges it follows and never scans records. A violation's
+    file is the same node as a record target with that path, which connects
+    violations to every record affecting the file.
+
+    The graph persists as an append-only JSON-lines file holding each record's
+    relationships; the adjacency lists are rebuilt from it on open. A torn
+    final line from an interrupted write is discarded.
+
+    A record stored before its predecessor waits for it, but only within a
+    reorder window: a chain's genesis and checkpoint records are never
+    stored, so their successors would otherwise wait forever.
+    """
+
+    def __init__(self, path: str | Path | None = None, sync: bool = False, reorder_window: int = DEFAULT_REORDER_WINDOW) -> None:
+        """
+        Initialize provenance graph, loading any persisted relationships.
+
+        Args:
+            path: Graph file (kept in memory only if None)
+            sync: fsync the file after every batch of records
+            reorder_window: Missing predecessors to wait for at once; the longest-awaited is
+                taken to be outside the store (a genesis or checkpoint record) when exceeded
+        """
+        self.path = Path(path) if path is not None else None
+        self.sync = sync
+        self.reorder_window = reorder_window
+        self._adjacency: dict[str, set[tuple[str, str]]] = {}
+        self._record_ids: dict[str, str] = {}  # record_hash -> record_id
+        self._waiting: dict[str, list[str]] = {}  # previous_hash not seen yet -> record nodes
+        self._edge_count = 0
+        self._handle: TextIO | None = None
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._load()
+            self._handle = self.path.open("a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._adjacency)
+
+    @property
+    def edge_count(self) -> int:
+        """Return the number of distinct edges."""
+        return self._edge_count
+
+    @staticmethod
+    def node(kind: str, key: str) -> str:
+        """
+        Build a node id.
+
+        Args:
+            kind: One of ``NODE_KINDS``
+            key: Record id, target path, actor name, finding or violation id, or signer
+
+        Returns:
+            Node id
+
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in NODE_KINDS:
+            msg = f"Unknown provenance node kind: {kind}"
+            raise ValueError(msg)
+        return f"{kind}:{key}"
+
+    def add_records(self, records: Iterable[AuditRecord]) -> None:
+        """
+        Link records to their targets, actors, findings, violations, signers and predecessors.
+
+        Re-adding a record only adds relationships it did not have before, such
+        as a signature added after it was first stored.
+
+        Args:
+            records: Stored audit records
+        """
+        lines = []
+        for record in records:
+            facts = _record_facts(record)
+            if self._apply(facts):
+                lines.append(json.dumps(facts, separators=(",", ":")))
+        if self._handle is not None and lines:
+            self._handle.write("\n".join(lines) + "\n")
+            self._handle.flush()
+            if self.sync:
+                os.fsync(self._handle.fileno())
+
+    def neighbors(self, node: str, predicates: Collection[str] | None = None) -> list[str]:
+        """
+        List nodes adjacent to a node in either direction.
+
+        Args:
+            node: Node id
+            predicates: Only follow edges with these predicates (all if None)
+
+        Returns:
+            Adjacent node ids
+        """
+        return sorted({neighbor for predicate, neighbor in self._adjacency.get(node, ()) if predicates is None or predicate in predicates})
+
+    def traverse(self, start: str, max_hops: int = 3, predicates: Collection[str] | None = None) -> dict[str, int]:
+        """
+        Breadth-first traversal from a node, following edges in either direction.
+
+        Args:
+            start: Node id to start from
+            max_hops: Maximum number of edges from the start node
+            predicates: Only follow edges with these predicates (all if None)
+
+        Returns:
+            Reachable node ids mapped to their hop distance, including the start at 0
+        """
+        if start not in self._adjacency:
+            return {}
+        distances = {start: 0}
+        frontier = deque([start])
+        while frontier:
+            node = frontier.popleft()
+            hops = distances[node]
+            if hops == max_hops:
+                continue
+            for predicate, neighbor in self._adjacency[node]:
+                if neighbor not in distances and (predicates is None or predicate in predicates):
+                    distances[neighbor] = hops + 1
+                    frontier.append(neighbor)
+        return distances
+
+    def reachable_records(self, start: str, max_hops: int = 3, predicates: Collection[str] | None = None) -> list[str]:
+        """
+        Find records reachable from a node.
+
+        Args:
+            start: Node id to start from
+            max_hops: Maximum number of edges from the start node
+            predicates: Only follow edges with these predicates (all if None)
+
+        Returns:
+            Record ids ordered by hop distance, then id
+        """
+        prefix = "record:"
+        reachable = self.traverse(start, max_hops, predicates)
+        records = sorted((hops, node) for node, hops in reachable.items() if node.startswith(prefix))
+        return [node[len(prefix) :] for _, node in records]
+
+    def statistics(self) -> dict[str, int]:
+        """Return node, edge and record counts, and the number of predecessors still awaited."""
+        return {"nodes": len(self._adjacency), "edges": self._edge_count, "records": len(self._record_ids), "waiting": len(self._waiting)}
+
+    def close(self) -> None:
+        """Close the graph file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _apply(self, facts: dict[str, Any]) -> bool:
+        """Add a record's relationships to the adjacency lists; return whether any edge was new."""
+        record = f"record:{facts['id']}"
+        edges = [
+            (record, "affects", f"target:{facts['target']}"),
+            (record, "performed_by", f"actor:{facts['actor']}"),
+            *((record, "has_finding", f"finding:{finding_id}") for finding_id in facts["findings"]),
+            *((record, "signed_by", f"signer:{signer}") for signer in facts["signers"]),
+        ]
+        for violation_id, file_path in facts["violations"]:
+            edges.append((record, "has_violation", f"violation:{violation_id}"))
+            if file_path:
+                edges.append((f"violation:{violation_id}", "in_file", f"target:{file_path}"))
+
+        # previous_hash names the predecessor; link now or once it arrives
+        self._record_ids[facts["hash"]] = facts["id"]
+        previous = facts["previous"]
+        if previous in self._record_ids:
+            edges.append((record, "previous_record", f"record:{self._record_ids[previous]}"))
+        elif previous != GENESIS_PREVIOUS_HASH:
+            self._waiting.setdefault(previous, []).append(record)
+            if len(self._waiting) > self.reorder_window:
+                del self._waiting[next(iter(self._waiting))]
+        edges.extend((successor, "previous_record", record) for successor in self._waiting.pop(facts["hash"], ()))
+
+        added = False
+        for source, predicate, target in edges:
+            out = self._adjacency.setdefault(source, set())
+            if (predicate, target) in out:
+                continue
+            out.add((predicate, target))
+            self._adjacency.setdefault(target, set()).add((predicate, source))
+            self._edge_count += 1
+            added = True
+        return added
+
+    def _load(self) -> None:
+        """Replay the graph file, truncating a torn final line."""
+        assert self.path is not None
+        if not self.path.exists():
+            return
+        valid_size = 0
+        with self.path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    facts = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(facts)
+                valid_size += len(line)
+        if valid_size < self.path.stat().st_size:
+            logger.warning(f"Discarding torn tail of provenance graph {self.path}")
+            os.truncate(self.path, valid_size)
+        logger.info(f"Loaded provenance graph from {self.path} ({len(self._adjacency)} nodes, {self._edge_count} edges)")
+
+
+def _record_facts(record: AuditRecord) -> dict[str, Any]:
+    """Extract the relationships of a record."""
+    return {
+        "id": record.record_id,
+        "hash": record.record_hash,
+        "previous": record.previous_hash,
+        "target": record.target,
+        "actor": record.actor,
+        "findings": [finding.finding_id for finding in record.findings],
+        "violations": [(violation.violation_id, violation.file_path) for violation in record.violations],
+        "signers": [signature.signer for signature in record.signatures],
+    }
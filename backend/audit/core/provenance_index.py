@@ -0,0 +1,85 @@
+"""Per-target index of record ids in chronological order for provenance lookups."""
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from datetime import datetime
+from heapq import merge
+
+from .models import AuditRecord
+
+_Key = tuple[datetime, str]
+
+
+class TargetIndex:
+    """
+    Maintained target -> chronological record id index.
+
+    Each target keeps its (timestamp, record_id) keys sorted, so a provenance
+    chain is read in O(k) for k records with no cap. Targets themselves are
+    kept in a sorted list, so every target under a prefix such as a directory
+    or module path is found with one bisect and their chains are merged.
+    """
+
+    def __init__(self, records: Iterable[AuditRecord] = ()) -> None:
+        """
+        Initialize index.
+
+        Args:
+            records: Records to index up front
+        """
+        self._chains: dict[str, list[_Key]] = {}
+        self._targets: list[str] = []
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        """Return the number of indexed targets."""
+        return len(self._chains)
+
+    def add(self, record: AuditRecord) -> None:
+        """
+        Index a newly stored record (each record must be added once).
+
+        Args:
+            record: Audit record
+        """
+        chain = self._chains.get(record.target)
+        if chain is None:
+            chain = self._chains[record.target] = []
+            insort(self._targets, record.target)
+
+        key = (record.timestamp, record.record_id)
+        if not chain or chain[-1] < key:
+            chain.append(key)
+        else:
+            # Records created concurrently may be stored slightly out of timestamp order
+            insort(chain, key)
+
+    def chain(self, target: str) -> list[str]:
+        """
+        Look up the record ids affecting a target.
+
+        Args:
+            target: Target identifier
+
+        Returns:
+            Record ids, oldest first
+        """
+        return [record_id for _, record_id in self._chains.get(target, ())]
+
+    def prefix_chain(self, prefix: str) -> list[str]:
+        """
+        Look up the record ids affecting every target that starts with a prefix.
+
+        Args:
+            prefix: Target prefix, e.g. ``base/backend/dataops/``
+
+        Returns:
+            Record ids across the matching targets, oldest first
+        """
+        targets = []
+        for target in self._targets[bisect_left(self._targets, prefix) :]:
+            if not target.startswith(prefix):
+                break
+            targets.append(target)
+        return [record_id for _, record_id in merge(*(self._chains[target] for target in targets))]
@@ -0,0 +1,37 @@
+"""Top-k query execution over streams of candidate audit records."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import islice
+
+from .models import AuditFilter, AuditRecord
+
+
+def sort_key(record: AuditRecord) -> tuple[datetime, str]:
+    """Return the (timestamp, record_id) key results are ordered and paged by."""
+    return record.timestamp, record.record_id
+
+
+def select_top_k(candidates: Iterable[AuditRecord], audit_filter: AuditFilter) -> list[AuditRecord]:
+    """
+    Select one page of the newest records matching a filter.
+
+    Candidates must arrive newest first, in descending (timestamp, record_id)
+    order. They are streamed, never materialized, and iteration stops as soon
+    as the page is full, so a page costs the candidates up to its last match
+    rather than every match.
+
+    Args:
+        candidates: Records to select from, newest first (need not match the filter)
+        audit_filter: Filter criteria, including limit, offset and cursor
+
+    Returns:
+        Matching records, newest first
+
+    Raises:
+        ValueError: If the filter's cursor is malformed
+    """
+    cursor_key = audit_filter.cursor_key()
+    skip = 0 if cursor_key is not None else audit_filter.offset
+    matches = (record for record in candidates if audit_filter.matches(record) and (cursor_key is None or sort_key(record) < cursor_key))
+    return list(islice(matches, skip, skip + audit_filter.limit))
@@ -0,0 +1,235 @@
+"""Secondary indexes over chain positions for filtered and time-range lookups."""
+
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .models import AuditFilter, AuditRecord
+from .serialization import to_epoch_ns
+
+# Record fields with an inverted index (value -> ascending chain positions)
+INDEXED_FIELDS = ("actor", "action", "target", "target_type", "severity")
+
+# Index file kept next to the segments of a persistent chain
+RECORD_INDEX_FILENAME = "record_index.jsonl"
+
+
+class RecordIndex:
+    """
+    Timestamp and inverted indexes over chain positions.
+
+    Indexed positions and their epoch-nanosecond timestamps are kept in
+    parallel arrays; the timestamp index orders slots of those arrays by time
+    so ranges are found with bisect. Each inverted index maps a field value to
+    its posting list of positions, which stays sorted because positions are
+    only appended. A filter intersects the smallest candidate list with the
+    others instead of testing every record.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty indexes."""
+        self._positions = array("q")
+        self._timestamps = array("q")  # Epoch nanoseconds, parallel to _positions
+        self._by_time = array("q")  # Slots of _positions in timestamp order
+        self._postings: dict[str, dict[Any, array[int]]] = {field: {} for field in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        """Return the number of indexed records."""
+        return len(self._positions)
+
+    def add(self, position: int, record: AuditRecord) -> None:
+        """
+        Index a record appended at a chain position.
+
+        Args:
+            position: Chain position of the record (must exceed every indexed position)
+            record: Audit record at that position
+        """
+        self.add_entry(position, index_entry(record)[1:])
+
+    def add_entry(self, position: int, entry: Sequence[Any]) -> None:
+        """
+        Index a record from its timestamp and field values, as stored in an index file.
+
+        Args:
+            position: Chain position of the record (must exceed every indexed position)
+            entry: Epoch-nanosecond timestamp followed by the values of ``INDEXED_FIELDS``
+        """
+        timestamp = entry[0]
+        slot = len(self._positions)
+        self._positions.append(position)
+        self._timestamps.append(timestamp)
+        if not self._by_time or self._timestamps[self._by_time[-1]] <= timestamp:
+            self._by_time.append(slot)
+        else:
+            # Records created concurrently may be committed slightly out of timestamp order
+            insort(self._by_time, slot, key=self._timestamps.__getitem__)
+
+        for postings, value in zip(self._postings.values(), entry[1:], strict=True):
+            postings.setdefault(_key(value), array("q")).append(position)
+
+    def time_range(self, start: datetime | None, end: datetime | None) -> list[int]:
+        """
+        Find positions of records with a timestamp in a range.
+
+        Args:
+            start: Earliest timestamp (inclusive, unbounded if None)
+            end: Latest timestamp (inclusive, unbounded if None)
+
+        Returns:
+            Matching chain positions in ascending order
+        """
+        lo, hi = self._time_bounds(start, end)
+        return sorted(self._positions[slot] for slot in self._by_time[lo:hi])
+
+    def search(self, audit_filter: AuditFilter, before: int | None = None) -> Iterator[int]:
+        """
+        Find positions of records matching a filter, newest first.
+
+        The smallest posting list, or the time range if it is smaller, drives
+        the search; the remaining criteria are checked per candidate with a
+        bisect. Positions are produced lazily, so taking one page costs roughly
+        the page size rather than the match count.
+
+        Args:
+            audit_filter: Filter criteria (limit, offset and cursor are ignored)
+            before: Only return positions below this one (a keyset cursor)
+
+        Returns:
+            Matching chain positions in descending order (every indexed position
+            if the filter has no indexed criteria)
+        """
+        postings: list[Sequence[int]] = [self._postings[field].get(_key(value), ()) for field in INDEXED_FIELDS if (value := getattr(audit_filter, field))]
+        postings.sort(key=len)
+        since, until = audit_filter.since, audit_filter.until
+
+        if since or until:
+            lo, hi = self._time_bounds(since, until)
+            if not postings or hi - lo < len(postings[0]):
+                postings.insert(0, self.time_range(since, until))
+        elif not postings:
+            return _descending(self._positions, before)
+
+        driver, others = postings[0], postings[1:]
+        low = to_epoch_ns(since) if since else None
+        high = to_epoch_ns(until) if until else None
+        return (
+            position for position in _descending(driver, before) if all(_contains(other, position) for other in others) and self._in_range(position, low, high)
+        )
+
+    def _in_range(self, position: int, low: int | None, high: int | None) -> bool:
+        """Check an indexed position's timestamp against optional inclusive epoch-nanosecond bounds."""
+        if low is None and high is None:
+            return True
+        timestamp = self._timestamps[bisect_left(self._positions, position)]
+        return not (low is not None and timestamp < low) and not (high is not None and timestamp > high)
+
+    def _time_bounds(self, start: datetime | None, end: datetime | None) -> tuple[int, int]:
+        """Return the slice of the timestamp index covering a range."""
+        key = self._timestamps.__getitem__
+        lo = 0 if start is None else bisect_left(self._by_time, to_epoch_ns(start), key=key)
+        hi = len(self._by_time) if end is None else bisect_right(self._by_time, to_epoch_ns(end), key=key)
+        return lo, max(lo, hi)
+
+
+class RecordIndexFile:
+    """
+    Append-only JSON-lines file holding one index entry per chain position.
+
+    Line ``i`` describes chain position ``i``: the record id, followed for
+    indexed records by the fields ``RecordIndex`` needs. Reopening a chain
+    rebuilds its lookups from this file instead of decoding every record. A
+    torn final line from an interrupted write is discarded.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Initialize index file.
+
+        Args:
+            path: File path (created on first append)
+        """
+        self.path = Path(path)
+
+    def load(self, limit: int) -> Iterator[list[Any]]:
+        """
+        Stream persisted entries, truncating the file after the last whole line within the chain length.
+
+        Args:
+            limit: Number of positions the chain holds
+
+        Yields:
+            Entries for chain positions ``0`` up to at most ``limit``
+        """
+        if not self.path.exists():
+            return
+        count = 0
+        valid_size = 0
+        with self.path.open("rb") as handle:
+            for line in handle:
+                if count == limit or not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                yield entry
+                count += 1
+                valid_size += len(line)
+        if valid_size < self.path.stat().st_size:
+            logger.warning(f"Discarding entries past chain position {count} in record index {self.path}")
+            os.truncate(self.path, valid_size)
+
+    def append(self, entries: Iterable[list[Any]]) -> None:
+        """
+        Append entries for the next chain positions.
+
+        Args:
+            entries: Index entries in chain order
+        """
+        lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        if lines:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+
+    def reset(self) -> None:
+        """Remove the file so it is rebuilt from the chain."""
+        self.path.unlink(missing_ok=True)
+
+
+def index_entry(record: AuditRecord) -> list[Any]:
+    """
+    Build the index-file entry of an indexed record.
+
+    Args:
+        record: Audit record
+
+    Returns:
+        Record id, epoch-nanosecond timestamp and the values of ``INDEXED_FIELDS``
+    """
+    return [record.record_id, to_epoch_ns(record.timestamp), *(_key(getattr(record, field)) for field in INDEXED_FIELDS)]
+
+
+def _key(value: Any) -> Any:
+    """Normalize an enum member to its value so persisted and live lookups share keys."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _descending(positions: Sequence[int], before: int | None) -> Iterator[int]:
+    """Iterate a sorted posting list backwards, starting below ``before``."""
+    end = len(positions) if before is None else bisect_left(positions, before)
+    return (positions[i] for i in range(end - 1, -1, -1))
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    """Check membership in a sorted posting list."""
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
@@ -0,0 +1,211 @@
+"""Time-bucketed rollups of audit records for trend analytics."""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+
+from pydantic import BaseModel
+
+from .models import AuditRecord, AuditSeverity
+
+# Bucket widths in seconds
+GRANULARITIES = {"minute": 60, "hour": 3600, "day": 86400}
+
+# Record fields counted per bucket, plus "rule", which counts violations by rule
+ROLLUP_DIMENSIONS = ("severity", "actor", "action", "target_type", "rule")
+
+# Dimensions also counted per severity, so e.g. errors per hour per actor is one read.
+# A rule is split by its violation's severity, the others by the record's
+SEVERITY_SPLIT_DIMENSIONS = ("actor", "action", "target_type", "rule")
+
+_RollupKey = tuple[str, str, datetime, str]  # (granularity, stored dimension, bucket_start, value)
+
+
+class RollupBucket(BaseModel):
+    """Number of records (or violations, for the rule dimension) with one dimension value in one time bucket."""
+
+    granularity: str
+    dimension: str
+    bucket_start: datetime
+    value: str
+    count: int
+    severity: AuditSeverity | None = None  # Set when only records (or violations) of this severity are counted
+
+    class Config:
+        """Pydantic config."""
+
+        frozen = True
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """
+    Floor a timestamp to the start of its UTC bucket.
+
+    Args:
+        timestamp: Record timestamp (naive timestamps are taken as UTC)
+        granularity: One of ``GRANULARITIES``
+
+    Returns:
+        Aware UTC bucket start
+    """
+    width = GRANULARITIES[granularity]
+    return datetime.fromtimestamp(as_utc(timestamp).timestamp() // width * width, UTC)
+
+
+def rollup_counts(records: Iterable[AuditRecord]) -> Counter[_RollupKey]:
+    """
+    Count records into every granularity and dimension.
+
+    Args:
+        records: Newly stored records (each must be counted once)
+
+    Returns:
+        Count per (granularity, stored dimension, bucket_start, value); see ``rollup_dimension``
+    """
+    counts: Counter[_RollupKey] = Counter()
+    for record in records:
+        severity = record.severity.value
+        values = [
+            ("severity", severity, None),
+            ("actor", record.actor, severity),
+            ("action", record.action, severity),
+            ("target_type", record.target_type.value, severity),
+            *(("rule", violation.rule, violation.severity.value) for violation in record.violations),
+        ]
+        for granularity in GRANULARITIES:
+            start = bucket_start(record.timestamp, granularity)
+            for dimension, value, split in values:
+                counts[granularity, dimension, start, value] += 1
+                if split is not None:
+                    counts[granularity, f"{dimension}@{split}", start, value] += 1
+    return counts
+
+
+def rollup_dimension(dimension: str, severity: AuditSeverity | str | None = None) -> str:
+    """
+    Return the dimension name buckets are stored under.
+
+    Args:
+        dimension: One of ``ROLLUP_DIMENSIONS``
+        severity: Severity the counts are split by (unsplit if None)
+
+    Returns:
+        The dimension itself, or ``<dimension>@<severity>`` for a severity split
+    """
+    return dimension if severity is None else f"{dimension}@{AuditSeverity(severity).value}"
+
+
+def validate_rollup_query(granularity: str, dimension: str, severity: AuditSeverity | str | None = None) -> AuditSeverity | None:
+    """
+    Check a rollup query names a known granularity, dimension and severity split.
+
+    Args:
+        granularity: Bucket width name
+        dimension: Dimension name
+        severity: Severity the counts are split by, as a member or its value (unsplit if None)
+
+    Returns:
+        The severity split as an ``AuditSeverity`` (None if unsplit)
+
+    Raises:
+        ValueError: If any is unknown, or the dimension is not split by severity
+    """
+    if granularity not in GRANULARITIES:
+        msg = f"Unknown rollup granularity: {granularity} (expected one of {', '.join(GRANULARITIES)})"
+        raise ValueError(msg)
+    if dimension not in ROLLUP_DIMENSIONS:
+        msg = f"Unknown rollup dimension: {dimension} (expected one of {', '.join(ROLLUP_DIMENSIONS)})"
+        raise ValueError(msg)
+    if severity is None:
+        return None
+    if dimension not in SEVERITY_SPLIT_DIMENSIONS:
+        msg = f"Rollup dimension {dimension} is not split by severity (split dimensions: {', '.join(SEVERITY_SPLIT_DIMENSIONS)})"
+        raise ValueError(msg)
+    if severity not in [level.value for level in AuditSeverity]:
+        msg = f"Unknown rollup severity: {severity} (expected one of {', '.join(level.value for level in AuditSeverity)})"
+        raise ValueError(msg)
+    return AuditSeverity(severity)
+
+
+class AuditRollups:
+    """
+    In-memory rollup buckets, updated as records are stored.
+
+    Each (granularity, stored dimension) keeps its bucket starts sorted, so a
+    time range is located with bisect and a query reads only the buckets in
+    range, never the records behind them.
+    """
+
+    def __init__(self, records: Iterable[AuditRecord] = ()) -> None:
+        """
+        Initialize rollups.
+
+        Args:
+            records: Records to count up front
+        """
+        self._starts: dict[tuple[str, str], list[datetime]] = {}
+        self._counts: dict[tuple[str, str, datetime], Counter[str]] = {}
+        self.add(records)
+
+    def add(self, records: Iterable[AuditRecord]) -> None:
+        """
+        Count newly stored records.
+
+        Args:
+            records: Records not counted before
+        """
+        for (granularity, dimension, start, value), count in rollup_counts(records).items():
+            bucket = self._counts.get((granularity, dimension, start))
+            if bucket is None:
+                bucket = self._counts[granularity, dimension, start] = Counter()
+                starts = self._starts.setdefault((granularity, dimension), [])
+                if not starts or starts[-1] < start:
+                    starts.append(start)
+                else:
+                    insort(starts, start)
+            bucket[value] += count
+
+    def query(
+        self,
+        granularity: str,
+        dimension: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        values: Sequence[str] | None = None,
+        severity: AuditSeverity | str | None = None,
+    ) -> list[RollupBucket]:
+        """
+        Read buckets in a time range.
+
+        Args:
+            granularity: One of ``GRANULARITIES``
+            dimension: One of ``ROLLUP_DIMENSIONS``
+            since: Earliest bucket start (inclusive, unbounded if None)
+            until: Latest bucket start (inclusive, unbounded if None)
+            values: Only these dimension values (all if None)
+            severity: Only count records (violations, for rules) of this severity; needs a dimension in ``SEVERITY_SPLIT_DIMENSIONS``
+
+        Returns:
+            Buckets ordered by start, then value
+
+        Raises:
+            ValueError: If the granularity, dimension or severity split is unknown
+        """
+        split = validate_rollup_query(granularity, dimension, severity)
+        stored = rollup_dimension(dimension, split)
+        starts = self._starts.get((granularity, stored), [])
+        lo = 0 if since is None else bisect_left(starts, as_utc(since))
+        hi = len(starts) if until is None else bisect_right(starts, as_utc(until))
+
+        buckets = []
+        for start in starts[lo:hi]:
+            counts = self._counts[granularity, stored, start]
+            for value in sorted(counts if values is None else set(values) & counts.keys()):
+                buckets.append(RollupBucket(granularity=granularity, dimension=dimension, bucket_start=start, value=value, count=counts[value], severity=split))
+        return buckets
+
+
+def as_utc(value: datetime) -> datetime:
+    """Convert a timestamp to aware UTC, taking naive timestamps as UTC."""
+    return value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC)
@@ -0,0 +1,488 @@
+"""Relational schema for audit records (SPEC-AUDIT) and row mapping shared by SQL backends."""
+
+import json
+import sys
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from .models import (
+    AuditFilter,
+    AuditFinding,
+    AuditRecord,
+    AuditSeverity,
+    AuditSignature,
+    AuditStatus,
+    AuditTargetType,
+    AuditViolation,
+    DataClassification,
+    construct_trusted,
+)
+
+# Postgres schema from SPEC-AUDIT; SQLite uses the same tables, columns and indexes
+SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS audit_records (
+        record_id UUID PRIMARY KEY,
+        record_hash VARCHAR(64) NOT NULL UNIQUE,
+        timestamp TIMESTAMP NOT NULL,
+        actor VARCHAR(255) NOT NULL,
+        action VARCHAR(255) NOT NULL,
+        target TEXT NOT NULL,
+        target_type VARCHAR(50) NOT NULL,
+        source VARCHAR(255) NOT NULL,
+        reason TEXT,
+        context JSONB,
+        metadata JSONB,
+        previous_hash VARCHAR(64) NOT NULL,
+        nonce BIGINT NOT NULL,
+        severity VARCHAR(50) NOT NULL,
+        classification VARCHAR(50) NOT NULL,
+        status VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_records(timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_records(actor)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_records(action)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_target_type ON audit_records(target_type)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_severity ON audit_records(severity)",
+    # Provenance chains are read per target; not in the spec, but needed to avoid full scans
+    "CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_records(target, timestamp)",
+    """
+    CREATE TABLE IF NOT EXISTS audit_findings (
+        finding_id UUID PRIMARY KEY,
+        record_id UUID REFERENCES audit_records(record_id),
+        finding_type VARCHAR(255) NOT NULL,
+        severity VARCHAR(50) NOT NULL,
+        description TEXT,
+        location TEXT,
+        recommendation TEXT,
+        metadata JSONB,
+        ordinal INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_violations (
+        violation_id UUID PRIMARY KEY,
+        record_id UUID REFERENCES audit_records(record_id),
+        rule VARCHAR(255) NOT NULL,
+        severity VARCHAR(50) NOT NULL,
+        message TEXT,
+        file_path TEXT,
+        line_number INTEGER,
+        column_number INTEGER,
+        ordinal INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_signatures (
+        signature_id UUID PRIMARY KEY,
+        record_id UUID REFERENCES audit_records(record_id),
+        signer VARCHAR(255) NOT NULL,
+        signature TEXT NOT NULL,
+        algorithm VARCHAR(50) NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        ordinal INTEGER NOT NULL
+    )
+    """,
+    # Child rows are always fetched by record in list order; ordinal (each row's position on its record) and these
+    # indexes are not in the spec, but physical row order is not stable (VACUUM FULL, CLUSTER and SQLite's VACUUM rewrite it)
+    "CREATE INDEX IF NOT EXISTS idx_audit_findings_record ON audit_findings(record_id, ordinal)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_violations_record ON audit_violations(record_id, ordinal)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_signatures_record ON audit_signatures(record_id, ordinal)",
+    # Materialized time-bucket counts (see rollups.py); the key serves range reads per granularity and dimension
+    # A severity split is stored as dimension '<dimension>@<severity>', at most 'target_type@critical' (20 characters)
+    """
+    CREATE TABLE IF NOT EXISTS audit_rollups (
+        granularity VARCHAR(10) NOT NULL,
+        dimension VARCHAR(20) NOT NULL,
+        bucket_start TIMESTAMP NOT NULL,
+        value TEXT NOT NULL,
+        count BIGINT NOT NULL,
+        PRIMARY KEY (granularity, dimension, bucket_start, value)
+    )
+    """,
+)
+
+RECORD_COLUMNS = (
+    "record_id",
+    "record_hash",
+    "timestamp",
+    "actor",
+    "action",
+    "target",
+    "target_type",
+    "source",
+    "reason",
+    "context",
+    "metadata",
+    "previous_hash",
+    "nonce",
+    "severity",
+    "classification",
+    "status",
+)
+FINDING_COLUMNS = ("finding_id", "record_id", "finding_type", "severity", "description", "location", "recommendation", "metadata", "ordinal")
+VIOLATION_COLUMNS = ("violation_id", "record_id", "rule", "severity", "message", "file_path", "line_number", "column_number", "ordinal")
+SIGNATURE_COLUMNS = ("signature_id", "record_id", "signer", "signature", "algorithm", "timestamp", "ordinal")
+ROLLUP_COLUMNS = ("granularity", "dimension", "bucket_start", "value", "count")
+
+# Stored enum values to members; a dict lookup is much cheaper than calling the enum when rebuilding rows
+_TARGET_TYPES = {member.value: member for member in AuditTargetType}
+_SEVERITIES = {member.value: member for member in AuditSeverity}
+_CLASSIFICATIONS = {member.value: member for member in DataClassification}
+_STATUSES = {member.value: member for member in AuditStatus}
+
+# Columns an AuditFilter compares for equality, in the order they are compiled
+FILTER_COLUMNS = ("target_type", "action", "actor", "target", "severity")
+
+RECORD_STATISTICS_SQL = "SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM audit_records"
+CHILD_STATISTICS_SQL = (
+    "SELECT (SELECT COUNT(*) FROM audit_findings), (SELECT COUNT(*) FROM audit_violations), (SELECT COUNT(DISTINCT record_id) FROM audit_signatures)"
+)
+
+
+def record_row(record: AuditRecord) -> tuple[Any, ...]:
+    """
+    Map a record to an ``audit_records`` row.
+
+    The timestamp is stored as the exact ISO-8601 text covered by the record
+    hash, so records read back still verify. Timestamps compare as text, which
+    orders correctly for the UTC timestamps records are created with.
+
+    Args:
+        record: Audit record
+
+    Returns:
+        Row values in ``RECORD_COLUMNS`` order
+    """
+    return (
+        record.record_id,
+        record.record_hash,
+        record.timestamp.isoformat(),
+        record.actor,
+        record.action,
+        record.target,
+        record.target_type.value,
+        record.source,
+        record.reason,
+        json.dumps(record.context, default=str),
+        json.dumps(record.metadata, default=str),
+        record.previous_hash,
+        record.nonce,
+        record.severity.value,
+        record.classification.value,
+        record.status.value,
+    )
+
+
+def finding_rows(records: Sequence[AuditRecord]) -> list[tuple[Any, ...]]:
+    """Map the findings of records to ``audit_findings`` rows."""
+    return [
+        (
+            finding.finding_id,
+            record.record_id,
+            finding.finding_type,
+            finding.severity.value,
+            finding.description,
+            finding.location,
+            finding.recommendation,
+            json.dumps(finding.metadata, default=str),
+            ordinal,
+        )
+        for record in records
+        for ordinal, finding in enumerate(record.findings)
+    ]
+
+
+def violation_rows(records: Sequence[AuditRecord]) -> list[tuple[Any, ...]]:
+    """Map the violations of records to ``audit_violations`` rows."""
+    return [
+        (
+            violation.violation_id,
+            record.record_id,
+            violation.rule,
+            violation.severity.value,
+            violation.message,
+            violation.file_path,
+            violation.line_number,
+            violation.column_number,
+            ordinal,
+        )
+        for record in records
+        for ordinal, violation in enumerate(record.violations)
+    ]
+
+
+def signature_rows(records: Sequence[AuditRecord]) -> list[tuple[Any, ...]]:
+    """Map the signatures of records to ``audit_signatures`` rows."""
+    return [
+        (signature_id(record.record_id, i), record.record_id, sig.signer, sig.signature, sig.algorithm, sig.timestamp.isoformat(), i)
+        for record in records
+        for i, sig in enumerate(record.signatures)
+    ]
+
+
+def signature_id(record_id: str, position: int) -> str:
+    """
+    Derive a stable id for a record's signature.
+
+    Signatures carry no id of their own; deriving it from the record and the
+    signature's position makes re-storing a record after signing idempotent.
+
+    Args:
+        record_id: Signed record identifier
+        position: Index of the signature on the record
+
+    Returns:
+        UUID string
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{record_id}/signatures/{position}"))
+
+
+def record_from_row(
+    row: Sequence[Any],
+    findings: Sequence[Sequence[Any]] = (),
+    violations: Sequence[Sequence[Any]] = (),
+    signatures: Sequence[Sequence[Any]] = (),
+) -> AuditRecord:
+    """
+    Rebuild a record from its row and child rows.
+
+    Args:
+        row: ``audit_records`` values in ``RECORD_COLUMNS`` order
+        findings: ``audit_findings`` values in ``FINDING_COLUMNS`` order
+        violations: ``audit_violations`` values in ``VIOLATION_COLUMNS`` order
+        signatures: ``audit_signatures`` values in ``SIGNATURE_COLUMNS`` order
+
+    Returns:
+        Audit record with its stored hash
+    """
+    # Rows were written by this package, so records are rebuilt without re-validation (see AuditRecord.trusted)
+    data = dict(zip(RECORD_COLUMNS, row, strict=True))
+    data["record_id"] = str(data["record_id"])
+    data["timestamp"] = _parse_time(data["timestamp"])
+    data["target_type"] = _TARGET_TYPES[data["target_type"]]
+    data["context"] = _parse_json(data["context"])
+    data["metadata"] = _parse_json(data["metadata"])
+    data["severity"] = _SEVERITIES[data["severity"]]
+    data["classification"] = _CLASSIFICATIONS[data["classification"]]
+    data["status"] = _STATUSES[data["status"]]
+    data["signatures"] = [
+        construct_trusted(AuditSignature, {"signer": values[2], "signature": values[3], "algorithm": values[4], "timestamp": _parse_time(values[5])})
+        for values in signatures
+    ]
+    data["findings"] = [
+        construct_trusted(
+            AuditFinding,
+            {
+                "finding_id": str(values[0]),
+                "finding_type": values[2],
+                "severity": _SEVERITIES[values[3]],
+                "description": values[4] or "",
+                "location": values[5],
+                "recommendation": values[6],
+                "metadata": _parse_json(values[7]),
+            },
+        )
+        for values in findings
+    ]
+    data["violations"] = [
+        construct_trusted(
+            AuditViolation,
+            {
+                "violation_id": str(values[0]),
+                "rule": values[2],
+                "severity": _SEVERITIES[values[3]],
+                "message": values[4] or "",
+                "file_path": values[5],
+                "line_number": values[6],
+                "column_number": values[7],
+            },
+        )
+        for values in violations
+    ]
+    return AuditRecord.trusted(data)
+
+
+def compile_filter(
+    audit_filter: AuditFilter,
+    param: Callable[[int], str],
+    time_value: Callable[[datetime], Any] | None = None,
+) -> tuple[str, list[Any]]:
+    """
+    Compile an AuditFilter into an indexed WHERE / ORDER BY / LIMIT clause.
+
+    Results are ordered newest first by (timestamp, record_id). A keyset cursor
+    replaces the offset with a row-value comparison against the cursor key.
+
+    Args:
+        audit_filter: Filter criteria
+        param: Returns the placeholder for the n-th (1-based) parameter
+        time_value: Converts timestamp bounds to the column's parameter type (UTC ISO text by default)
+
+    Returns:
+        Tuple of (SQL clause, parameters)
+
+    Raises:
+        ValueError: If the filter's cursor is malformed
+    """
+    conditions: list[str] = []
+    params: list[Any] = []
+    time_value = time_value or _time_bound
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return param(len(params))
+
+    for column in FILTER_COLUMNS:
+        value = getattr(audit_filter, column)
+        if value:
+            conditions.append(f"{column} = {bind(getattr(value, 'value', value))}")
+    if audit_filter.since:
+        conditions.append(f"timestamp >= {bind(time_value(audit_filter.since))}")
+    if audit_filter.until:
+        conditions.append(f"timestamp <= {bind(time_value(audit_filter.until))}")
+
+    cursor_key = audit_filter.cursor_key()
+    if cursor_key is not None:
+        conditions.append(f"(timestamp, record_id) < ({bind(time_value(cursor_key[0]))}, {bind(cursor_key[1])})")
+
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    clause = f"{where}ORDER BY timestamp DESC, record_id DESC LIMIT {bind(audit_filter.limit)}"
+    if cursor_key is None and audit_filter.offset:
+        clause += f" OFFSET {bind(audit_filter.offset)}"
+    return clause, params
+
+
+def compile_provenance(target: str, prefix: bool, param: Callable[[int], str]) -> tuple[str, list[Any]]:
+    """
+    Compile a provenance lookup into a WHERE / ORDER BY clause.
+
+    A prefix becomes a range over the target index, ``prefix <= target <
+    upper bound``, rather than LIKE (case-insensitive in SQLite, with % and _
+    as wildcards) or substr(), which neither database can serve from an index.
+
+    Args:
+        target: Target identifier, or a target prefix
+        prefix: Match every target starting with ``target``
+        param: Returns the placeholder for the n-th (1-based) parameter
+
+    Returns:
+        Tuple of (SQL clause, parameters) selecting records oldest first
+    """
+    params: list[Any] = []
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return param(len(params))
+
+    if not prefix:
+        condition = f"target = {bind(target)}"
+    else:
+        conditions = [f"target >= {bind(target)}"]
+        upper = prefix_upper_bound(target)
+        if upper is not None:
+            conditions.append(f"target < {bind(upper)}")
+        # The bounds are in code point order (SQLite's BINARY and Postgres's C collation); the exact check keeps other collations correct
+        conditions.append(f"substr(target, 1, {bind(len(target))}) = {bind(target)}")
+        condition = " AND ".join(conditions)
+    return f"WHERE {condition} ORDER BY timestamp, record_id", params
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Return the smallest string above every string starting with ``prefix``, in code point order.
+
+    Args:
+        prefix: Target prefix
+
+    Returns:
+        The prefix with its last character incremented (dropping trailing maximal
+        characters first), or None if no string is above every match
+    """
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    following = ord(stripped[-1]) + 1
+    # Surrogates cannot be stored as text, and nothing sorts between them and U+E000
+    if 0xD800 <= following <= 0xDFFF:
+        following = 0xE000
+    return stripped[:-1] + chr(following)
+
+
+def rollup_upsert_sql(param: Callable[[int], str]) -> str:
+    """
+    Build the statement adding counts to rollup buckets, creating missing ones.
+
+    Args:
+        param: Returns the placeholder for the n-th (1-based) parameter
+
+    Returns:
+        Upsert statement taking values in ``ROLLUP_COLUMNS`` order
+    """
+    placeholders = ", ".join(param(n) for n in range(1, len(ROLLUP_COLUMNS) + 1))
+    return (
+        f"INSERT INTO audit_rollups ({', '.join(ROLLUP_COLUMNS)}) VALUES ({placeholders}) "
+        "ON CONFLICT (granularity, dimension, bucket_start, value) DO UPDATE SET count = audit_rollups.count + excluded.count"
+    )
+
+
+def compile_rollup_query(
+    granularity: str,
+    dimension: str,
+    since: datetime | None,
+    until: datetime | None,
+    values: Sequence[str] | None,
+    param: Callable[[int], str],
+    time_value: Callable[[datetime], Any] | None = None,
+) -> tuple[str, list[Any]]:
+    """
+    Compile a rollup read into a SELECT over one granularity and dimension.
+
+    Args:
+        granularity: Bucket width name
+        dimension: Dimension name
+        since: Earliest bucket start (inclusive, unbounded if None)
+        until: Latest bucket start (inclusive, unbounded if None)
+        values: Only these dimension values (all if None)
+        param: Returns the placeholder for the n-th (1-based) parameter
+        time_value: Converts bucket bounds to the column's parameter type (UTC ISO text by default)
+
+    Returns:
+        Tuple of (SQL statement, parameters) selecting ``ROLLUP_COLUMNS`` by start, then value
+    """
+    params: list[Any] = []
+    time_value = time_value or _time_bound
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return param(len(params))
+
+    conditions = [f"granularity = {bind(granularity)}", f"dimension = {bind(dimension)}"]
+    if since:
+        conditions.append(f"bucket_start >= {bind(time_value(since))}")
+    if until:
+        conditions.append(f"bucket_start <= {bind(time_value(until))}")
+    if values is not None:
+        conditions.append(f"value IN ({', '.join(bind(value) for value in values) or 'NULL'})")
+    return f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM audit_rollups WHERE {' AND '.join(conditions)} ORDER BY bucket_start, value", params
+
+
+def _time_bound(value: datetime) -> str:
+    """Format a filter bound to compare against stored UTC timestamp text."""
+    return value.astimezone(UTC).isoformat() if value.tzinfo else value.isoformat()
+
+
+def _parse_time(value: str | datetime) -> datetime:
+    """Read a timestamp column written as ISO-8601 text."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _parse_json(value: str | dict[str, Any] | None) -> dict[str, Any]:
+    """Read a JSON object column."""
+    if value is None or value == "{}":
+        return {}
+    return value if isinstance(value, dict) else json.loads(value)
@@ -0,0 +1,112 @@
+"""Single-writer sequencer serializing appends to an audit chain."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
+
+from .models import AuditRecord
+
+DEFAULT_MAX_GROUP_SIZE = 1024  # Upper bound on records folded into one group commit
+
+_Pending = tuple[list[AuditRecord], "asyncio.Future[list[AuditRecord]]"]
+
+
+class ChainSequencer:
+    """
+    Serialize chain appends through a single writer task.
+
+    Callers enqueue records on an asyncio queue and await a future. One writer
+    task drains the queue, folds every waiting submission into a single group
+    commit and resolves each caller's future with its committed records. The
+    writer only runs while there is work, so the sequencer can be used from
+    short-lived event loops such as the one ``AuditContext.__exit__`` creates.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[list[AuditRecord]], Awaitable[list[AuditRecord]]],
+        max_group_size: int = DEFAULT_MAX_GROUP_SIZE,
+    ) -> None:
+        """
+        Initialize sequencer.
+
+        Args:
+            commit: Coroutine that links, mines and appends a batch in order
+            max_group_size: Maximum number of records per group commit
+        """
+        self._commit = commit
+        self.max_group_size = max_group_size
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._writer: asyncio.Task[None] | None = None
+
+    async def submit(self, records: list[AuditRecord]) -> list[AuditRecord]:
+        """
+        Queue records for append and wait until they are committed.
+
+        Args:
+            records: Audit records to append contiguously and in order
+
+        Returns:
+            The committed records
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Queues and futures are bound to the loop that created them
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = None
+
+        future: asyncio.Future[list[AuditRecord]] = loop.create_future()
+        self._queue.put_nowait((records, future))
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue in group commits until it is empty."""
+        while not self._queue.empty():
+            group = [self._queue.get_nowait()]
+            size = len(group[0][0])
+            while not self._queue.empty() and size < self.max_group_size:
+                group.append(self._queue.get_nowait())
+                size += len(group[-1][0])
+            await self._commit_group(group)
+
+    async def _commit_group(self, group: list[_Pending]) -> None:
+        """Commit a group of submissions and resolve their futures."""
+        live = [(records, future) for records, future in group if not future.cancelled()]
+        if not live:
+            return
+
+        batch = [record for records, _ in live for record in records]
+        try:
+            committed = await self._commit(batch)
+        except Exception as exc:
+            if len(live) == 1:
+                _resolve(live[0][1], exc)
+                return
+            # Retry submissions one at a time so a bad one cannot fail the rest
+            logger.warning(f"Group commit of {len(batch)} records failed ({exc}); retrying {len(live)} submissions individually")
+            for records, future in live:
+                try:
+                    _resolve(future, await self._commit(records))
+                except Exception as single_exc:
+                    _resolve(future, single_exc)
+            return
+
+        offset = 0
+        for records, future in live:
+            _resolve(future, committed[offset : offset + len(records)])
+            offset += len(records)
+
+
+def _resolve(future: "asyncio.Future[list[AuditRecord]]", outcome: list[AuditRecord] | BaseException) -> None:
+    """Deliver a result or exception to a caller that is still waiting."""
+    if future.done():
+        return
+    if isinstance(outcome, BaseException):
+        future.set_exception(outcome)
+    else:
+        future.set_result(outcome)
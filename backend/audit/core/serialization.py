@@ -0,0 +1,74 @@
+"""Canonical byte encoding of audit records and timestamps for persistent storage."""
+
+import json
+from datetime import UTC, datetime, timedelta, timezone
+
+from .models import AuditRecord
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_record(record: AuditRecord) -> bytes:
+    """
+    Encode record to compact UTF-8 JSON bytes.
+
+    Args:
+        record: Audit record to encode
+
+    Returns:
+        Encoded record
+    """
+    data = record.model_dump(mode="json", exclude={"context", "metadata"})
+    data["context"] = record.context
+    data["metadata"] = record.metadata
+    return json.dumps(data, default=str, separators=(",", ":")).encode()
+
+
+def decode_record(payload: bytes | memoryview) -> AuditRecord:
+    """
+    Decode record previously produced by ``encode_record``.
+
+    Parsing and validation run in one native pass, which is faster than
+    ``json.loads`` followed by a trusted construction; the stored hash is
+    kept, not recalculated.
+
+    Args:
+        payload: Encoded record bytes
+
+    Returns:
+        Decoded audit record
+    """
+    return AuditRecord.model_validate_json(bytes(payload))
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """
+    Convert a timestamp to integer nanoseconds since the epoch.
+
+    Args:
+        timestamp: Timestamp (naive timestamps are taken as UTC)
+
+    Returns:
+        Epoch nanoseconds
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return (timestamp - _EPOCH) // _MICROSECOND * 1000
+
+
+def from_epoch_ns(value: int, offset: int | None) -> datetime:
+    """
+    Convert epoch nanoseconds back to a timestamp.
+
+    Args:
+        value: Epoch nanoseconds
+        offset: UTC offset in seconds, or None for a naive timestamp
+
+    Returns:
+        Timestamp in the given offset
+    """
+    timestamp = _EPOCH + timedelta(microseconds=value // 1000)
+    if offset is None:
+        return timestamp.replace(tzinfo=None)
+    return timestamp if offset == 0 else timestamp.astimezone(timezone(timedelta(seconds=offset)))
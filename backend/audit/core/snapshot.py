@@ -0,0 +1,329 @@
+"""Compact binary chain snapshots with memory-mapped random access."""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+from pydantic import TypeAdapter
+
+from .models import AuditFinding, AuditRecord, AuditSeverity, AuditSignature, AuditStatus, AuditTargetType, AuditViolation, DataClassification
+from .serialization import from_epoch_ns, to_epoch_ns
+
+SNAPSHOT_MAGIC = b"AUDSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+# File layout: header, record bodies, string dictionary, record table.
+# Header: magic, version, record entry size, record count, dictionary offset, dictionary size (strings), table offset
+_HEADER = struct.Struct("<8sHHQQQQ")
+_HEADER_SIZE = 64  # Header padded for future fields
+# Record table entry, one per record:
+#   record_id (UUID bytes), record_hash, previous_hash (SHA-256 bytes), nonce, timestamp (epoch ns), UTC offset seconds,
+#   target_type, severity, classification, status codes, actor, action, target, source, reason string ids,
+#   body offset, body length, body CRC32, flags
+_ENTRY = struct.Struct("<16s32s32sqqiBBBBIIIIIQIIB")
+
+_NAIVE = -(2**31)  # UTC offset of a naive timestamp
+_NO_STRING = 0xFFFFFFFF  # String id of a None reason
+
+# Flags for fields kept in the body because they do not fit their fixed-width slot
+_ID_IN_BODY = 1
+_HASH_IN_BODY = 2
+_PREVIOUS_IN_BODY = 4
+
+_TARGET_TYPES = list(AuditTargetType)
+_SEVERITIES = list(AuditSeverity)
+_CLASSIFICATIONS = list(DataClassification)
+_STATUSES = list(AuditStatus)
+_CODES = {member: code for members in (_TARGET_TYPES, _SEVERITIES, _CLASSIFICATIONS, _STATUSES) for code, member in enumerate(members)}
+
+_NESTED: dict[str, TypeAdapter[Any]] = {
+    "signatures": TypeAdapter(list[AuditSignature]),
+    "findings": TypeAdapter(list[AuditFinding]),
+    "violations": TypeAdapter(list[AuditViolation]),
+}
+
+
+def write_snapshot(records: Iterable[AuditRecord], path: str | Path) -> int:
+    """
+    Write records to a binary snapshot file.
+
+    Records are streamed: bodies go straight to the file and record table
+    entries to a temporary file, so only the string dictionary (distinct
+    actors, actions, targets, sources and reasons) is held in memory. The
+    snapshot is written beside ``path`` and renamed into place.
+
+    Args:
+        records: Records in chain order
+        path: Snapshot file
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    strings: dict[str, int] = {}
+
+    def string_id(value: str | None) -> int:
+        if value is None:
+            return _NO_STRING
+        code = strings.get(value)
+        if code is None:
+            code = strings[value] = len(strings)
+        return code
+
+    count = 0
+    with temporary.open("wb") as handle, tempfile.TemporaryFile() as table:
+        handle.write(bytes(_HEADER_SIZE))
+        offset = _HEADER_SIZE
+        for record in records:
+            # Values that do not fit their slot, such as the genesis previous_hash "0", are kept in the body
+            record_id, record_hash, previous_hash = _pack_uuid(record.record_id), _pack_hex(record.record_hash), _pack_hex(record.previous_hash)
+            flags = (
+                (_ID_IN_BODY if record_id is None else 0) | (_HASH_IN_BODY if record_hash is None else 0) | (_PREVIOUS_IN_BODY if previous_hash is None else 0)
+            )
+            body = _encode_body(record, flags)
+            utc_offset = record.timestamp.utcoffset()
+
+            table.write(
+                _ENTRY.pack(
+                    record_id or bytes(16),
+                    record_hash or bytes(32),
+                    previous_hash or bytes(32),
+                    record.nonce,
+                    to_epoch_ns(record.timestamp),
+                    _NAIVE if utc_offset is None else int(utc_offset.total_seconds()),
+                    _CODES[record.target_type],
+                    _CODES[record.severity],
+                    _CODES[record.classification],
+                    _CODES[record.status],
+                    string_id(record.actor),
+                    string_id(record.action),
+                    string_id(record.target),
+                    string_id(record.source),
+                    string_id(record.reason),
+                    offset,
+                    len(body),
+                    zlib.crc32(body),
+                    flags,
+                )
+            )
+            handle.write(body)
+            offset += len(body)
+            count += 1
+
+        # String dictionary: end offsets of each string, then the UTF-8 data
+        dictionary_offset = offset
+        encoded = [value.encode() for value in strings]
+        ends = array("Q")
+        end = 0
+        for value in encoded:
+            end += len(value)
+            ends.append(end)
+        handle.write(ends.tobytes())
+        handle.writelines(encoded)
+
+        table_offset = dictionary_offset + ends.itemsize * len(ends) + end
+        table.seek(0)
+        shutil.copyfileobj(table, handle)
+
+        handle.seek(0)
+        handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _ENTRY.size, count, dictionary_offset, len(strings), table_offset))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    temporary.replace(path)
+    logger.info(f"Wrote audit chain snapshot {path} ({count} records, {len(strings)} strings)")
+    return count
+
+
+class ChainSnapshot:
+    """
+    Read-only, memory-mapped view of a binary snapshot.
+
+    Opening reads only the header. ``snapshot[n]`` unpacks one fixed-width
+    table entry, looks up its strings in the dictionary and decodes its body,
+    so any record of a multi-gigabyte archive is reached without parsing the
+    ones before it. Records are rebuilt with ``AuditRecord.trusted`` and keep
+    their stored hash; bodies are checked against their CRC32.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open a snapshot.
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot, has an unsupported version, or is truncated
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER_SIZE:
+                msg = f"Not an audit chain snapshot: {self.path}"
+                raise ValueError(msg)
+            magic, version, entry_size, count, dictionary_offset, string_count, table_offset = _HEADER.unpack_from(self._map)
+            self._count: int = count
+            self._dictionary_offset: int = dictionary_offset
+            self._string_count: int = string_count
+            self._table_offset: int = table_offset
+            if magic != SNAPSHOT_MAGIC:
+                msg = f"Not an audit chain snapshot: {self.path}"
+                raise ValueError(msg)
+            if version != SNAPSHOT_VERSION or entry_size != _ENTRY.size:
+                msg = f"Unsupported audit chain snapshot version {version} in {self.path}"
+                raise ValueError(msg)
+            if self._table_offset + self._count * _ENTRY.size > len(self._map):
+                msg = f"Truncated audit chain snapshot: {self.path}"
+                raise ValueError(msg)
+        except ValueError:
+            self._map.close()
+            raise
+        self._strings_start = self._dictionary_offset + 8 * self._string_count
+        self._string = lru_cache(maxsize=65536)(self._read_string)
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self._count
+
+    def __getitem__(self, index: int) -> AuditRecord:
+        """
+        Materialize the record at a position.
+
+        Args:
+            index: Record position (negative counts from the end)
+
+        Returns:
+            Audit record
+
+        Raises:
+            IndexError: If the position is out of range
+            ValueError: If the record's body is corrupt
+        """
+        if not -self._count <= index < self._count:
+            msg = f"Snapshot index out of range: {index}"
+            raise IndexError(msg)
+        index %= self._count
+        (
+            record_id,
+            record_hash,
+            previous_hash,
+            nonce,
+            timestamp,
+            utc_offset,
+            target_type,
+            severity,
+            classification,
+            status,
+            actor,
+            action,
+            target,
+            source,
+            reason,
+            body_offset,
+            body_length,
+            body_crc,
+            flags,
+        ) = _ENTRY.unpack_from(self._map, self._table_offset + index * _ENTRY.size)
+
+        payload = self._map[body_offset : body_offset + body_length]
+        if zlib.crc32(payload) != body_crc:
+            msg = f"Corrupt record {index} in snapshot {self.path}"
+            raise ValueError(msg)
+        body = json.loads(payload) if payload else {}
+
+        data = {
+            "record_id": body["record_id"] if flags & _ID_IN_BODY else str(UUID(bytes=record_id)),
+            "record_hash": body["record_hash"] if flags & _HASH_IN_BODY else record_hash.hex(),
+            "timestamp": from_epoch_ns(timestamp, None if utc_offset == _NAIVE else utc_offset),
+            "actor": self._string(actor),
+            "action": self._string(action),
+            "target": self._string(target),
+            "target_type": _TARGET_TYPES[target_type],
+            "source": self._string(source),
+            "reason": None if reason == _NO_STRING else self._string(reason),
+            "context": body.get("context", {}),
+            "metadata": body.get("metadata", {}),
+            "previous_hash": body["previous_hash"] if flags & _PREVIOUS_IN_BODY else previous_hash.hex(),
+            "nonce": nonce,
+            "severity": _SEVERITIES[severity],
+            "classification": _CLASSIFICATIONS[classification],
+            "status": _STATUSES[status],
+        }
+        for field, adapter in _NESTED.items():
+            data[field] = adapter.validate_python(body[field]) if field in body else []
+        return AuditRecord.trusted(data)
+
+    def __iter__(self) -> Iterator[AuditRecord]:
+        """Materialize records in order."""
+        return (self[index] for index in range(self._count))
+
+    def __enter__(self) -> "ChainSnapshot":
+        """Return the open snapshot."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._string.cache_clear()
+        self._map.close()
+
+    def _read_string(self, string_id: int) -> str:
+        """Decode one dictionary string."""
+        start = 0 if string_id == 0 else struct.unpack_from("<Q", self._map, self._dictionary_offset + 8 * (string_id - 1))[0]
+        (end,) = struct.unpack_from("<Q", self._map, self._dictionary_offset + 8 * string_id)
+        return self._map[self._strings_start + start : self._strings_start + end].decode()
+
+
+def _pack_uuid(value: str) -> bytes | None:
+    """Pack a canonical UUID string into 16 bytes, or return None if it is not one."""
+    try:
+        packed = UUID(value).bytes
+    except ValueError:
+        return None
+    return packed if str(UUID(bytes=packed)) == value else None
+
+
+def _pack_hex(value: str) -> bytes | None:
+    """Pack a lowercase SHA-256 hex digest into 32 bytes, or return None if it is not one."""
+    try:
+        packed = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return packed if len(packed) == 32 and packed.hex() == value else None
+
+
+def _encode_body(record: AuditRecord, flags: int) -> bytes:
+    """Encode the variable-length parts of a record, omitting empty ones."""
+    body: dict[str, Any] = {}
+    if flags & _ID_IN_BODY:
+        body["record_id"] = record.record_id
+    if flags & _HASH_IN_BODY:
+        body["record_hash"] = record.record_hash
+    if flags & _PREVIOUS_IN_BODY:
+        body["previous_hash"] = record.previous_hash
+    if record.context:
+        body["context"] = record.context
+    if record.metadata:
+        body["metadata"] = record.metadata
+    for field in _NESTED:
+        models = getattr(record, field)
+        if models:
+            body[field] = [model.model_dump(mode="json") for model in models]
+    return json.dumps(body, default=str, separators=(",", ":")).encode() if body else b""
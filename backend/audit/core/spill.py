@@ -0,0 +1,157 @@
+"""On-disk spill tier for audit records evicted from the in-memory store."""
+
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from loguru import logger
+
+from .chain_log import SegmentedChainLog
+from .models import AuditRecord
+
+# Superseded frames tolerated before compacting: as many as there are kept frames, and at least this many
+COMPACT_MIN_DEAD_FRAMES = 1024
+
+# Records copied per append while compacting
+_COMPACT_BATCH = 1000
+
+
+class SpillStore:
+    """
+    Records paged out of memory into a segmented log, looked up by record id.
+
+    Only a record id to log position map stays in memory. Spilling a record
+    again supersedes its earlier frame; once superseded frames outnumber the
+    kept ones, the kept frames are copied into a new log generation (a
+    numbered subdirectory) and the old generation is removed. The frame of a
+    record taken back into memory is kept, since it is the only copy a
+    restart can reload.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """
+        Initialize spill store.
+
+        Args:
+            path: Spill directory; records already spilled there are reloaded.
+                A temporary directory removed on close is used if None.
+        """
+        self._owns_directory = path is None
+        self.path = Path(tempfile.mkdtemp(prefix="audit-spill-")) if path is None else Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # The newest generation is complete (compaction renames it into place); anything else is left over
+        generations = [int(child.name) for child in self.path.iterdir() if child.is_dir() and child.name.isdigit()]
+        self._generation = max(generations, default=0)
+        for child in self.path.iterdir():
+            if child.is_dir() and child.name != str(self._generation):
+                shutil.rmtree(child, ignore_errors=True)
+        self._log = SegmentedChainLog(self.path / str(self._generation))
+
+        # The latest copy of a record wins if it was spilled more than once
+        self._positions: dict[str, int] = {record.record_id: position for position, record in enumerate(self._log)}
+        # Latest frames of records taken back into memory, kept until spilled again
+        self._discarded: dict[str, int] = {}
+        if self._positions:
+            logger.info(f"Reloaded {len(self._positions)} spilled audit records from {self.path}")
+        self._maybe_compact()
+
+    def __len__(self) -> int:
+        """Return the number of spilled records."""
+        return len(self._positions)
+
+    def __contains__(self, record_id: object) -> bool:
+        """Check whether a record is spilled."""
+        return record_id in self._positions
+
+    def __iter__(self) -> Iterator[AuditRecord]:
+        """Page every spilled record back in log order, by id so a compaction while iterating is harmless."""
+        for record_id in sorted(self._positions, key=self._positions.__getitem__):
+            record = self.get(record_id)
+            if record is not None:
+                yield record
+
+    @property
+    def dead_frames(self) -> int:
+        """Number of superseded frames a compaction would drop."""
+        return len(self._log) - len(self._positions) - len(self._discarded)
+
+    def get(self, record_id: str) -> AuditRecord | None:
+        """
+        Page a spilled record back in.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            The record, or None if it is not spilled
+        """
+        position = self._positions.get(record_id)
+        return self._log[position] if position is not None else None
+
+    def extend(self, records: Iterable[AuditRecord]) -> None:
+        """
+        Spill records in one append, compacting the log if superseded frames have piled up.
+
+        Args:
+            records: Records evicted from memory
+        """
+        batch = list(records)
+        base = len(self._log)
+        self._log.extend(batch)
+        for offset, record in enumerate(batch):
+            self._positions[record.record_id] = base + offset
+            self._discarded.pop(record.record_id, None)
+        self._maybe_compact()
+
+    def discard(self, record_id: str) -> None:
+        """
+        Forget a spilled record (for example when it is stored again in memory).
+
+        Args:
+            record_id: Record identifier
+        """
+        position = self._positions.pop(record_id, None)
+        if position is not None:
+            self._discarded[record_id] = position
+
+    def close(self) -> None:
+        """Close the log, removing it if it lives in a temporary directory."""
+        self._log.close()
+        if self._owns_directory:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def _maybe_compact(self) -> None:
+        """Compact once superseded frames outnumber the kept ones."""
+        kept = len(self._positions) + len(self._discarded)
+        if self.dead_frames >= max(COMPACT_MIN_DEAD_FRAMES, kept):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Copy the kept frames, in log order, into the next generation and remove the current one."""
+        dead = self.dead_frames
+        generation = self._generation + 1
+        staging = self.path / f"{generation}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+
+        kept = sorted(
+            [
+                *((position, record_id, True) for record_id, position in self._positions.items()),
+                *((position, record_id, False) for record_id, position in self._discarded.items()),
+            ]
+        )
+        compacted = SegmentedChainLog(staging, segment_size=self._log.segment_size)
+        for start in range(0, len(kept), _COMPACT_BATCH):
+            compacted.extend([self._log[position] for position, _, _ in kept[start : start + _COMPACT_BATCH]])
+        compacted.close()
+        staging.rename(self.path / str(generation))
+
+        old = self._log.path
+        self._log.close()
+        shutil.rmtree(old, ignore_errors=True)
+        self._log = SegmentedChainLog(self.path / str(generation))
+        self._generation = generation
+        self._positions = {record_id: position for position, (_, record_id, live) in enumerate(kept) if live}
+        self._discarded = {record_id: position for position, (_, record_id, live) in enumerate(kept) if not live}
+        logger.info(f"Compacted spill log {self.path}: dropped {dead} superseded frames, kept {len(kept)}")
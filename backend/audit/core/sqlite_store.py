@@ -0,0 +1,316 @@
+"""Embedded SQLite backend for the audit store."""
+
+import asyncio
+import sqlite3
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from .models import AuditFilter, AuditRecord, AuditSeverity
+from .rollups import RollupBucket, as_utc, rollup_counts, rollup_dimension, validate_rollup_query
+from .schema import (
+    CHILD_STATISTICS_SQL,
+    FINDING_COLUMNS,
+    RECORD_STATISTICS_SQL,
+    RECORD_COLUMNS,
+    SCHEMA_STATEMENTS,
+    SIGNATURE_COLUMNS,
+    VIOLATION_COLUMNS,
+    compile_filter,
+    compile_provenance,
+    compile_rollup_query,
+    finding_rows,
+    record_from_row,
+    record_row,
+    rollup_upsert_sql,
+    signature_rows,
+    violation_rows,
+)
+
+DEFAULT_BATCH_SIZE = 500  # Rows per executemany call inside one transaction
+
+_T = TypeVar("_T")
+
+_ROLLUP_UPSERT_SQL = rollup_upsert_sql(lambda _: "?")
+
+
+def _insert_sql(table: str, columns: Sequence[str]) -> str:
+    """Build an idempotent insert statement."""
+    return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+class SQLiteAuditBackend:
+    """
+    Durable audit record storage in a single SQLite file.
+
+    Uses the SPEC-AUDIT tables and indexes in WAL mode, so readers do not
+    block the writer. Each batch of records is inserted in one transaction and
+    filters are compiled to indexed SQL. Blocking database calls run in a
+    worker thread to keep the event loop responsive.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Initialize SQLite backend, creating the schema if needed.
+
+        Args:
+            path: Database file path
+            batch_size: Rows per executemany call within a transaction
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        for statement in SCHEMA_STATEMENTS:
+            self._conn.execute(statement)
+
+    async def store_records(self, records: list[AuditRecord]) -> None:
+        """
+        Insert records and their findings, violations and signatures in one transaction.
+
+        Records already stored are left unchanged; new child rows (such as a
+        signature added after storing) are still inserted.
+
+        Args:
+            records: Audit records to store
+        """
+        await self._run(self._insert, records)
+
+    async def get_record(self, record_id: str) -> AuditRecord | None:
+        """
+        Retrieve record by ID.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Audit record if found, None otherwise
+        """
+        records = await self._run(self._select, "WHERE record_id = ?", [record_id])
+        return records[0] if records else None
+
+    async def query_records(self, audit_filter: AuditFilter) -> list[AuditRecord]:
+        """
+        Query records with the filter compiled to indexed SQL.
+
+        Args:
+            audit_filter: Filter criteria
+
+        Returns:
+            Matching records, newest first
+
+        Raises:
+            ValueError: If the filter's cursor is malformed
+        """
+        clause, params = compile_filter(audit_filter, lambda _: "?")
+        return await self._run(self._select, clause, params)
+
+    async def get_provenance(self, target: str, prefix: bool = False) -> list[AuditRecord]:
+        """
+        Read the complete provenance chain of a target from the target index.
+
+        Args:
+            target: Target identifier, or a target prefix
+            prefix: Include every target starting with ``target``
+
+        Returns:
+            Records affecting the target(s), oldest first
+        """
+        clause, params = compile_provenance(target, prefix, lambda _: "?")
+        return await self._run(self._select, clause, params)
+
+    async def iter_records(self, batch_size: int | None = None) -> AsyncIterator[list[AuditRecord]]:
+        """
+        Read every stored record in batches.
+
+        Args:
+            batch_size: Records per batch (defaults to the backend batch size)
+
+        Yields:
+            Batches of records in insertion order
+        """
+        last_rowid = 0
+        while True:
+            last_rowid, records = await self._run(self._scan, last_rowid, batch_size or self.batch_size)
+            if not records:
+                return
+            yield records
+
+    async def get_statistics(self) -> dict[str, Any]:
+        """
+        Compute storage statistics with SQL aggregates.
+
+        Returns:
+            Dictionary with storage metrics
+        """
+        return await self._run(self._statistics)
+
+    async def get_rollups(
+        self,
+        granularity: str,
+        dimension: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        values: Sequence[str] | None = None,
+        severity: AuditSeverity | str | None = None,
+    ) -> list[RollupBucket]:
+        """
+        Read materialized rollup buckets in a time range.
+
+        Args:
+            granularity: One of ``GRANULARITIES``
+            dimension: One of ``ROLLUP_DIMENSIONS``
+            since: Earliest bucket start (inclusive, unbounded if None)
+            until: Latest bucket start (inclusive, unbounded if None)
+            values: Only these dimension values (all if None)
+            severity: Only count records (violations, for rules) of this severity (all if None)
+
+        Returns:
+            Buckets ordered by start, then value
+
+        Raises:
+            ValueError: If the granularity, dimension or severity split is unknown
+        """
+        split = validate_rollup_query(granularity, dimension, severity)
+        sql, params = compile_rollup_query(
+            granularity, rollup_dimension(dimension, split), since, until, values, lambda _: "?", lambda value: as_utc(value).isoformat()
+        )
+        rows = await self._run(lambda: self._conn.execute(sql, params).fetchall())
+        return [
+            RollupBucket(granularity=row[0], dimension=dimension, severity=split, bucket_start=datetime.fromisoformat(row[2]), value=row[3], count=row[4])
+            for row in rows
+        ]
+
+    async def rebuild_rollups(self) -> None:
+        """Recount the rollup table from every stored record (for databases written before rollups existed)."""
+        await self._run(self._rebuild_rollups)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _insert(self, records: list[AuditRecord]) -> None:
+        """Insert a batch of records in a single transaction, counting new ones into the rollups."""
+        tables = (
+            (_insert_sql("audit_records", RECORD_COLUMNS), [record_row(record) for record in records]),
+            (_insert_sql("audit_findings", FINDING_COLUMNS), finding_rows(records)),
+            (_insert_sql("audit_violations", VIOLATION_COLUMNS), violation_rows(records)),
+            (_insert_sql("audit_signatures", SIGNATURE_COLUMNS), signature_rows(records)),
+        )
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            new_records = self._new_records(records)
+            for sql, rows in tables:
+                for i in range(0, len(rows), self.batch_size):
+                    self._conn.executemany(sql, rows[i : i + self.batch_size])
+            self._upsert_rollups(new_records)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        logger.debug(f"SQLite stored {len(records)} audit records")
+
+    def _new_records(self, records: list[AuditRecord]) -> list[AuditRecord]:
+        """Return the records of a batch not stored yet, each once."""
+        seen: set[str] = set()
+        for i in range(0, len(records), self.batch_size):
+            chunk = [record.record_id for record in records[i : i + self.batch_size]]
+            sql = f"SELECT record_id FROM audit_records WHERE record_id IN ({', '.join('?' * len(chunk))})"
+            seen.update(row[0] for row in self._conn.execute(sql, chunk))
+
+        new_records = []
+        for record in records:
+            if record.record_id not in seen:
+                seen.add(record.record_id)
+                new_records.append(record)
+        return new_records
+
+    def _rebuild_rollups(self) -> None:
+        """Recount the rollup table in one transaction, so no concurrent insert is missed or counted twice."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM audit_rollups")
+            last_rowid = 0
+            while True:
+                last_rowid, records = self._scan(last_rowid, self.batch_size)
+                if not records:
+                    break
+                self._upsert_rollups(records)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _upsert_rollups(self, records: list[AuditRecord]) -> None:
+        """Add newly stored records to the rollup buckets."""
+        rows = [(granularity, dimension, start.isoformat(), value, count) for (granularity, dimension, start, value), count in rollup_counts(records).items()]
+        for i in range(0, len(rows), self.batch_size):
+            self._conn.executemany(_ROLLUP_UPSERT_SQL, rows[i : i + self.batch_size])
+
+    def _select(self, clause: str, params: list[Any]) -> list[AuditRecord]:
+        """Select records and attach their child rows."""
+        rows = self._conn.execute(f"SELECT {', '.join(RECORD_COLUMNS)} FROM audit_records {clause}", params).fetchall()
+        return self._attach_children(rows)
+
+    def _scan(self, after_rowid: int, batch_size: int) -> tuple[int, list[AuditRecord]]:
+        """Read the next batch of records in rowid order."""
+        rows = self._conn.execute(
+            f"SELECT rowid, {', '.join(RECORD_COLUMNS)} FROM audit_records WHERE rowid > ? ORDER BY rowid LIMIT ?", (after_rowid, batch_size)
+        ).fetchall()
+        if not rows:
+            return after_rowid, []
+        return rows[-1][0], self._attach_children([row[1:] for row in rows])
+
+    def _attach_children(self, rows: list[tuple[Any, ...]]) -> list[AuditRecord]:
+        """Fetch findings, violations and signatures for a page of record rows."""
+        if not rows:
+            return []
+        record_ids = [row[0] for row in rows]
+        children = [
+            self._children(table, columns, record_ids)
+            for table, columns in (
+                ("audit_findings", FINDING_COLUMNS),
+                ("audit_violations", VIOLATION_COLUMNS),
+                ("audit_signatures", SIGNATURE_COLUMNS),
+            )
+        ]
+        return [record_from_row(row, *(child[row[0]] for child in children)) for row in rows]
+
+    def _children(self, table: str, columns: Sequence[str], record_ids: list[str]) -> dict[str, list[tuple[Any, ...]]]:
+        """Group a child table's rows by record, in list order."""
+        grouped: dict[str, list[tuple[Any, ...]]] = defaultdict(list)
+        placeholders = ", ".join("?" * len(record_ids))
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE record_id IN ({placeholders}) ORDER BY record_id, ordinal"
+        for row in self._conn.execute(sql, record_ids):
+            grouped[row[1]].append(row)
+        return grouped
+
+    def _statistics(self) -> dict[str, Any]:
+        """Aggregate storage metrics."""
+        total, earliest, latest = self._conn.execute(RECORD_STATISTICS_SQL).fetchone()
+        stats: dict[str, Any] = {"total_records": total, "storage_backend": "sqlite"}
+        if not total:
+            return stats
+
+        findings, violations, signed = self._conn.execute(CHILD_STATISTICS_SQL).fetchone()
+        stats.update(earliest_record=earliest, latest_record=latest, total_findings=findings, total_violations=violations, signed_records=signed)
+        return stats
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a database call in a worker thread, one at a time."""
+
+        def locked() -> _T:
+            with self._lock:
+                return func(*args)
+
+        return await asyncio.to_thread(locked)
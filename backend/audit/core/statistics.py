@@ -0,0 +1,118 @@
+"""Incrementally maintained counters behind chain and store statistics."""
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from .models import AuditRecord, AuditSeverity
+
+
+class AuditStatistics:
+    """
+    Counters updated as records are added, so statistics are read in O(1).
+
+    Tracks the record count, earliest and latest timestamps, per-actor and
+    per-action counts (for distinct counts), a severity histogram, and the
+    number of findings, violations and signed records.
+    """
+
+    def __init__(self, records: Iterable[AuditRecord] = ()) -> None:
+        """
+        Initialize counters.
+
+        Args:
+            records: Records to count up front
+        """
+        self.total = 0
+        self.earliest: datetime | None = None
+        self.latest: datetime | None = None
+        self.actors: Counter[str] = Counter()
+        self.actions: Counter[str] = Counter()
+        self.severities: Counter[str] = Counter()
+        self.findings = 0
+        self.violations = 0
+        # Signatures are added after a record is created, in place, so signed records are tracked by id
+        self._signed: set[str] = set()
+        for record in records:
+            self.add(record)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare every counter."""
+        if not isinstance(other, AuditStatistics):
+            return NotImplemented
+        return self._state() == other._state()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def signed(self) -> int:
+        """Return the number of signed records."""
+        return len(self._signed)
+
+    def add(self, record: AuditRecord) -> None:
+        """
+        Count a new record.
+
+        Args:
+            record: Audit record
+        """
+        self.total += 1
+        if self.earliest is None or record.timestamp < self.earliest:
+            self.earliest = record.timestamp
+        if self.latest is None or record.timestamp > self.latest:
+            self.latest = record.timestamp
+        self._count(record, 1)
+
+    def replace(self, old: AuditRecord, new: AuditRecord) -> None:
+        """
+        Recount a record stored again, such as after it was signed.
+
+        Args:
+            old: Previously counted copy
+            new: Copy replacing it (with the same timestamp)
+        """
+        self._count(old, -1)
+        self._count(new, 1)
+
+    def chain_statistics(self) -> dict[str, Any]:
+        """Format the counters as ``AuditChain.get_statistics`` reports them."""
+        return {
+            "total_records": self.total,
+            "earliest_timestamp": self.earliest.isoformat() if self.earliest else None,
+            "latest_timestamp": self.latest.isoformat() if self.latest else None,
+            "unique_actors": len(self.actors),
+            "unique_actions": len(self.actions),
+            "severity_counts": {severity.name: self.severities[severity.value] for severity in AuditSeverity},
+        }
+
+    def store_statistics(self) -> dict[str, Any]:
+        """Format the counters as ``AuditStore.get_statistics`` reports them for memory storage."""
+        stats: dict[str, Any] = {"total_records": self.total, "storage_backend": "memory"}
+        if self.total:
+            assert self.earliest is not None and self.latest is not None
+            stats.update(
+                earliest_record=self.earliest.isoformat(),
+                latest_record=self.latest.isoformat(),
+                total_findings=self.findings,
+                total_violations=self.violations,
+                signed_records=self.signed,
+            )
+        return stats
+
+    def _count(self, record: AuditRecord, sign: int) -> None:
+        """Add or remove a record's contribution to the per-record counters."""
+        for counter, key in ((self.actors, record.actor), (self.actions, record.action), (self.severities, record.severity.value)):
+            counter[key] += sign
+            if counter[key] <= 0:
+                del counter[key]
+        self.findings += sign * len(record.findings)
+        self.violations += sign * len(record.violations)
+        if sign > 0 and record.signatures:
+            self._signed.add(record.record_id)
+        elif sign < 0:
+            self._signed.discard(record.record_id)
+
+    def _state(self) -> tuple[Any, ...]:
+        """Return every counter for comparison."""
+        return (self.total, self.earliest, self.latest, self.actors, self.actions, self.severities, self.findings, self.violations, self._signed)
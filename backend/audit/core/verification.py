@@ -0,0 +1,101 @@
+"""Chunked chain and record verification for process pool workers."""
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from .chain_log import SegmentedChainLog
+from .models import AuditRecord
+
+DEFAULT_VERIFY_CHUNK_SIZE = 10000  # Records per worker task
+
+
+class ChunkResult(NamedTuple):
+    """Outcome of verifying one contiguous chunk of the chain."""
+
+    start: int
+    first_record_id: str
+    first_previous_hash: str
+    last_hash: str
+    failure_index: int | None = None
+    failure_kind: str | None = None  # "hash", "link" or "pow"
+    failure_message: str | None = None
+
+
+def verify_records(records: Iterable[AuditRecord], start: int, difficulty: int) -> ChunkResult:
+    """
+    Verify hashes, proof-of-work and links inside one chunk of the chain.
+
+    The link from the first record to the record before the chunk is left to
+    the caller, which checks it at the seam against the previous chunk.
+
+    Args:
+        records: Consecutive chain records starting at chain position ``start``
+        start: Chain position of the first record
+        difficulty: Required proof-of-work difficulty
+
+    Returns:
+        Chunk result with the first failing position, if any
+    """
+    target = "0" * difficulty
+    first_record_id = first_previous_hash = ""
+    previous: AuditRecord | None = None
+    for i, current in enumerate(records, start=start):
+        if previous is None:
+            first_record_id, first_previous_hash = current.record_id, current.previous_hash
+
+        # Verify current record hash
+        if not current.verify():
+            return ChunkResult(start, first_record_id, first_previous_hash, "", i, "hash", f"Record {i} ({current.record_id}) failed hash verification")
+
+        # Verify link to previous record
+        if previous is not None and current.previous_hash != previous.record_hash:
+            return ChunkResult(
+                start, first_record_id, first_previous_hash, "", i, "link", link_error(i, current.record_id, previous.record_hash, current.previous_hash)
+            )
+
+        # Verify proof-of-work
+        if not current.record_hash.startswith(target):
+            return ChunkResult(start, first_record_id, first_previous_hash, "", i, "pow", f"Record {i} ({current.record_id}) has insufficient proof-of-work")
+
+        previous = current
+
+    return ChunkResult(start, first_record_id, first_previous_hash, previous.record_hash if previous else "")
+
+
+def link_error(index: int, record_id: str, expected_hash: str, previous_hash: str) -> str:
+    """Format the error reported for a broken previous_hash link."""
+    return f"Record {index} ({record_id}) has invalid previous_hash. Expected {expected_hash[:16]}..., got {previous_hash[:16]}..."
+
+
+def verify_log_range(path: str, start: int, end: int, difficulty: int) -> ChunkResult:
+    """
+    Verify a chunk read directly from a persistent chain log.
+
+    Args:
+        path: Chain log directory
+        start: Chain position of the first record (inclusive)
+        end: Chain position after the last record (exclusive)
+        difficulty: Required proof-of-work difficulty
+
+    Returns:
+        Chunk result with the first failing position, if any
+    """
+    log = SegmentedChainLog(Path(path), read_only=True)
+    try:
+        return verify_records((log[i] for i in range(start, end)), start, difficulty)
+    finally:
+        log.close()
+
+
+def find_invalid_records(records: list[AuditRecord]) -> list[str]:
+    """
+    Return ids of records whose stored hash does not match their content.
+
+    Args:
+        records: Audit records to check
+
+    Returns:
+        Record ids that failed verification
+    """
+    return [record.record_id for record in records if not record.verify()]
@@ -0,0 +1,121 @@
+"""Signed verified-watermark for incremental chain verification."""
+
+import hashlib
+import hmac
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
+
+WATERMARK_FILENAME = "watermark.json"
+
+
+class ChainWatermark(BaseModel):
+    """Signed statement that the chain was verified up to a given record."""
+
+    index: int
+    record_hash: str
+    verified_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    signature: str = ""
+
+    class Config:
+        """Pydantic config."""
+
+        frozen = True
+
+    def payload(self) -> bytes:
+        """Return the bytes covered by the signature."""
+        return f"{self.index}:{self.record_hash}:{self.verified_at.isoformat()}".encode()
+
+    def signed(self, key: bytes) -> "ChainWatermark":
+        """
+        Return a copy of this watermark signed with HMAC-SHA256.
+
+        Args:
+            key: Secret signing key
+
+        Returns:
+            Signed watermark
+        """
+        signature = hmac.new(key, self.payload(), hashlib.sha256).hexdigest()
+        return self.model_copy(update={"signature": signature})
+
+    def verify_signature(self, key: bytes) -> bool:
+        """
+        Check the watermark signature.
+
+        Args:
+            key: Secret signing key
+
+        Returns:
+            True if the signature is valid for this key
+        """
+        expected = hmac.new(key, self.payload(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, self.signature)
+
+
+class WatermarkStore:
+    """Holds the latest watermark in memory and, for persistent chains, on disk."""
+
+    def __init__(self, key: str | bytes | None = None, directory: Path | None = None) -> None:
+        """
+        Initialize watermark store.
+
+        Args:
+            key: Secret signing key (a per-process random key if None, so watermarks do not survive restarts)
+            directory: Directory to persist the watermark in (memory only if None)
+        """
+        if key is None:
+            self._key = os.urandom(32)
+        else:
+            self._key = key.encode() if isinstance(key, str) else key
+        self.path = directory / WATERMARK_FILENAME if directory is not None else None
+        self._watermark: ChainWatermark | None = None
+
+    def load(self) -> ChainWatermark | None:
+        """
+        Return the current watermark if its signature is valid.
+
+        Returns:
+            Trusted watermark, or None if there is none or it fails verification
+        """
+        watermark = self._watermark
+        if watermark is None and self.path is not None and self.path.exists():
+            try:
+                watermark = ChainWatermark.model_validate_json(self.path.read_text())
+            except ValidationError as exc:
+                logger.warning(f"Ignoring unreadable chain watermark at {self.path}: {exc}")
+                return None
+
+        if watermark is None:
+            return None
+        if not watermark.verify_signature(self._key):
+            logger.warning(f"Ignoring chain watermark with invalid signature (index={watermark.index})")
+            return None
+
+        self._watermark = watermark
+        return watermark
+
+    def save(self, index: int, record_hash: str) -> ChainWatermark:
+        """
+        Sign and store a new watermark.
+
+        Args:
+            index: Chain position verified up to (inclusive)
+            record_hash: Hash of the record at that position
+
+        Returns:
+            The signed watermark
+        """
+        watermark = ChainWatermark(index=index, record_hash=record_hash).signed(self._key)
+        self._watermark = watermark
+
+        if self.path is not None:
+            # Write atomically so a crash never leaves a truncated watermark behind
+            temp_path = self.path.with_suffix(".tmp")
+            temp_path.write_text(watermark.model_dump_json())
+            os.replace(temp_path, self.path)
+
+        return watermark
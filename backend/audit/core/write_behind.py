@@ -0,0 +1,171 @@
+"""Write-behind queues feeding audit records to slow storage backends."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+from .models import AuditRecord
+
+DEFAULT_MAX_PENDING = 10000  # Records a backend may fall behind before writers wait
+DEFAULT_WRITE_BATCH_SIZE = 500  # Records per backend write
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF = 0.1  # Seconds before the first retry, doubled on each further attempt
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue draining records into one backend in batches.
+
+    Producers enqueue records and return as soon as there is room; a writer
+    task drains the queue in batches of up to ``batch_size`` records, in the
+    order they were enqueued. When ``max_pending`` records are waiting,
+    producers wait for the writer (backpressure). Like ``ChainSequencer``, the
+    writer only runs while there is work and is rebound to whichever event loop
+    enqueues next, so records left behind by a closed loop are picked up by the
+    next one.
+
+    A batch that keeps failing after ``max_retries`` retries is dropped and
+    counted, so a broken backend cannot stall the others.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[list[AuditRecord]], Awaitable[None]],
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        """
+        Initialize write-behind queue.
+
+        Args:
+            name: Backend name used in logs and statistics
+            write: Coroutine that stores a batch of records in the backend
+            max_pending: Records that may wait before producers block
+            batch_size: Maximum records per backend write
+            max_retries: Retries of a failing batch before it is dropped
+        """
+        if max_pending < 1 or batch_size < 1:
+            msg = f"max_pending and batch_size must be positive, got {max_pending} and {batch_size}"
+            raise ValueError(msg)
+
+        self.name = name
+        self._write = write
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        # (enqueue time, record) waiting to be written, oldest first
+        self._pending: deque[tuple[float, AuditRecord]] = deque()
+        self._in_flight: list[tuple[float, AuditRecord]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._space = asyncio.Condition()
+        self._idle = asyncio.Event()
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_error: str | None = None
+
+    @property
+    def pending(self) -> int:
+        """Records enqueued but not yet written, including the batch being written."""
+        return len(self._pending) + len(self._in_flight)
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest unwritten record has been waiting (0.0 when caught up)."""
+        oldest = self._in_flight[0] if self._in_flight else self._pending[0] if self._pending else None
+        return time.monotonic() - oldest[0] if oldest is not None else 0.0
+
+    async def put(self, records: list[AuditRecord]) -> None:
+        """
+        Enqueue records, waiting while the queue is full.
+
+        Args:
+            records: Records to write to the backend
+        """
+        self._bind()
+        for record in records:
+            if self.pending >= self.max_pending:
+                async with self._space:
+                    await self._space.wait_for(lambda: self.pending < self.max_pending)
+            self._pending.append((time.monotonic(), record))
+            self._start_writer()
+
+    async def flush(self) -> None:
+        """Wait until every enqueued record has been written (or dropped)."""
+        self._bind()
+        if self.pending:
+            self._start_writer()
+            await self._idle.wait()
+
+    def statistics(self) -> dict[str, Any]:
+        """Return pending, lag and throughput counters."""
+        return {
+            "pending": self.pending,
+            "lag_seconds": round(self.lag, 6),
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_error": self.last_error,
+        }
+
+    def _bind(self) -> None:
+        """Bind the writer and its synchronization primitives to the running loop."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        # Conditions, events and tasks are bound to the loop that created them
+        self._loop = loop
+        self._space = asyncio.Condition()
+        self._idle = asyncio.Event()
+        self._writer = None
+        if self._in_flight:
+            # A loop closed mid-write; the batch is written again (backends ignore duplicates)
+            self._pending.extendleft(reversed(self._in_flight))
+            self._in_flight = []
+        if not self._pending:
+            self._idle.set()
+
+    def _start_writer(self) -> None:
+        """Start the writer task if it is not already draining the queue."""
+        self._idle.clear()
+        if self._writer is None or self._writer.done():
+            assert self._loop is not None
+            self._writer = self._loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until it is empty."""
+        try:
+            while self._pending:
+                self._in_flight = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                await self._write_batch([record for _, record in self._in_flight])
+                self._in_flight = []
+                async with self._space:
+                    self._space.notify_all()
+        finally:
+            if not self.pending:
+                self._idle.set()
+
+    async def _write_batch(self, batch: list[AuditRecord]) -> None:
+        """Write one batch, retrying with exponential backoff before dropping it."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write(batch)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                if attempt == self.max_retries:
+                    self.failed += len(batch)
+                    logger.error(f"Write-behind to {self.name} dropped {len(batch)} audit records after {attempt + 1} attempts: {exc}")
+                    return
+                logger.warning(f"Write-behind to {self.name} failed ({exc}); retrying batch of {len(batch)}")
+                await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+            else:
+                self.written += len(batch)
+                self.batches += 1
+                return
@@ -0,0 +1,400 @@
+"""Micro-benchmarks for audit core hot paths."""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+# Bootstrap sys.path so the compliance package resolves from the orchestrator root
+_ORCHESTRATOR_ROOT = next((p for p in Path(__file__).resolve().parents if (p / "base").exists()), None)
+if _ORCHESTRATOR_ROOT is not None:
+    sys.path.insert(0, str(_ORCHESTRATOR_ROOT))
+
+from compliance.backend.audit.core import (  # noqa: E402
+    AuditChain,
+    AuditContext,
+    AuditFilter,
+    AuditRecord,
+    AuditRecordBatch,
+    AuditSeverity,
+    AuditStore,
+    AuditTargetType,
+    AuditViolation,
+    ChainSnapshot,
+    PostgresAuditBackend,
+)
+from compliance.backend.audit.core.mining import ParallelMiner, mine_nonce  # noqa: E402
+from compliance.backend.audit.core.query import sort_key  # noqa: E402
+from compliance.backend.audit.core.schema import RECORD_COLUMNS, VIOLATION_COLUMNS, record_from_row, record_row, violation_rows  # noqa: E402
+from loguru import logger  # noqa: E402
+
+UNREACHABLE_DIFFICULTY = 64  # All 64 hex digits zero: never satisfied, so every attempt runs
+PARALLEL_DIFFICULTY = 5
+
+
+def _sample_record(context_keys: int = 200) -> AuditRecord:
+    """Build a record with a realistically large context."""
+    return AuditRecord(
+        actor="benchmark",
+        action="quality_check",
+        target="base/backend/dataops/",
+        target_type=AuditTargetType.MODULE,
+        source="benchmark",
+        context={f"file_{i}": {"lines": i, "violations": [f"rule_{i % 7}"] * 3} for i in range(context_keys)},
+        metadata={"duration_ms": 12.5, "tool": "ruff"},
+    )
+
+
+def _report(name: str, count: int, elapsed: float, unit: str) -> float:
+    """Write a single benchmark line and return the measured rate."""
+    rate = count / elapsed if elapsed else float("inf")
+    sys.stdout.write(f"{name:<40} {rate:>14,.0f} {unit}/s  ({count} in {elapsed:.3f}s)\n")
+    return rate
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Return wall-clock seconds taken by ``func``, ignoring its result."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_mining(attempts: int) -> None:
+    """Compare per-attempt full re-serialization against prefix-hash mining."""
+    record = _sample_record()
+
+    def legacy() -> None:
+        for nonce in range(attempts):
+            object.__setattr__(record, "nonce", nonce)
+            record.calculate_hash()
+
+    def prefix_hash() -> None:
+        prefix, suffix = record.canonical_hash_parts()
+        mine_nonce(prefix, suffix, 0, UNREACHABLE_DIFFICULTY, max_attempts=attempts)
+
+    before = _report("mining: calculate_hash per nonce", attempts, _timed(legacy), "attempts")
+    after = _report("mining: prefix-hash engine", attempts, _timed(prefix_hash), "attempts")
+    sys.stdout.write(f"speedup: {after / before:.1f}x\n")
+
+
+def bench_parallel_mining(count: int) -> None:
+    """Compare in-thread and process-pool mining at high difficulty."""
+    records = max(count // 5000, 2)
+    parts = [_sample_record(context_keys=i).canonical_hash_parts() for i in range(records)]
+
+    def serial() -> None:
+        for prefix, suffix in parts:
+            mine_nonce(prefix, suffix, 1, PARALLEL_DIFFICULTY)
+
+    async def parallel() -> None:
+        miner = ParallelMiner()
+        try:
+            for prefix, suffix in parts:
+                await miner.mine(prefix, suffix, 1, PARALLEL_DIFFICULTY)
+        finally:
+            miner.close()
+
+    _report(f"mining d={PARALLEL_DIFFICULTY}: in-thread", records, _timed(serial), "records")
+    _report(f"mining d={PARALLEL_DIFFICULTY}: process pool", records, _timed(lambda: asyncio.run(parallel())), "records")
+
+
+def _batch_records(count: int) -> list[AuditRecord]:
+    """Build small records as produced by batch collectors."""
+    return [
+        AuditRecord(actor="collector", action="file_scan", target=f"src/module_{i}.py", target_type=AuditTargetType.FILE, source="benchmark")
+        for i in range(count)
+    ]
+
+
+def bench_append(count: int) -> None:
+    """Compare per-record add_record/store_record against add_records group commit."""
+
+    async def per_record() -> None:
+        chain, store = AuditChain(), AuditStore()
+        for record in _batch_records(count):
+            await store.store_record(await chain.add_record(record))
+
+    async def batched() -> None:
+        chain, store = AuditChain(), AuditStore()
+        await chain.add_records(_batch_records(count), store=store)
+
+    _report("append: add_record + store_record", count, _timed(lambda: asyncio.run(per_record())), "records")
+    _report("append: add_records group commit", count, _timed(lambda: asyncio.run(batched())), "records")
+
+
+def bench_concurrent_contexts(count: int) -> None:
+    """Commit many concurrent AuditContexts against one chain through the sequencer."""
+
+    async def run() -> None:
+        chain, store = AuditChain(), AuditStore()
+
+        async def audit(i: int) -> None:
+            async with AuditContext(actor=f"agent_{i % 50}", action="tool_call", target=f"target_{i}", chain=chain, store=store):
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(audit(i) for i in range(count)))
+        if not chain.verify_chain():
+            msg = "Chain forked under concurrent commits"
+            raise RuntimeError(msg)
+
+    _report("append: concurrent AuditContext commits", count, _timed(lambda: asyncio.run(run())), "records")
+
+
+def bench_find(count: int) -> None:
+    """Compare a linear filter scan against the chain's secondary indexes."""
+    chain = AuditChain(difficulty=0)
+    records = [
+        AuditRecord(actor=f"agent_{i % 100}", action="file_scan", target=f"src/module_{i % 1000}.py", target_type=AuditTargetType.FILE, source="benchmark")
+        for i in range(count)
+    ]
+    asyncio.run(chain.add_records(records))
+    filters = [AuditFilter(actor=f"agent_{i}", limit=10, offset=5) for i in range(100)]
+
+    def linear() -> None:
+        for audit_filter in filters:
+            [record for record in reversed(chain.chain[1:]) if audit_filter.matches(record)][: audit_filter.limit]
+
+    def indexed() -> None:
+        for audit_filter in filters:
+            chain.find_records(audit_filter)
+
+    chain.find_records(AuditFilter())  # Build the index outside the timed run
+    _report("find: linear scan", len(filters), _timed(linear), "queries")
+    _report("find: secondary indexes", len(filters), _timed(indexed), "queries")
+
+
+def bench_top_k(count: int) -> None:
+    """Compare sorting every match against the store's newest-first executor for a "latest 100 errors" query."""
+    records = [
+        AuditRecord(
+            actor="collector",
+            action="file_scan",
+            target=f"src/module_{i}.py",
+            target_type=AuditTargetType.FILE,
+            source="benchmark",
+            severity=AuditSeverity.ERROR if i % 10 == 0 else AuditSeverity.INFO,
+        )
+        for i in range(count)
+    ]
+    store = AuditStore()
+    asyncio.run(store.store_records(records))
+    audit_filter = AuditFilter(severity=AuditSeverity.ERROR, limit=100)
+
+    def full_sort() -> None:
+        sorted((record for record in records if audit_filter.matches(record)), key=sort_key, reverse=True)[: audit_filter.limit]
+
+    _report("top-k: filter + full sort", count, _timed(full_sort), "records")
+    _report("top-k: newest-first scan", count, _timed(lambda: asyncio.run(store.query_records(audit_filter))), "records")
+    asyncio.run(store.close())
+
+
+def bench_batch(count: int) -> None:
+    """Compare memory and filter speed of AuditRecord objects against a columnar AuditRecordBatch."""
+    tracemalloc.start()
+    records = _batch_records(count)
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    batch = AuditRecordBatch(records)
+    batch_bytes = tracemalloc.get_traced_memory()[0] - record_bytes
+    tracemalloc.stop()
+    sys.stdout.write(f"{'batch: bytes per AuditRecord':<40} {record_bytes / count:>14,.0f}\n")
+    sys.stdout.write(f"{'batch: bytes per batch row':<40} {batch_bytes / count:>14,.0f}\n")
+
+    audit_filter = AuditFilter(actor="collector", severity=AuditSeverity.INFO)
+    _report("batch: AuditFilter.matches", count, _timed(lambda: [record for record in records if audit_filter.matches(record)]), "records")
+    _report("batch: column filter", count, _timed(lambda: batch.filter_rows(audit_filter)), "records")
+
+
+def bench_rehydrate(count: int) -> None:
+    """Compare validated against trusted rebuilding of stored rows, and hashed against unhashed creation before add_records."""
+    records = _batch_records(count)
+    for record in records[::10]:
+        record.violations.append(AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3))
+    rows = [(record_row(record), violation_rows([record])) for record in records]
+
+    def validated() -> None:
+        for row, violations in rows:
+            data = dict(zip(RECORD_COLUMNS, row, strict=True))
+            data.update(context=json.loads(data["context"]), metadata=json.loads(data["metadata"]))
+            data["violations"] = [AuditViolation.model_validate(dict(zip(VIOLATION_COLUMNS, values, strict=True))) for values in violations]
+            AuditRecord.model_validate(data)
+
+    _report("rehydrate: validated rows", count, _timed(validated), "records")
+
+    def trusted() -> None:
+        for row, violations in rows:
+            record_from_row(row, (), violations)
+
+    _report("rehydrate: trusted rows", count, _timed(trusted), "records")
+
+    def fields(i: int) -> dict[str, Any]:
+        return {"actor": "collector", "action": "file_scan", "target": f"src/module_{i}.py", "target_type": AuditTargetType.FILE, "source": "benchmark"}
+
+    def add(create: Callable[..., AuditRecord]) -> None:
+        chain = AuditChain(difficulty=0)
+        asyncio.run(chain.add_records([create(**fields(i)) for i in range(count)]))
+
+    _report("rehydrate: hashed create + add_records", count, _timed(lambda: add(AuditRecord)), "records")
+    _report("rehydrate: unhashed create + add_records", count, _timed(lambda: add(AuditRecord.unhashed)), "records")
+
+
+def bench_export(count: int) -> None:
+    """Compare peak memory and time of export_chain against streaming export_chain_to for a chain held in memory."""
+    chain = AuditChain(difficulty=0)
+    asyncio.run(chain.add_records(_batch_records(count)))
+
+    def peak(func: Callable[[], object]) -> tuple[float, int]:
+        tracemalloc.start()
+        elapsed = _timed(lambda: None if func() else None)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak_bytes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, func in (
+            ("export: export_chain json", lambda: chain.export_chain("json")),
+            ("export: export_chain_to json", lambda: asyncio.run(chain.export_chain_to(Path(tmp) / "chain.json", "json"))),
+            ("export: export_chain_to jsonl gzip", lambda: asyncio.run(chain.export_chain_to(Path(tmp) / "chain.jsonl.gz", compress=True))),
+        ):
+            elapsed, peak_bytes = peak(func)
+            _report(name, count, elapsed, "records")
+            sys.stdout.write(f"{'  peak memory (MB)':<40} {peak_bytes / 2**20:>14,.1f}\n")
+
+
+def bench_snapshot(count: int) -> None:
+    """Compare a JSON export against a binary snapshot: size, write time, and reading the last record."""
+    chain = AuditChain(difficulty=0)
+    asyncio.run(chain.add_records(_batch_records(count)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, snapshot_path = Path(tmp) / "chain.json", Path(tmp) / "chain.snap"
+        _report("snapshot: write JSON export", count, _timed(lambda: json_path.write_text(chain.export_chain("json"))), "records")
+        _report("snapshot: write binary snapshot", count, _timed(lambda: chain.export_snapshot(snapshot_path)), "records")
+        sys.stdout.write(f"{'snapshot: JSON / binary size (MB)':<40} {json_path.stat().st_size / 2**20:>14,.1f} / {snapshot_path.stat().st_size / 2**20:.1f}\n")
+
+        def last_from_json() -> None:
+            AuditRecord.model_validate(json.loads(json_path.read_text())[-1])
+
+        def last_from_snapshot() -> None:
+            with ChainSnapshot(snapshot_path) as snapshot:
+                snapshot[len(snapshot) - 1]
+
+        _report("snapshot: open JSON, read last record", 1, _timed(last_from_json), "lookups")
+        _report("snapshot: open binary, read last record", 1, _timed(last_from_snapshot), "lookups")
+        with ChainSnapshot(snapshot_path) as snapshot:
+            _report("snapshot: sequential read", count, _timed(lambda: None if list(snapshot) else None), "records")
+
+
+def bench_tables(count: int) -> None:
+    """Time CSV table export of every column against a narrow projection, with peak memory."""
+    chain = AuditChain(difficulty=0)
+    asyncio.run(chain.add_records(_batch_records(count)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, columns in (
+            ("tables: every table and column", None),
+            ("tables: records (record_id, actor, action)", {"records": ["record_id", "actor", "action"]}),
+        ):
+            tracemalloc.start()
+            elapsed = _timed(partial(chain.export_tables, tmp, columns))
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _report(name, count, elapsed, "records")
+            sys.stdout.write(f"{'  peak memory (MB)':<40} {peak_bytes / 2**20:>14,.1f}\n")
+
+
+def bench_postgres(count: int) -> None:
+    """Compare per-row INSERT round trips against COPY bulk ingest (needs AUDIT_BENCH_POSTGRES_URL; truncates the audit tables)."""
+    url = os.environ.get("AUDIT_BENCH_POSTGRES_URL")
+    if not url:
+        sys.stdout.write("postgres: skipped (set AUDIT_BENCH_POSTGRES_URL to a throwaway database)\n")
+        return
+
+    insert_sql = f"INSERT INTO audit_records ({', '.join(RECORD_COLUMNS)}) VALUES ({', '.join(f'${i}' for i in range(1, len(RECORD_COLUMNS) + 1))})"
+    timestamp_index = RECORD_COLUMNS.index("timestamp")
+
+    async def run(per_row: bool) -> float:
+        backend = PostgresAuditBackend(url)
+        pool = await backend._get_pool()
+        await pool.execute("TRUNCATE audit_signatures, audit_violations, audit_findings, audit_records")
+        records = _batch_records(count)
+        start = time.perf_counter()
+        if per_row:
+            async with pool.acquire() as conn:
+                for record in records:
+                    row = list(record_row(record))
+                    row[timestamp_index] = record.timestamp.astimezone(UTC).replace(tzinfo=None)
+                    await conn.execute(insert_sql, *row)
+        else:
+            await backend.store_records(records)
+        elapsed = time.perf_counter() - start
+        await backend.close()
+        return elapsed
+
+    _report("postgres: per-row INSERT", count, asyncio.run(run(per_row=True)), "records")
+    _report("postgres: binary COPY ingest", count, asyncio.run(run(per_row=False)), "records")
+
+
+def bench_write_behind(count: int) -> None:
+    """Compare per-record store_record latency with synchronous writes against write-behind to SQLite."""
+
+    async def run(write_behind: bool) -> tuple[float, float]:
+        with tempfile.TemporaryDirectory() as directory:
+            store = AuditStore(sqlite_path=Path(directory) / "audit.db", write_behind=write_behind)
+            records = _batch_records(count)
+            start = time.perf_counter()
+            for record in records:
+                await store.store_record(record)
+            committed = time.perf_counter() - start
+            await store.close()
+            return committed, time.perf_counter() - start
+
+    committed, _ = asyncio.run(run(write_behind=False))
+    _report("store: synchronous backend writes", count, committed, "records")
+    committed, durable = asyncio.run(run(write_behind=True))
+    _report("store: write-behind (commit)", count, committed, "records")
+    _report("store: write-behind (durable)", count, durable, "records")
+
+
+BENCHMARKS: dict[str, Callable[[int], None]] = {
+    "mining": bench_mining,
+    "parallel_mining": bench_parallel_mining,
+    "append": bench_append,
+    "concurrent": bench_concurrent_contexts,
+    "find": bench_find,
+    "top_k": bench_top_k,
+    "batch": bench_batch,
+    "rehydrate": bench_rehydrate,
+    "export": bench_export,
+    "snapshot": bench_snapshot,
+    "tables": bench_tables,
+    "postgres": bench_postgres,
+    "write_behind": bench_write_behind,
+}
+
+
+def main() -> None:
+    """Run the selected benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("-n", "--count", type=int, default=20000, help="Work items per benchmark")
+    args = parser.parse_args()
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    logger.remove()
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 """Pytest configuration for compliance tests."""
 
 import sys
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 
 def _setup_paths() -> None:
@@ -34,3 +37,61 @@ def _setup_paths() -> None:
 
 
 _setup_paths()
+
+
+# Imported after the path setup above so the compliance package resolves
+import pytest  # noqa: E402
+from compliance.backend.audit.core import AuditChain, AuditRecord, AuditSeverity, AuditTargetType  # noqa: E402
+
+BASE_TIME = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+def _build_record(i: int, base_time: datetime = BASE_TIME, step: timedelta = timedelta(seconds=1), **fields: Any) -> AuditRecord:
+    """Build the i-th record of a test series; each field override is a value or a function of i."""
+    values: dict[str, Any] = {
+        "actor": f"user_{i % 3}",
+        "action": f"action_{i % 2}",
+        "target": f"target_{i}",
+        "target_type": AuditTargetType.FILE if i % 2 else AuditTargetType.MODULE,
+        "source": "test",
+        "severity": AuditSeverity.ERROR if i % 4 == 0 else AuditSeverity.INFO,
+        "timestamp": base_time + i * step,
+        "context": {"index": i},
+    }
+    values.update((name, value(i) if callable(value) else value) for name, value in fields.items())
+    return AuditRecord(**values)
+
+
+@pytest.fixture
+def make_record() -> Callable[..., AuditRecord]:
+    """
+    Return a factory for the i-th record of a test series.
+
+    Actors cycle through three users and actions through two, target types
+    alternate, every fourth record is an error, and timestamps are ``step``
+    apart from ``base_time``. Keyword fields override a default with a value
+    or with a function of i.
+    """
+    return _build_record
+
+
+@pytest.fixture
+def make_records(make_record: Callable[..., AuditRecord]) -> Callable[..., list[AuditRecord]]:
+    """Return a factory for the first ``count`` records of a test series (see ``make_record``)."""
+
+    def factory(count: int, **fields: Any) -> list[AuditRecord]:
+        return [make_record(i, **fields) for i in range(count)]
+
+    return factory
+
+
+@pytest.fixture
+def make_chain(make_records: Callable[..., list[AuditRecord]]) -> Callable[..., Awaitable[AuditChain]]:
+    """Return a factory for an in-memory chain holding the first ``count`` records of a test series."""
+
+    async def factory(count: int, difficulty: int = 0, **fields: Any) -> AuditChain:
+        chain = AuditChain(difficulty=difficulty)
+        await chain.add_records(make_records(count, **fields))
+        return chain
+
+    return factory
@@ -1,7 +1,9 @@
 """Tests for core audit trail components."""
 
 import asyncio
+import hashlib
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
 import pytest
 from compliance.backend.audit.core import (
@@ -15,6 +17,9 @@ from compliance.backend.audit.core import (
     AuditTargetType,
     AuditViolation,
 )
+from compliance.backend.audit.core.mining import ParallelMiner, mine_nonce
+from compliance.backend.audit.core.schema import finding_rows, record_from_row, record_row, signature_rows, violation_rows
+from loguru import logger
 
 
 class TestAuditRecord:
@@ -81,6 +86,39 @@ class TestAuditRecord:
         assert record.record_hash.startswith("0" * difficulty)
         assert record.nonce > 0  # Should have incremented nonce
 
+    def test_mine_block_matches_verify(self) -> None:
+        """Test prefix-hash mining produces the hash verify() expects."""
+        record = AuditRecord(
+            actor="test_user",
+            action="test_action",
+            target="test_target",
+            target_type=AuditTargetType.FILE,
+            source="test_source",
+            context={"nonce": 7, "nested": {"values": [1, 2, 3]}, "when": datetime.now(UTC), "text": "ünïcode"},
+            metadata={"zeta": None, "alpha": 1.5},
+        )
+
+        record.mine_block(3)
+
+        assert record.record_hash.startswith("000")
+        assert record.record_hash == record.calculate_hash()
+        assert record.verify() is True
+
+    def test_canonical_hash_parts(self) -> None:
+        """Test prefix and suffix reassemble the canonical hash input."""
+        record = AuditRecord(
+            actor="test_user",
+            action="test_action",
+            target="test_target",
+            target_type=AuditTargetType.FILE,
+            source="test_source",
+            nonce=42,
+        )
+
+        prefix, suffix = record.canonical_hash_parts()
+
+        assert hashlib.sha256(prefix + b"42" + suffix).hexdigest() == record.record_hash
+
     def test_sign_and_verify(self) -> None:
         """Test signing and verifying record."""
         record = AuditRecord(
@@ -98,6 +136,59 @@ class TestAuditRecord:
         assert record.signatures[0].signer == "test_signer"
         assert record.verify_signatures() is True
 
+    @pytest.mark.asyncio
+    async def test_unhashed_record_is_hashed_by_chain(self) -> None:
+        """Test an unhashed record skips hashing until the chain links it."""
+        record = AuditRecord.unhashed(actor="test_user", action="test_action", target="test_target", target_type=AuditTargetType.FILE, source="test_source")
+        assert record.record_hash == ""
+        assert record.verify() is False
+
+        chain = AuditChain(difficulty=1)
+        await chain.add_record(record)
+        assert record.record_hash.startswith("0")
+        assert record.verify() is True
+        assert chain.verify_chain() is True
+
+    def test_trusted_record_matches_validated(self) -> None:
+        """Test a trusted rebuild from stored rows equals the original, and tampering still fails verify."""
+        record = AuditRecord(actor="test_user", action="test_action", target="test_target", target_type=AuditTargetType.FILE, source="test_source")
+        record.findings.append(AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description="long function", metadata={"lines": 90}))
+        record.violations.append(AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3))
+        record.sign("test_private_key", "test_signer")
+
+        rebuilt = record_from_row(record_row(record), finding_rows([record]), violation_rows([record]), signature_rows([record]))
+        assert rebuilt == record
+        assert rebuilt.verify() is True
+        assert rebuilt.findings[0].severity is AuditSeverity.WARNING
+
+        tampered = AuditRecord.trusted({**dict(rebuilt), "target": "other_target"})
+        assert tampered.verify() is False
+        with pytest.raises(ValueError, match="fields"):
+            AuditRecord.trusted({"actor": "test_user"})
+
+
+class TestParallelMiner:
+    """Tests for ParallelMiner."""
+
+    @pytest.mark.asyncio
+    async def test_matches_serial_search(self) -> None:
+        """Test the parallel search returns the same nonce as a serial search."""
+        record = AuditRecord(
+            actor="test_user",
+            action="test_action",
+            target="test_target",
+            target_type=AuditTargetType.FILE,
+            source="test_source",
+        )
+        prefix, suffix = record.canonical_hash_parts()
+        miner = ParallelMiner(workers=2, chunk_size=256)
+        try:
+            result = await miner.mine(prefix, suffix, 1, 3)
+        finally:
+            miner.close()
+
+        assert result == mine_nonce(prefix, suffix, 1, 3)
+
 
 class TestAuditChain:
     """Tests for AuditChain."""
@@ -146,6 +237,125 @@ class TestAuditChain:
 
         assert chain.verify_chain() is True
 
+    @pytest.mark.asyncio
+    async def test_add_records_batch(self, chain: AuditChain) -> None:
+        """Test adding a batch of records links them in order and stores them in bulk."""
+        store = AuditStore()
+        records = [
+            AuditRecord(
+                actor=f"user_{i}",
+                action=f"action_{i}",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+            )
+            for i in range(10)
+        ]
+
+        added = await chain.add_records(records, store=store)
+
+        assert len(chain.chain) == 11
+        assert added[0].previous_hash == chain.chain[0].record_hash
+        assert all(later.previous_hash == earlier.record_hash for earlier, later in zip(added, added[1:], strict=False))
+        assert chain.verify_chain() is True
+        assert len(await store.query_records(AuditFilter(limit=100))) == 10
+
+    @pytest.mark.asyncio
+    async def test_parallel_mining(self) -> None:
+        """Test records mined on the process pool link and verify."""
+        chain = AuditChain(difficulty=3, mining_workers=2, parallel_mining_difficulty=3)
+        try:
+            for i in range(2):
+                record = AuditRecord(
+                    actor=f"user_{i}",
+                    action=f"action_{i}",
+                    target=f"target_{i}",
+                    target_type=AuditTargetType.FILE,
+                    source="test",
+                )
+                added = await chain.add_record(record)
+                assert added.record_hash.startswith("000")
+
+            assert chain.verify_chain() is True
+        finally:
+            chain.close()
+
+    @pytest.mark.asyncio
+    async def test_parallel_verify_chain(self, chain: AuditChain) -> None:
+        """Test parallel verification agrees with serial and reports the same failing record."""
+        for i in range(12):
+            record = AuditRecord(
+                actor=f"user_{i}",
+                action=f"action_{i}",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+            )
+            await chain.add_record(record)
+
+        assert chain.verify_chain(parallel=True, workers=2, chunk_size=5) is True
+
+        # Tamper with a record in the middle of the second chunk
+        object.__setattr__(chain.chain[8], "actor", "intruder")
+        errors: list[str] = []
+        sink_id = logger.add(lambda message: errors.append(message.record["message"]), level="ERROR")
+        try:
+            assert chain.verify_chain() is False
+            assert chain.verify_chain(parallel=True, workers=2, chunk_size=5) is False
+        finally:
+            logger.remove(sink_id)
+
+        assert len(errors) == 2
+        assert errors[0] == errors[1]
+        assert errors[0].startswith("Record 8 ")
+
+    @pytest.mark.asyncio
+    async def test_incremental_verify_chain(self, chain: AuditChain) -> None:
+        """Test incremental verification checks only records after the watermark."""
+        for i in range(4):
+            record = AuditRecord(
+                actor=f"user_{i}",
+                action=f"action_{i}",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+            )
+            await chain.add_record(record)
+
+        assert chain.get_watermark() is None
+        assert chain.verify_chain(incremental=True) is True
+        watermark = chain.get_watermark()
+        assert watermark is not None
+        assert watermark.index == 4
+        assert watermark.record_hash == chain.chain[4].record_hash
+
+        # Records behind the watermark are trusted; new records are still checked
+        object.__setattr__(chain.chain[2], "actor", "intruder")
+        await chain.add_record(AuditRecord(actor="user_5", action="action_5", target="target_5", target_type=AuditTargetType.FILE, source="test"))
+        assert chain.verify_chain(incremental=True) is True
+        watermark = chain.get_watermark()
+        assert watermark is not None
+        assert watermark.index == 5
+        assert chain.verify_chain() is False
+
+    @pytest.mark.asyncio
+    async def test_incremental_verify_falls_back_when_anchor_changes(self, chain: AuditChain) -> None:
+        """Test a watermark whose anchor record was altered triggers full verification."""
+        for i in range(3):
+            record = AuditRecord(
+                actor=f"user_{i}",
+                action=f"action_{i}",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+            )
+            await chain.add_record(record)
+        assert chain.verify_chain() is True
+
+        object.__setattr__(chain.chain[1], "actor", "intruder")
+        object.__setattr__(chain.chain[3], "actor", "intruder")
+        assert chain.verify_chain(incremental=True) is False
+
     @pytest.mark.asyncio
     async def test_get_chain_slice(self, chain: AuditChain) -> None:
         """Test getting a time slice of the chain."""
@@ -190,6 +400,112 @@ class TestAuditChain:
         assert len(records) == 3
         assert all(r.actor == "user_1" for r in records)
 
+    @pytest.mark.asyncio
+    async def test_find_records_uses_maintained_index(self, chain: AuditChain) -> None:
+        """Test indexed lookups agree with a linear scan and see records added after the index is built."""
+        base_time = datetime.now(UTC)
+        severities = [AuditSeverity.INFO, AuditSeverity.WARNING, AuditSeverity.ERROR]
+        for i in range(12):
+            record = AuditRecord(
+                actor=f"user_{i % 3}",
+                action=f"action_{i % 2}",
+                target=f"target_{i % 4}",
+                target_type=AuditTargetType.FILE if i % 2 else AuditTargetType.MODULE,
+                source="test",
+                severity=severities[i % 3],
+                timestamp=base_time + timedelta(seconds=i),
+            )
+            await chain.add_record(record)
+
+        filters = [
+            AuditFilter(actor="user_1"),
+            AuditFilter(actor="user_1", action="action_0"),
+            AuditFilter(target="target_2", severity=AuditSeverity.INFO),
+            AuditFilter(target_type=AuditTargetType.FILE, since=base_time + timedelta(seconds=5)),
+            AuditFilter(since=base_time + timedelta(seconds=2), until=base_time + timedelta(seconds=6), limit=3),
+            AuditFilter(actor="nobody"),
+            AuditFilter(limit=4, offset=1),
+            AuditFilter(limit=4, offset=4),
+            AuditFilter(actor="user_1", limit=2, offset=2),
+        ]
+        for audit_filter in filters:
+            start = audit_filter.offset
+            expected = [record for record in reversed(chain.chain[1:]) if audit_filter.matches(record)][start : start + audit_filter.limit]
+            assert [r.record_id for r in chain.find_records(audit_filter)] == [r.record_id for r in expected]
+
+        # Records appended after the index was built are indexed too
+        late = await chain.add_record(
+            AuditRecord(
+                actor="user_1", action="late", target="target_9", target_type=AuditTargetType.FILE, source="test", timestamp=base_time - timedelta(seconds=1)
+            )
+        )
+        assert [r.record_id for r in chain.find_records(AuditFilter(action="late"))] == [late.record_id]
+        window = chain.get_chain_slice(base_time - timedelta(seconds=1), base_time + timedelta(seconds=1))
+        assert [r.record_id for r in window] == [chain.chain[1].record_id, chain.chain[2].record_id, late.record_id]
+
+    @pytest.mark.asyncio
+    async def test_find_records_cursor_pagination(self, chain: AuditChain) -> None:
+        """Test paging with cursors visits every match exactly once, newest first."""
+        for i in range(11):
+            record = AuditRecord(
+                actor="user_1" if i % 2 else "user_2",
+                action=f"action_{i}",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+            )
+            await chain.add_record(record)
+
+        for audit_filter in (AuditFilter(limit=4), AuditFilter(actor="user_1", limit=2)):
+            pages = []
+            page_filter: AuditFilter | None = audit_filter
+            while page_filter is not None:
+                page = chain.find_records(page_filter)
+                pages.append(page)
+                page_filter = page_filter.next_page(page)
+
+            paged = [record.record_id for page in pages for record in page]
+            expected = [record.record_id for record in reversed(chain.chain[1:]) if audit_filter.matches(record)]
+            assert paged == expected
+            assert all(len(page) <= audit_filter.limit for page in pages)
+
+        with pytest.raises(ValueError, match="Invalid audit cursor"):
+            chain.find_records(AuditFilter(cursor="not a cursor"))
+
+    @pytest.mark.asyncio
+    async def test_statistics_maintained_on_append(self, chain: AuditChain) -> None:
+        """Test statistics track appends and a recount detects and repairs drift."""
+        base_time = datetime.now(UTC)
+        severities = [AuditSeverity.ERROR, AuditSeverity.INFO, AuditSeverity.ERROR, AuditSeverity.DEBUG]
+        records = [
+            AuditRecord(
+                actor=f"user_{i % 2}",
+                action=f"action_{i % 3}",
+                target="stats.py",
+                target_type=AuditTargetType.FILE,
+                source="test",
+                severity=severity,
+                timestamp=base_time + timedelta(seconds=i),
+            )
+            for i, severity in enumerate(severities)
+        ]
+        await chain.add_records(records[:2])
+        assert chain.get_statistics()["total_records"] == 2
+
+        await chain.add_records(records[2:])
+        stats = chain.get_statistics()
+        assert stats["total_records"] == 4
+        assert stats["earliest_timestamp"] == records[0].timestamp.isoformat()
+        assert stats["latest_timestamp"] == records[-1].timestamp.isoformat()
+        assert (stats["unique_actors"], stats["unique_actions"]) == (2, 3)
+        assert stats["severity_counts"] == {"DEBUG": 1, "INFO": 1, "WARNING": 0, "ERROR": 2, "CRITICAL": 0}
+
+        assert chain.verify_statistics() is True
+        assert chain._stats is not None
+        chain._stats.total += 1
+        assert chain.verify_statistics() is False
+        assert chain.get_statistics() == stats
+
     @pytest.mark.asyncio
     async def test_export_chain(self, chain: AuditChain) -> None:
         """Test exporting chain."""
@@ -260,6 +576,35 @@ class TestAuditStore:
 
         assert len(records) == 5
 
+    @pytest.mark.asyncio
+    async def test_query_records_cursor_pagination(self, store: AuditStore) -> None:
+        """Test paging with cursors returns records newest first without gaps or repeats."""
+        base_time = datetime.now(UTC)
+        records = [
+            AuditRecord(
+                actor=f"user_{i % 2}",
+                action="test_action",
+                target=f"target_{i}",
+                target_type=AuditTargetType.FILE,
+                source="test",
+                timestamp=base_time + timedelta(seconds=i // 2),  # Pairs share a timestamp
+            )
+            for i in range(9)
+        ]
+        await store.store_records(records[::-1])
+
+        pages = []
+        page_filter: AuditFilter | None = AuditFilter(actor="user_0", limit=2)
+        while page_filter is not None:
+            page = await store.query_records(page_filter)
+            pages.append(page)
+            page_filter = page_filter.next_page(page)
+
+        paged = [record.record_id for page in pages for record in page]
+        newest_first = sorted(records, key=lambda r: (r.timestamp, r.record_id), reverse=True)
+        assert paged == [record.record_id for record in newest_first if record.actor == "user_0"]
+        assert [len(page) for page in pages] == [2, 2, 1, 0]
+
     @pytest.mark.asyncio
     async def test_get_provenance_chain(self, store: AuditStore) -> None:
         """Test getting provenance chain for a target."""
@@ -284,6 +629,49 @@ class TestAuditStore:
         # Should be in chronological order
         assert provenance[0].timestamp <= provenance[-1].timestamp
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_sqlite", [False, True])
+    async def test_get_provenance_chain_uncapped_and_by_prefix(self, tmp_path: Path, use_sqlite: bool) -> None:
+        """Test provenance has no 10k cap and prefix lookups merge targets chronologically."""
+        store = AuditStore(enable_cache=False, sqlite_path=tmp_path / "audit.db" if use_sqlite else None)
+        base_time = datetime.now(UTC)
+        hot = [
+            AuditRecord(
+                actor="bot", action="edit", target="src/hot.py", target_type=AuditTargetType.FILE, source="test", timestamp=base_time + timedelta(seconds=i)
+            )
+            for i in range(10005)
+        ]
+        others = [
+            AuditRecord(actor="bot", action="edit", target=target, target_type=AuditTargetType.FILE, source="test", timestamp=base_time + timedelta(seconds=i))
+            for i, target in enumerate(["src/pkg/a.py", "src/pkg/b.py", "src/pkg/a.py", "src/pkg_old.py", "src/pk%.py", "SRC/pkg/c.py"])
+        ]
+        await store.store_records(hot[::-1] + others)
+
+        provenance = await store.get_provenance_chain("src/hot.py")
+        assert [r.record_id for r in provenance] == [r.record_id for r in hot]
+
+        by_prefix = await store.get_provenance_chain("src/pkg/", prefix=True)
+        assert [r.record_id for r in by_prefix] == [r.record_id for r in others[:3]]
+        assert await store.get_provenance_chain("src/pk%", prefix=True) == [others[4]]
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_statistics_maintained_on_store(self, store: AuditStore) -> None:
+        """Test store statistics count re-stored records once and can be rebuilt from scratch."""
+        records = [AuditRecord(actor="user", action="test_action", target=f"target_{i}", target_type=AuditTargetType.FILE, source="test") for i in range(3)]
+        records[0].findings.append(AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description="finding"))
+        await store.store_records(records)
+        records[1].sign("private_key", "signer")
+        await store.store_record(records[1])
+
+        stats = await store.get_statistics()
+        assert (stats["total_records"], stats["total_findings"], stats["signed_records"]) == (3, 1, 1)
+        assert await store.verify_statistics() is True
+
+        store._stats.findings = 5
+        assert await store.verify_statistics() is False
+        assert (await store.get_statistics())["total_findings"] == 1
+
     @pytest.mark.asyncio
     async def test_verify_integrity(self, store: AuditStore) -> None:
         """Test verifying store integrity."""
@@ -300,6 +688,10 @@ class TestAuditStore:
 
         # Verify integrity
         assert await store.verify_integrity() is True
+        assert await store.verify_integrity(parallel=True, workers=2, chunk_size=2) is True
+
+        object.__setattr__(record, "target", "tampered")
+        assert await store.verify_integrity(parallel=True, workers=2, chunk_size=2) is False
 
 
 class TestAuditContext:
@@ -389,6 +781,31 @@ class TestAuditContext:
         assert "error_type" in record.metadata
         assert record.metadata["error_type"] == "ValueError"
 
+    @pytest.mark.asyncio
+    async def test_concurrent_contexts_do_not_fork_chain(self) -> None:
+        """Test concurrent commits on a shared chain are sequenced without forking."""
+        chain = AuditChain(difficulty=1)
+        store = AuditStore()
+
+        async def audit(i: int) -> AuditRecord:
+            async with AuditContext(
+                actor=f"agent_{i}",
+                action="concurrent_action",
+                target=f"target_{i}",
+                chain=chain,
+                store=store,
+            ) as ctx:
+                await asyncio.sleep(0)
+            record = ctx.get_record()
+            assert record is not None
+            return record
+
+        records = await asyncio.gather(*(audit(i) for i in range(200)))
+
+        assert len(chain.chain) == 201
+        assert len({record.previous_hash for record in records}) == 200
+        assert chain.verify_chain() is True
+
     @pytest.mark.asyncio
     async def test_manual_commit(self) -> None:
         """Test manual commit without auto_commit."""
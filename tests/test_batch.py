@@ -0,0 +1,127 @@
+"""Tests for the columnar audit record batch."""
+
+import sys
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditFilter,
+    AuditFinding,
+    AuditRecord,
+    AuditRecordBatch,
+    AuditSeverity,
+    AuditStatus,
+    AuditTargetType,
+    AuditViolation,
+)
+from compliance.backend.audit.core.serialization import from_epoch_ns, to_epoch_ns
+
+
+class TestAuditRecordBatch:
+    """Tests for AuditRecordBatch."""
+
+    def test_round_trip_is_lossless(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test records come back equal, with the same hash, including nested and unusual values."""
+        records = make_records(4, step=timedelta(seconds=1, microseconds=1))
+        records[0] = AuditRecord(
+            actor="tester",
+            action="scan",
+            target="a.py",
+            target_type=AuditTargetType.FILE,
+            source="test",
+            context={"files": ["a.py", "b.py"]},
+            metadata={"run": {"id": 7}},
+        )
+        records[0].findings.append(AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description="long function"))
+        records[1].violations.append(AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3))
+        records[1].sign("private_key", "signer")
+        records.append(
+            AuditRecord(
+                actor="tester",
+                action="check",
+                target="x",
+                target_type=AuditTargetType.GIT,
+                source="test",
+                reason="nightly",
+                status=AuditStatus.VERIFIED,
+                timestamp=datetime(2026, 3, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+            )
+        )
+        records.append(AuditRecord(actor="tester", action="check", target="y", target_type=AuditTargetType.LOG, source="test", timestamp=datetime(2026, 3, 1)))
+
+        batch = AuditRecordBatch(records)
+
+        assert len(batch) == len(records)
+        assert batch.to_records() == records
+        assert all(record.verify() for record in batch)
+        assert batch.record(-1).timestamp.tzinfo is None
+        assert batch.record(-2).timestamp.utcoffset() == timedelta(hours=2)
+        assert batch.column("severity") == [record.severity for record in records]
+        with pytest.raises(IndexError):
+            batch.record(len(records))
+        with pytest.raises(ValueError, match="scalar"):
+            batch.column("context")
+
+    def test_non_json_context_keeps_hash(self) -> None:
+        """Test non-JSON context values come back in their JSON form with the record hash unchanged."""
+        moment = datetime(2026, 3, 1, 12, tzinfo=UTC)
+        record = AuditRecord(
+            actor="tester",
+            action="scan",
+            target="a.py",
+            target_type=AuditTargetType.FILE,
+            source="test",
+            context={"at": moment, "span": (1, 2)},
+        )
+
+        restored = AuditRecordBatch([record]).record(0)
+
+        assert restored.context == {"at": str(moment), "span": [1, 2]}
+        assert restored.record_hash == record.record_hash
+        assert restored.verify()
+
+    def test_epoch_ns_round_trip(self) -> None:
+        """Test timestamps convert to integer nanoseconds exactly."""
+        timestamp = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+        assert to_epoch_ns(timestamp) == 1772368215123456000
+        assert from_epoch_ns(to_epoch_ns(timestamp), 0) == timestamp
+
+    def test_filter_matches_audit_filter(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test column filters select the same records as AuditFilter.matches."""
+        records = make_records(200, target=lambda i: f"target_{i % 5}")
+        batch = AuditRecordBatch(records)
+        base_time = records[0].timestamp
+
+        for audit_filter in (
+            AuditFilter(),
+            AuditFilter(actor="user_1"),
+            AuditFilter(severity=AuditSeverity.ERROR, target_type=AuditTargetType.MODULE),
+            AuditFilter(action="action_1", target="target_3", since=base_time + timedelta(seconds=50), until=base_time + timedelta(seconds=150)),
+            AuditFilter(actor="nobody"),
+        ):
+            expected = [record for record in records if audit_filter.matches(record)]
+            assert [records[row] for row in batch.filter_rows(audit_filter)] == expected
+            assert batch.filter(audit_filter).to_records() == expected
+
+    def test_memory_is_a_fraction_of_records(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test the columns hold well under a tenth of the record objects' memory."""
+        records = make_records(1000, target=lambda i: f"target_{i % 5}")
+        batch = AuditRecordBatch(records)
+
+        def deep_size(value: object) -> int:
+            size = sys.getsizeof(value)
+            if isinstance(value, dict):
+                size += sum(deep_size(k) + deep_size(v) for k, v in value.items())
+            elif isinstance(value, list):
+                size += sum(deep_size(item) for item in value)
+            return size
+
+        record_bytes = sum(deep_size(record.__dict__) + sys.getsizeof(record) for record in records)
+        assert batch.nbytes() * 10 < record_bytes
+
+    def test_nbytes_counts_dictionary_indexes(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test a high-cardinality dictionary column's index dict is part of the reported memory."""
+        batch = AuditRecordBatch(make_records(1000))
+        targets = batch._targets
+        assert targets.nbytes() >= sys.getsizeof(targets.index) + sum(sys.getsizeof(value) for value in targets.values)
@@ -0,0 +1,175 @@
+"""Tests for the tiered audit record cache."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from compliance.backend.audit.core import AuditFilter, AuditRecord, AuditStore, TieredCache
+from compliance.backend.audit.core.cache import LRUCacheTier, RedisCacheTier
+
+
+class _RespStandIn:
+    """Minimal in-memory server speaking enough of the Redis protocol for GET/SET/PING."""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, bytes] = {}
+        self.commands: list[bytes] = []
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command = args[0].upper()
+                self.commands.append(command)
+                if command == b"GET":
+                    value = self.data.get(args[1])
+                    writer.write(b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value))
+                elif command == b"SET":
+                    self.data[args[1]] = args[2]
+                    writer.write(b"+OK\r\n")
+                else:
+                    writer.write(b"+PONG\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def resp_server() -> AsyncIterator[tuple[_RespStandIn, str]]:
+    """Run a local Redis-protocol stand-in."""
+    stand_in = _RespStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield stand_in, f"redis://127.0.0.1:{port}/0"
+    server.close()
+    await server.wait_closed()
+
+
+class TestLRUCacheTier:
+    """Tests for LRUCacheTier."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the oldest untouched entry is evicted once full."""
+        tier = LRUCacheTier(max_entries=2)
+        tier.set("a", 1)
+        tier.set("b", 2)
+        assert tier.get("a") == 1
+        tier.set("c", 3)
+
+        assert tier.get("b") is None
+        assert tier.get("a") == 1
+        assert tier.statistics() == {"entries": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+    def test_weight_bound(self) -> None:
+        """Test entries are evicted by total weight, including when an entry grows in place."""
+        tier = LRUCacheTier(max_entries=10, max_weight=5)
+        tier.set("a", [1, 2], weight=2)
+        tier.set("b", [1, 2, 3], weight=3)
+        assert len(tier) == 2
+
+        tier.reweigh("b", 4)
+        assert tier.peek("a") is None
+        assert tier.peek("b") is not None
+        tier.set("c", [1, 2, 3, 4, 5, 6], weight=6)
+        assert len(tier) == 0
+        assert tier.statistics()["evictions"] == 3
+
+    def test_ttl_expiry(self) -> None:
+        """Test expired entries miss and count as evictions."""
+        tier = LRUCacheTier(ttl=-1)  # Already expired
+        tier.set("a", 1)
+        assert tier.get("a") is None
+        assert tier.statistics()["evictions"] == 1
+
+
+class TestTieredCache:
+    """Tests for TieredCache."""
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_promotes_to_local(self, resp_server: tuple[_RespStandIn, str], make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test records written through reach the Redis tier and are promoted on a local miss."""
+        stand_in, url = resp_server
+        writer = TieredCache(redis_url=url)
+        records = make_records(3)
+        await writer.put(records)
+        assert stand_in.commands == [b"SET"] * 3
+
+        reader = TieredCache(redis_url=url)
+        cached = await reader.get(records[1].record_id)
+        assert cached is not None
+        assert cached.record_hash == records[1].record_hash
+        assert await reader.get(records[1].record_id) is not None
+        assert await reader.get("missing") is None
+
+        stats = reader.statistics()
+        assert stats["local"]["hits"] == 1
+        assert stats["redis"] == {"hits": 1, "misses": 1, "errors": 0}
+        await writer.close()
+        await reader.close()
+
+    def test_provenance_tier_bounded_by_records(self, make_record: Callable[..., AuditRecord], make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test written-through chains stay deduplicated and the tier drops targets beyond its record budget."""
+        cache = TieredCache(max_provenance_records=4)
+        hot = make_records(2, target="hot.py")
+        cache.put_provenance("cold.py", [make_record(9, target="cold.py")])
+        cache.put_provenance("hot.py", hot)
+
+        late = make_record(2, target="hot.py")
+        cache.put_local([hot[1], late])
+        assert [r.record_id for r in cache.get_provenance("hot.py") or []] == [hot[0].record_id, hot[1].record_id, late.record_id]
+        assert cache.provenance.peek("cold.py") is not None
+
+        # A fifth record puts the tier over budget, so the least recently used chain is dropped
+        cache.put_local([make_record(3, target="hot.py")])
+        assert cache.get_provenance("cold.py") is None
+        assert len(cache.get_provenance("hot.py") or []) == 4
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_degrades_to_miss(self, make_record: Callable[..., AuditRecord]) -> None:
+        """Test a dead Redis tier counts errors instead of failing reads and writes."""
+        tier = RedisCacheTier("redis://127.0.0.1:1/0")
+        await tier.set([make_record(0)])
+        assert await tier.get("anything") is None
+        assert tier.statistics()["errors"] == 2
+
+
+class TestCachedAuditStore:
+    """Tests for AuditStore read caching."""
+
+    @pytest.mark.asyncio
+    async def test_hot_lookups_skip_durable_backend(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_record: Callable[..., AuditRecord], make_records: Callable[..., list[AuditRecord]]
+    ) -> None:
+        """Test repeated record and provenance lookups are served from the cache."""
+        store = AuditStore(sqlite_path=tmp_path / "audit.db")
+        await store.store_records(make_records(3, target="hot.py"))
+
+        database_calls: list[str] = []
+
+        async def fail_query(audit_filter: AuditFilter) -> list[AuditRecord]:
+            database_calls.append("query")
+            return []
+
+        first = await store.get_provenance_chain("hot.py")
+        assert len(first) == 3
+
+        monkeypatch.setattr(store._database, "query_records", fail_query)
+        monkeypatch.setattr(store._database, "get_record", fail_query)
+        assert [r.record_id for r in await store.get_provenance_chain("hot.py")] == [r.record_id for r in first]
+        assert await store.get_record(first[0].record_id) is not None
+
+        # New records for the target are written through into the cached chain
+        late = make_record(3, target="hot.py")
+        await store.store_record(late)
+        assert (await store.get_provenance_chain("hot.py"))[-1].record_id == late.record_id
+        assert database_calls == []
+
+        stats = await store.get_statistics()
+        assert stats["cache"]["provenance"]["hits"] == 2
+        assert stats["cache"]["local"]["hits"] == 1
+        await store.close()
@@ -0,0 +1,172 @@
+"""Tests for the disk-backed segmented chain log."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import AuditChain, AuditFilter, AuditRecord, SegmentedChainLog
+from compliance.backend.audit.core.record_index import RECORD_INDEX_FILENAME
+
+
+class TestSegmentedChainLog:
+    """Tests for SegmentedChainLog."""
+
+    def test_append_and_read(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test appended records are readable by position."""
+        log = SegmentedChainLog(tmp_path)
+        records = [make_record(i) for i in range(5)]
+        for record in records:
+            log.append(record)
+
+        assert len(log) == 5
+        assert log[0].record_id == records[0].record_id
+        assert log[-1].record_id == records[-1].record_id
+        assert [r.record_id for r in log[1:3]] == [r.record_id for r in records[1:3]]
+        assert [r.record_id for r in reversed(log)] == [r.record_id for r in reversed(records)]
+        assert all(r.verify() for r in log)
+        log.close()
+
+    def test_reopen_persists_records(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test records survive closing and reopening the log."""
+        log = SegmentedChainLog(tmp_path)
+        for i in range(3):
+            log.append(make_record(i))
+        log.close()
+
+        reopened = SegmentedChainLog(tmp_path)
+        assert len(reopened) == 3
+        assert reopened[2].context["index"] == 2
+        reopened.close()
+
+    def test_segment_rolling(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test log rolls to new segments once the size limit is reached."""
+        log = SegmentedChainLog(tmp_path, segment_size=2048)
+        for i in range(20):
+            log.append(make_record(i))
+
+        assert log.segment_count > 1
+        assert [r.context["index"] for r in log] == list(range(20))
+        log.close()
+
+        reopened = SegmentedChainLog(tmp_path, segment_size=2048)
+        assert len(reopened) == 20
+        assert reopened[13].context["index"] == 13
+        reopened.close()
+
+    def test_recovers_torn_tail(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test a partially written trailing frame is truncated on open."""
+        log = SegmentedChainLog(tmp_path)
+        for i in range(3):
+            log.append(make_record(i))
+        log.close()
+
+        segment = next(tmp_path.glob("*.log"))
+        with segment.open("ab") as handle:
+            handle.write(b"\x10\x00\x00\x00garbage")
+
+        reopened = SegmentedChainLog(tmp_path)
+        assert len(reopened) == 3
+        reopened.append(make_record(3))
+        assert reopened[3].context["index"] == 3
+        reopened.close()
+
+    def test_index_out_of_range(self, tmp_path: Path) -> None:
+        """Test reading past the end raises IndexError."""
+        log = SegmentedChainLog(tmp_path)
+        with pytest.raises(IndexError):
+            log[0]
+        log.close()
+
+
+class TestPersistentAuditChain:
+    """Tests for AuditChain backed by a segmented chain log."""
+
+    @pytest.mark.asyncio
+    async def test_chain_survives_restart(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test reopening a persistent chain keeps genesis and records."""
+        chain = AuditChain(difficulty=1, storage_path=tmp_path)
+        genesis_hash = chain.chain[0].record_hash
+        for i in range(4):
+            await chain.add_record(make_record(i))
+        chain.close()
+
+        reopened = AuditChain(difficulty=1, storage_path=tmp_path)
+        assert len(reopened.chain) == 5
+        assert reopened.chain[0].record_hash == genesis_hash
+        assert reopened.verify_chain() is True
+
+        added = await reopened.add_record(make_record(4))
+        assert added.previous_hash == reopened.chain[4].record_hash
+        assert reopened.verify_chain() is True
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_parallel_verify_reads_segments(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test parallel verification of a persistent chain reads chunks from the log in workers."""
+        chain = AuditChain(difficulty=1, storage_path=tmp_path, segment_size=4096)
+        for i in range(15):
+            await chain.add_record(make_record(i))
+
+        assert chain.verify_chain(parallel=True, workers=2, chunk_size=4) is True
+        chain.close()
+
+    @pytest.mark.asyncio
+    async def test_watermark_survives_restart(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test the signed watermark is reloaded with the same key and ignored with another."""
+        chain = AuditChain(difficulty=1, storage_path=tmp_path, watermark_key="secret")
+        for i in range(3):
+            await chain.add_record(make_record(i))
+        assert chain.verify_chain() is True
+        chain.close()
+
+        reopened = AuditChain(difficulty=1, storage_path=tmp_path, watermark_key="secret")
+        watermark = reopened.get_watermark()
+        assert watermark is not None
+        assert watermark.index == 3
+        await reopened.add_record(make_record(3))
+        assert reopened.verify_chain(incremental=True) is True
+        watermark = reopened.get_watermark()
+        assert watermark is not None
+        assert watermark.index == 4
+        reopened.close()
+
+        other_key = AuditChain(difficulty=1, storage_path=tmp_path, watermark_key="other")
+        assert other_key.get_watermark() is None
+        assert other_key.verify_chain(incremental=True) is True
+        other_key.close()
+
+    @pytest.mark.asyncio
+    async def test_record_index_survives_restart(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_record: Callable[..., AuditRecord]) -> None:
+        """Test reopening a chain rebuilds its record index from the index file, decoding only records it lacks."""
+        chain = AuditChain(difficulty=1, storage_path=tmp_path, checkpoint_interval=3)
+        for i in range(6):
+            await chain.add_record(make_record(i))
+        assert [r.target for r in chain.find_records(AuditFilter(target="target_0"))] == ["target_0"]
+        chain.close()
+
+        reopened = AuditChain(difficulty=1, storage_path=tmp_path, checkpoint_interval=3)
+        await reopened.add_record(make_record(6))
+        await reopened.add_record(make_record(7))
+        decoded: list[int] = []
+        read = SegmentedChainLog._read
+
+        def counting_read(log: SegmentedChainLog, index: int) -> AuditRecord:
+            decoded.append(index)
+            return read(log, index)
+
+        monkeypatch.setattr(SegmentedChainLog, "_read", counting_read)
+
+        assert [r.target for r in reopened.find_records(AuditFilter(target="target_0"))] == ["target_0"]
+        # The newest indexed entry is checked against the chain, then only the two unindexed records and the match are decoded
+        assert len(decoded) == 4
+        assert [r.target for r in reopened.find_records(AuditFilter(target="target_7"))] == ["target_7"]
+        assert reopened.get_inclusion_proof(reopened.chain[1].record_id) is not None
+        reopened.close()
+
+        # A torn index file is cut back to whole lines and caught up from the chain
+        index_path = tmp_path / RECORD_INDEX_FILENAME
+        index_path.write_bytes(index_path.read_bytes()[:-5])
+        torn = AuditChain(difficulty=1, storage_path=tmp_path)
+        assert len(torn.find_records(AuditFilter(limit=100))) == 8
+        assert len(index_path.read_text().splitlines()) == len(torn.chain)
+        torn.close()
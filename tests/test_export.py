@@ -0,0 +1,150 @@
+"""Tests for streaming chain export."""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+from compliance.backend.audit.core import AuditChain, AuditFinding, AuditRecord, AuditSeverity, AuditTargetType, AuditViolation, ExportWriter
+
+BASE_TIME = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+def _read_table(path: Path) -> list[dict[str, str]]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+class _AsyncSink:
+    """Writer with an awaitable write, recording each chunk."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    async def write(self, data: bytes) -> None:
+        await asyncio.sleep(0)
+        self.chunks.append(data)
+
+
+class TestExport:
+    """Tests for AuditChain.export_chain_to."""
+
+    @pytest.mark.asyncio
+    async def test_formats_round_trip(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test every format parses back to the same records as export_chain."""
+        chain = await make_chain(5)
+        expected = json.loads(chain.export_chain("json"))
+
+        assert await chain.export_chain_to(tmp_path / "chain.jsonl") == 6  # Including genesis
+        assert [json.loads(line) for line in (tmp_path / "chain.jsonl").read_text().splitlines()] == expected
+
+        await chain.export_chain_to(tmp_path / "chain.json", export_format="json")
+        assert json.loads((tmp_path / "chain.json").read_text()) == expected
+
+        await chain.export_chain_to(tmp_path / "chain.yaml", export_format="yaml")
+        assert list(yaml.safe_load_all((tmp_path / "chain.yaml").read_text())) == expected
+
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            await chain.export_chain_to(tmp_path / "chain.csv", export_format="csv")
+
+    @pytest.mark.asyncio
+    async def test_gzip_time_range_and_writers(self, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test gzip output to file objects and async writers, limited to a time range."""
+        chain = await make_chain(10, base_time=BASE_TIME, step=timedelta(minutes=1))
+        start, end = BASE_TIME + timedelta(minutes=2), BASE_TIME + timedelta(minutes=5)
+        expected = [record.record_id for record in chain.get_chain_slice(start, end)]
+
+        buffer = io.BytesIO()
+        assert await chain.export_chain_to(buffer, start=start, end=end, compress=True) == 4
+        assert [json.loads(line)["record_id"] for line in gzip.decompress(buffer.getvalue()).splitlines()] == expected
+
+        sink = _AsyncSink()
+        await chain.export_chain_to(sink, export_format="json", start=start, end=end, compress=True)
+        assert [record["record_id"] for record in json.loads(gzip.decompress(b"".join(sink.chunks)))] == expected
+
+        buffer = io.BytesIO()
+        assert await chain.export_chain_to(buffer, export_format="json", start=BASE_TIME + timedelta(days=1)) == 0
+        assert json.loads(buffer.getvalue()) == []
+
+    @pytest.mark.asyncio
+    async def test_output_is_chunked(self, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test output is emitted in bounded chunks rather than all at the end."""
+        chain = await make_chain(50)
+        writer = ExportWriter("jsonl", chunk_size=1024)
+        chunks = [chunk for record in chain.chain for chunk in [writer.add(record)] if chunk]
+        chunks.append(writer.finish())
+
+        assert len(chunks) > 10
+        assert all(len(chunk) < 2048 for chunk in chunks)
+        assert len(b"".join(chunks).splitlines()) == writer.count == 51
+
+
+class TestExportTables:
+    """Tests for AuditChain.export_tables."""
+
+    @pytest.mark.asyncio
+    async def test_findings_and_violations_exploded(self, tmp_path: Path) -> None:
+        """Test each finding and violation gets a row keyed by its record, with schema column names."""
+        chain = AuditChain(difficulty=0)
+        record = AuditRecord(
+            actor="tester",
+            action="lint",
+            target="app.py",
+            target_type=AuditTargetType.FILE,
+            source="test",
+            context={"branch": "main"},
+            findings=[AuditFinding(finding_type="style", severity=AuditSeverity.WARNING, description="Long line")],
+            violations=[
+                AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3),
+                AuditViolation(rule="F401", severity=AuditSeverity.WARNING, message="Unused import"),
+            ],
+        )
+        await chain.add_record(record)
+
+        assert chain.export_tables(tmp_path) == {"records": 2, "findings": 1, "violations": 2}  # Including genesis
+        records = _read_table(tmp_path / "records.csv")
+        assert [row["record_id"] for row in records] == [item.record_id for item in chain.chain]
+        assert records[1]["target_type"] == "file"
+        assert json.loads(records[1]["context"]) == {"branch": "main"}
+        assert records[1]["timestamp"] == record.timestamp.isoformat()
+
+        violations = _read_table(tmp_path / "violations.csv")
+        assert [(row["record_id"], row["rule"], row["line_number"], row["column_number"]) for row in violations] == [
+            (record.record_id, "E501", "3", ""),
+            (record.record_id, "F401", "", ""),
+        ]
+        findings = _read_table(tmp_path / "findings.csv")
+        assert findings[0]["record_id"] == record.record_id
+        assert findings[0]["finding_id"] == record.findings[0].finding_id
+        assert findings[0]["severity"] == "warning"
+
+    @pytest.mark.asyncio
+    async def test_projection_range_and_gzip(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test only the projected tables and columns are written, in order, for a time range."""
+        chain = await make_chain(10, base_time=BASE_TIME, step=timedelta(minutes=1))
+        start, end = BASE_TIME + timedelta(minutes=2), BASE_TIME + timedelta(minutes=5)
+
+        counts = chain.export_tables(tmp_path, columns={"records": ["target", "record_id"]}, start=start, end=end, compress=True)
+        assert counts == {"records": 4}
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["records.csv.gz"]
+        with gzip.open(tmp_path / "records.csv.gz", "rt", encoding="utf-8", newline="") as handle:
+            rows = list(csv.reader(handle))
+        assert rows[0] == ["target", "record_id"]
+        assert rows[1:] == [[record.target, record.record_id] for record in chain.get_chain_slice(start, end)]
+
+    @pytest.mark.asyncio
+    async def test_unknown_table_or_column(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test unknown projections are rejected before any file is written."""
+        chain = await make_chain(1)
+        with pytest.raises(ValueError, match="Unknown export table"):
+            chain.export_tables(tmp_path / "out", columns={"signatures": ["signer"]})
+        with pytest.raises(ValueError, match="payload"):
+            chain.export_tables(tmp_path / "out", columns={"records": ["record_id", "payload"]})
+        assert not (tmp_path / "out").exists()
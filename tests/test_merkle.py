@@ -0,0 +1,125 @@
+"""Tests for Merkle checkpoints and inclusion proofs."""
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import AuditChain, AuditFilter, AuditRecord
+from compliance.backend.audit.core.merkle import merkle_path, merkle_root, root_from_path, verify_inclusion_proof
+
+
+class TestMerkleTree:
+    """Tests for Merkle tree helpers."""
+
+    @pytest.mark.parametrize("leaf_count", [1, 2, 3, 5, 8, 13])
+    def test_every_leaf_proves_root(self, leaf_count: int) -> None:
+        """Test each leaf's path recomputes the root."""
+        hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(leaf_count)]
+        root = merkle_root(hashes)
+
+        for index, record_hash in enumerate(hashes):
+            path = merkle_path(hashes, index)
+            assert len(path) <= leaf_count.bit_length()
+            assert root_from_path(record_hash, index, leaf_count, path) == root
+
+    def test_tampered_path_fails(self) -> None:
+        """Test a modified sibling or leaf does not reproduce the root."""
+        hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(6)]
+        root = merkle_root(hashes)
+        path = merkle_path(hashes, 2)
+
+        assert root_from_path(hashes[3], 2, 6, path) != root
+        assert root_from_path(hashes[2], 2, 6, ["00" * 32, *path[1:]]) != root
+        assert root_from_path(hashes[2], 2, 6, path[:-1]) is None
+
+
+class TestChainCheckpoints:
+    """Tests for checkpoint records and inclusion proofs on AuditChain."""
+
+    @pytest.mark.asyncio
+    async def test_periodic_checkpoints(self, make_record: Callable[..., AuditRecord]) -> None:
+        """Test checkpoints are appended every interval and verify."""
+        chain = AuditChain(difficulty=1, checkpoint_interval=4)
+        for i in range(10):
+            await chain.add_record(make_record(i))
+
+        checkpoints = [record for record in chain.chain if record.action == "merkle_checkpoint"]
+        assert len(checkpoints) == 2
+        assert chain.verify_chain() is True
+        assert chain.verify_checkpoints() is True
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_per_interval_within_group_commits(self, make_record: Callable[..., AuditRecord]) -> None:
+        """Test concurrent appends committed in groups get a checkpoint at every interval, hidden from statistics and queries."""
+        chain = AuditChain(difficulty=1, checkpoint_interval=10)
+        await asyncio.gather(*(chain.add_record(make_record(i)) for i in range(300)))
+        await chain.add_records([make_record(i) for i in range(300, 325)])
+
+        positions = [i for i, record in enumerate(chain.chain) if record.action == "merkle_checkpoint"]
+        assert len(positions) == 32
+        assert {chain.chain[p].context["leaf_count"] for p in positions} == {11}  # Ten records and the previous checkpoint (or genesis)
+        assert chain.verify_chain() is True
+        assert chain.verify_checkpoints() is True
+
+        stats = chain.get_statistics()
+        assert stats["total_records"] == 325
+        assert (stats["unique_actors"], stats["unique_actions"]) == (3, 2)
+        assert chain.verify_statistics() is True
+        assert len(chain.find_records(AuditFilter(limit=1000))) == 325
+        assert chain.find_records(AuditFilter(actor="system")) == []
+
+    @pytest.mark.asyncio
+    async def test_inclusion_proof(self, make_record: Callable[..., AuditRecord]) -> None:
+        """Test a covered record has a verifiable proof and a tail record has none until checkpointed."""
+        chain = AuditChain(difficulty=1, checkpoint_interval=4)
+        records = [await chain.add_record(make_record(i)) for i in range(6)]
+
+        proof = chain.get_inclusion_proof(records[1].record_id)
+        assert proof is not None
+        assert verify_inclusion_proof(proof, record=records[1], trusted_checkpoint_hash=proof.checkpoint.record_hash) is True
+        assert verify_inclusion_proof(proof, record=records[2]) is False
+
+        assert chain.get_inclusion_proof(records[5].record_id) is None
+        checkpoint = await chain.add_checkpoint()
+        assert checkpoint is not None
+        checkpoint_position = len(chain.chain) - 1
+        tail_proof = chain.get_inclusion_proof(records[5].record_id)
+        assert tail_proof is not None
+        assert tail_proof.checkpoint.record_id == checkpoint.record_id
+        assert verify_inclusion_proof(tail_proof, record=records[5]) is True
+
+        # Later checkpoints start from the requested one
+        later = [await chain.add_record(make_record(i)) for i in range(6, 10)]
+        assert chain.chain[-1].context["start_index"] == checkpoint_position
+        assert chain.get_inclusion_proof(later[-1].record_id) is not None
+        assert chain.verify_checkpoints() is True
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_lookalike_rejected(self, make_record: Callable[..., AuditRecord]) -> None:
+        """Test callers cannot append records shaped like checkpoints."""
+        chain = AuditChain(difficulty=1, checkpoint_interval=3)
+        with pytest.raises(ValueError, match="reserved action"):
+            await chain.add_record(make_record(0, actor="system", action="merkle_checkpoint", context={"start_index": 0}))
+        with pytest.raises(ValueError, match="reserved action"):
+            await chain.add_records([make_record(1), make_record(2, actor="system", action="merkle_checkpoint")])
+        assert len(chain.chain) == 1
+
+        records = [await chain.add_record(make_record(i)) for i in range(4)]
+        assert chain.verify_checkpoints() is True
+        assert chain.get_inclusion_proof(records[0].record_id) is not None
+
+    @pytest.mark.asyncio
+    async def test_proofs_after_reopen(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test checkpoints are rediscovered when a persistent chain is reopened."""
+        chain = AuditChain(difficulty=1, storage_path=tmp_path, checkpoint_interval=3)
+        records = [await chain.add_record(make_record(i)) for i in range(7)]
+        chain.close()
+
+        reopened = AuditChain(difficulty=1, storage_path=tmp_path, checkpoint_interval=3)
+        proof = reopened.get_inclusion_proof(records[4].record_id)
+        assert proof is not None
+        assert verify_inclusion_proof(proof, record=records[4]) is True
+        assert reopened.verify_checkpoints() is True
+        reopened.close()
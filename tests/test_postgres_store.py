@@ -0,0 +1,163 @@
+"""Tests for the PostgreSQL audit store backend.
+
+Run against a throwaway database by setting AUDIT_TEST_POSTGRES_URL, e.g.
+``postgresql://postgres@127.0.0.1:5432/audit_test``; the tests truncate the audit tables.
+"""
+
+import os
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from compliance.backend.audit.core import (
+    AuditFilter,
+    AuditFinding,
+    AuditRecord,
+    AuditSeverity,
+    AuditStore,
+    AuditTargetType,
+    AuditViolation,
+    PostgresAuditBackend,
+)
+
+POSTGRES_URL = os.environ.get("AUDIT_TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(POSTGRES_URL is None, reason="AUDIT_TEST_POSTGRES_URL not set")
+
+
+@pytest_asyncio.fixture
+async def backend() -> AsyncIterator[PostgresAuditBackend]:
+    """Create a backend on empty audit tables."""
+    assert POSTGRES_URL is not None
+    backend = PostgresAuditBackend(POSTGRES_URL, max_size=4)
+    pool = await backend._get_pool()
+    await pool.execute("TRUNCATE audit_signatures, audit_violations, audit_findings, audit_records, audit_rollups")
+    yield backend
+    await backend.close()
+
+
+class TestPostgresAuditBackend:
+    """Tests for PostgresAuditBackend."""
+
+    @pytest.mark.asyncio
+    async def test_copy_ingest_round_trip(self, backend: PostgresAuditBackend, make_record: Callable[..., AuditRecord]) -> None:
+        """Test COPY-ingested records read back with their hash and child rows."""
+        record = make_record(1)
+        record.findings.extend(AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description=f"finding {i}") for i in range(3))
+        record.violations.append(AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3))
+        record.sign("private_key", "signer_1")
+        await backend.store_records([record])
+
+        # Re-storing after another signature adds only the new signature
+        record.sign("private_key", "signer_2")
+        await backend.store_records([record])
+
+        # Child rows are read by ordinal, not heap order (VACUUM FULL, CLUSTER and pg_repack rewrite the heap)
+        pool = await backend._get_pool()
+        for table in ("audit_findings", "audit_signatures"):
+            await pool.execute(
+                f"CREATE TEMP TABLE reversed AS SELECT * FROM {table} ORDER BY ordinal DESC; "
+                f"DELETE FROM {table}; INSERT INTO {table} SELECT * FROM reversed; DROP TABLE reversed"
+            )
+
+        loaded = await backend.get_record(record.record_id)
+        assert loaded is not None
+        assert loaded.verify() is True
+        assert loaded.timestamp == record.timestamp
+        assert [f.description for f in loaded.findings] == ["finding 0", "finding 1", "finding 2"]
+        assert loaded.violations[0].line_number == 3
+        assert [s.signer for s in loaded.signatures] == ["signer_1", "signer_2"]
+
+        stats = await backend.get_statistics()
+        assert stats["total_records"] == 1
+        assert stats["total_findings"] == 3
+        assert stats["signed_records"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nonce_beyond_32_bits(self, backend: PostgresAuditBackend, make_record: Callable[..., AuditRecord]) -> None:
+        """Test nonces found by long parallel mining runs fit the nonce column."""
+        record = make_record(1)
+        object.__setattr__(record, "nonce", 2**40)
+        object.__setattr__(record, "record_hash", record.calculate_hash())
+        await backend.store_records([record])
+
+        loaded = await backend.get_record(record.record_id)
+        assert loaded is not None
+        assert loaded.nonce == 2**40
+        assert loaded.verify() is True
+
+    @pytest.mark.asyncio
+    async def test_filter_pushdown_matches_in_memory_filter(self, backend: PostgresAuditBackend, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test pushed-down filters, ordering, offset and cursors agree with AuditFilter.matches."""
+        records = make_records(20, target=lambda i: f"target_{i % 4}")
+        base_time = records[0].timestamp
+        await backend.store_records(records)
+
+        filters = [
+            AuditFilter(),
+            AuditFilter(actor="user_1"),
+            AuditFilter(action="action_0", target_type=AuditTargetType.MODULE),
+            AuditFilter(target="target_2", severity=AuditSeverity.INFO),
+            AuditFilter(since=base_time + timedelta(seconds=5), until=base_time + timedelta(seconds=12), limit=4, offset=2),
+        ]
+        newest_first = sorted(records, key=lambda r: (r.timestamp, r.record_id), reverse=True)
+        for audit_filter in filters:
+            expected = [r.record_id for r in newest_first if audit_filter.matches(r)]
+            expected = expected[audit_filter.offset : audit_filter.offset + audit_filter.limit]
+            assert [r.record_id for r in await backend.query_records(audit_filter)] == expected
+
+        paged: list[str] = []
+        page_filter: AuditFilter | None = AuditFilter(actor="user_2", limit=3)
+        while page_filter is not None:
+            page = await backend.query_records(page_filter)
+            paged.extend(r.record_id for r in page)
+            page_filter = page_filter.next_page(page)
+        assert paged == [r.record_id for r in newest_first if r.actor == "user_2"]
+
+    @pytest.mark.asyncio
+    async def test_provenance_by_target_and_prefix(self, backend: PostgresAuditBackend, make_record: Callable[..., AuditRecord]) -> None:
+        """Test provenance reads are chronological and prefix lookups do not treat wildcards specially."""
+        base_time = datetime.now(UTC)
+        records = [
+            AuditRecord(actor="bot", action="edit", target=target, target_type=AuditTargetType.FILE, source="test", timestamp=base_time + timedelta(seconds=i))
+            for i, target in enumerate(["lib/a.py", "lib/b.py", "lib_old.py"])
+        ]
+        records += [make_record(i, base_time=base_time, target=f"target_{i % 4}") for i in range(3, 12)]
+        await backend.store_records(records[::-1])
+
+        assert [r.record_id for r in await backend.get_provenance("target_1")] == [r.record_id for r in records if r.target == "target_1"]
+        assert [r.record_id for r in await backend.get_provenance("lib/", prefix=True)] == [r.record_id for r in records[:2]]
+        assert await backend.get_provenance("lib_", prefix=True) == [records[2]]
+
+    @pytest.mark.asyncio
+    async def test_audit_store_uses_postgres(self, backend: PostgresAuditBackend, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test AuditStore writes through to and queries from PostgreSQL."""
+        assert POSTGRES_URL is not None
+        store = AuditStore(postgres_url=POSTGRES_URL)
+        await store.store_records(make_records(6))
+        await store.close()
+
+        reopened = AuditStore(postgres_url=POSTGRES_URL)
+        records = await reopened.query_records(AuditFilter(actor="user_0"))
+        assert [r.context["index"] for r in records] == [3, 0]
+        assert await reopened.verify_integrity() is True
+        assert (await reopened.get_statistics())["storage_backend"] == "postgres"
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_rollups_count_new_records_once(self, backend: PostgresAuditBackend, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test rollups count each record once across overlapping batches and survive a rebuild."""
+        records = make_records(20)
+        await backend.store_records(records[:12])
+        await backend.store_records(records[6:])
+
+        buckets = await backend.get_rollups("day", "severity")
+        assert sum(bucket.count for bucket in buckets) == 20
+        assert sum(bucket.count for bucket in buckets if bucket.value == "error") == 5
+        errors = await backend.get_rollups("day", "actor", severity="error")
+        assert sum(bucket.count for bucket in errors) == 5
+        assert {bucket.severity for bucket in errors} == {"error"}
+
+        await backend.rebuild_rollups()
+        assert await backend.get_rollups("day", "severity") == buckets
@@ -0,0 +1,119 @@
+"""Tests for the embedded provenance graph."""
+
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditChain,
+    AuditRecord,
+    AuditSeverity,
+    AuditStore,
+    AuditTargetType,
+    AuditViolation,
+    ProvenanceGraph,
+)
+
+
+async def _chain_records() -> list[AuditRecord]:
+    """Build linked records: a scan finding a violation in a.py, edits of a.py and an unrelated edit."""
+    violation = AuditViolation(rule="E501", severity=AuditSeverity.WARNING, message="line too long", file_path="src/a.py")
+    records = [
+        AuditRecord(actor="linter", action="scan", target="src/", target_type=AuditTargetType.MODULE, source="test", violations=[violation]),
+        AuditRecord(actor="alice", action="edit", target="src/a.py", target_type=AuditTargetType.FILE, source="test"),
+        AuditRecord(actor="bob", action="edit", target="src/a.py", target_type=AuditTargetType.FILE, source="test"),
+        AuditRecord(actor="carol", action="edit", target="src/b.py", target_type=AuditTargetType.FILE, source="test"),
+    ]
+    return await AuditChain(difficulty=1).add_records(records)
+
+
+class TestProvenanceGraph:
+    """Tests for ProvenanceGraph and AuditStore relationship queries."""
+
+    @pytest.mark.asyncio
+    async def test_traversal_from_violation_file(self, tmp_path: Path) -> None:
+        """Test records reachable from a violation's file are found by hop distance."""
+        scan, edit_a1, edit_a2, edit_b = await _chain_records()
+        store = AuditStore(graph_path=tmp_path / "graph.jsonl")
+        await store.store_records([scan, edit_a1, edit_a2, edit_b])
+
+        violation = ProvenanceGraph.node("violation", scan.violations[0].violation_id)
+        related = await store.get_related_records(violation, max_hops=2, predicates={"has_violation", "in_file", "affects"})
+        assert [r.record_id for r in related[:1]] == [scan.record_id]
+        assert {r.record_id for r in related[1:]} == {edit_a1.record_id, edit_a2.record_id}
+
+        # Following predecessor links as well reaches the edit of b.py, three hops out
+        related = await store.get_related_records(violation, max_hops=3)
+        assert edit_b.record_id in {r.record_id for r in related}
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_links_predecessors_stored_out_of_order(self) -> None:
+        """Test previous_record edges are linked whichever record is stored first."""
+        records = await _chain_records()
+        graph = ProvenanceGraph()
+        graph.add_records(records[::-1])
+
+        for i, record in enumerate(records):
+            linked = [records[j] for j in (i - 1, i + 1) if 0 <= j < len(records)]
+            expected = sorted(ProvenanceGraph.node("record", r.record_id) for r in linked)
+            assert graph.neighbors(ProvenanceGraph.node("record", record.record_id), {"previous_record"}) == expected
+
+    def test_unlinked_records_do_not_wait_for_a_predecessor(self) -> None:
+        """Test records with the genesis previous_hash are not parked waiting for a predecessor."""
+        graph = ProvenanceGraph()
+        graph.add_records(AuditRecord(actor="tester", action="edit", target=f"f{i}.py", target_type=AuditTargetType.FILE, source="test") for i in range(20))
+        assert graph._waiting == {}
+        assert graph.statistics()["records"] == 20
+
+    @pytest.mark.asyncio
+    async def test_unstored_predecessors_stop_waiting(self) -> None:
+        """Test waiting for genesis and checkpoint records, which are never stored, is bounded by the reorder window."""
+        chain = AuditChain(difficulty=1, checkpoint_interval=2)
+        records = [
+            await chain.add_record(AuditRecord(actor="tester", action="edit", target=f"f{i}.py", target_type=AuditTargetType.FILE, source="test"))
+            for i in range(12)
+        ]
+        graph = ProvenanceGraph(reorder_window=3)
+        graph.add_records(records)
+        assert graph.statistics()["waiting"] == 3
+
+        # Predecessors stored within the window are still linked
+        late = ProvenanceGraph(reorder_window=3)
+        late.add_records([records[1], records[0]])
+        assert late.neighbors(ProvenanceGraph.node("record", records[1].record_id), {"previous_record"}) == [
+            ProvenanceGraph.node("record", records[0].record_id)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_persists_and_recovers_torn_tail(self, tmp_path: Path) -> None:
+        """Test the graph reloads from its file, adds only new relationships and drops a torn final line."""
+        path = tmp_path / "graph.jsonl"
+        records = await _chain_records()
+        graph = ProvenanceGraph(path)
+        graph.add_records(records)
+        stats = graph.statistics()
+
+        graph.add_records(records)
+        assert len(path.read_text().splitlines()) == len(records)
+
+        records[1].sign("private_key", "reviewer")
+        graph.add_records([records[1]])
+        assert graph.neighbors(ProvenanceGraph.node("signer", "reviewer")) == [ProvenanceGraph.node("record", records[1].record_id)]
+        graph.close()
+
+        with path.open("a") as handle:
+            handle.write('{"id": "torn')
+        reopened = ProvenanceGraph(path)
+        assert reopened.statistics() == {**stats, "nodes": stats["nodes"] + 1, "edges": stats["edges"] + 1}
+        assert path.read_text().endswith("\n")
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_requires_embedded_graph(self) -> None:
+        """Test relationship queries are rejected when Dgraph is configured instead."""
+        with pytest.raises(ValueError, match="Unknown provenance node kind"):
+            ProvenanceGraph.node("file", "src/a.py")
+        for store in (AuditStore(), AuditStore(dgraph_url="http://dgraph:8080", enable_graph=True)):
+            with pytest.raises(RuntimeError, match="embedded provenance graph"):
+                await store.get_related_records(ProvenanceGraph.node("target", "src/a.py"))
+            assert "graph" not in await store.get_statistics()
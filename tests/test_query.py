@@ -0,0 +1,69 @@
+"""Tests for top-k query execution and streaming queries."""
+
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import AuditFilter, AuditRecord, AuditSeverity, AuditStore
+from compliance.backend.audit.core.query import select_top_k, sort_key
+
+BASE_TIME = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+def _paired_timestamp(i: int) -> datetime:
+    """Give records two to a timestamp, so pages must break ties by record_id."""
+    return BASE_TIME + timedelta(seconds=i // 2)
+
+
+class TestSelectTopK:
+    """Tests for select_top_k."""
+
+    def test_page_matches_full_sort(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test newest-first candidates give the same pages as filtering and sorting everything."""
+        records = sorted(make_records(500, timestamp=_paired_timestamp), key=sort_key, reverse=True)
+        audit_filter = AuditFilter(severity=AuditSeverity.ERROR, limit=20, offset=5)
+
+        expected = [r for r in records if audit_filter.matches(r)][5:25]
+        assert select_top_k(records, audit_filter) == expected
+
+        page = audit_filter.next_page(expected)
+        assert page is not None
+        following = [r for r in records if audit_filter.matches(r) and sort_key(r) < sort_key(expected[-1])][:20]
+        assert select_top_k(records, page) == following
+
+    def test_short_circuits_when_page_is_full(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test candidates are consumed only until the page is full."""
+        records = sorted(make_records(100, timestamp=_paired_timestamp), key=sort_key, reverse=True)
+        consumed = 0
+
+        def candidates() -> Iterator[AuditRecord]:
+            nonlocal consumed
+            for record in records:
+                consumed += 1
+                yield record
+
+        page = select_top_k(candidates(), AuditFilter(limit=10, offset=2))
+
+        assert page == records[2:12]
+        assert consumed == 12
+
+
+class TestStreamRecords:
+    """Tests for AuditStore.stream_records."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_sqlite", [False, True])
+    async def test_streams_every_match_in_pages(self, tmp_path: Path, use_sqlite: bool, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test streaming yields the same records as one large query, up to the limit."""
+        store = AuditStore(sqlite_path=tmp_path / "audit.db" if use_sqlite else None)
+        await store.store_records(make_records(120, target=lambda i: f"target_{i % 7}", timestamp=_paired_timestamp))
+        audit_filter = AuditFilter(target="target_3", limit=1000)
+
+        expected = [r.record_id for r in await store.query_records(audit_filter)]
+        assert len(expected) == 17
+        assert [r.record_id async for r in store.stream_records(audit_filter, page_size=4)] == expected
+
+        limited = audit_filter.model_copy(update={"limit": 9})
+        assert [r.record_id async for r in store.stream_records(limited, page_size=4)] == expected[:9]
+        await store.close()
@@ -0,0 +1,132 @@
+"""Tests for time-bucketed audit rollups."""
+
+from collections.abc import Callable
+from typing import Any
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditRecord,
+    AuditSeverity,
+    AuditStore,
+    AuditTargetType,
+    AuditViolation,
+    RollupBucket,
+    SQLiteAuditBackend,
+)
+from compliance.backend.audit.core.rollups import AuditRollups, bucket_start
+
+BASE_TIME = datetime(2026, 3, 1, 9, 58, tzinfo=UTC)
+
+# Minute-spaced records from just before 10:00, with an E501 violation on every fifth
+_ROLLUP_FIELDS: dict[str, Any] = {
+    "action": "check",
+    "target_type": AuditTargetType.FILE,
+    "base_time": BASE_TIME,
+    "step": timedelta(minutes=1),
+    "violations": lambda i: [AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long")] if i % 5 == 0 else [],
+}
+
+
+def _counts(buckets: list[RollupBucket]) -> dict[tuple[datetime, str], int]:
+    return {(bucket.bucket_start, bucket.value): bucket.count for bucket in buckets}
+
+
+class TestAuditRollups:
+    """Tests for AuditRollups."""
+
+    def test_bucket_start_floors_to_utc(self) -> None:
+        """Test timestamps are floored to their bucket, with naive timestamps taken as UTC."""
+        assert bucket_start(datetime(2026, 3, 1, 9, 58, 42, tzinfo=UTC), "minute") == datetime(2026, 3, 1, 9, 58, tzinfo=UTC)
+        assert bucket_start(datetime(2026, 3, 1, 9, 58, 42), "hour") == datetime(2026, 3, 1, 9, tzinfo=UTC)
+        assert bucket_start(datetime(2026, 3, 1, 23, 30, tzinfo=UTC), "day") == datetime(2026, 3, 1, tzinfo=UTC)
+
+    def test_counts_per_bucket_and_range(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test hourly counts per severity and violation rule, bounded by bucket start."""
+        rollups = AuditRollups(make_records(10, **_ROLLUP_FIELDS))  # 09:58 .. 10:07
+
+        errors = rollups.query("hour", "severity", values=["error"])
+        assert _counts(errors) == {(datetime(2026, 3, 1, 9, tzinfo=UTC), "error"): 1, (datetime(2026, 3, 1, 10, tzinfo=UTC), "error"): 2}
+        assert _counts(rollups.query("day", "rule")) == {(datetime(2026, 3, 1, tzinfo=UTC), "E501"): 2}
+
+        later = rollups.query("hour", "actor", since=datetime(2026, 3, 1, 10, tzinfo=UTC))
+        assert sum(bucket.count for bucket in later) == 8
+        assert rollups.query("minute", "actor", until=BASE_TIME - timedelta(minutes=1)) == []
+
+    def test_counts_split_by_severity(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test errors per hour per actor, and violations per rule by the violation's severity."""
+        rollups = AuditRollups(make_records(10, **_ROLLUP_FIELDS))  # Errors at 09:58 (user_0), 10:02 (user_1) and 10:06 (user_2)
+
+        errors = rollups.query("hour", "actor", severity=AuditSeverity.ERROR)
+        assert _counts(errors) == {
+            (datetime(2026, 3, 1, 9, tzinfo=UTC), "user_0"): 1,
+            (datetime(2026, 3, 1, 10, tzinfo=UTC), "user_1"): 1,
+            (datetime(2026, 3, 1, 10, tzinfo=UTC), "user_2"): 1,
+        }
+        assert {(bucket.dimension, bucket.severity) for bucket in errors} == {("actor", AuditSeverity.ERROR)}
+        rule_errors = rollups.query("day", "rule", severity="error")
+        assert _counts(rule_errors) == {(datetime(2026, 3, 1, tzinfo=UTC), "E501"): 2}
+        assert {bucket.severity for bucket in rule_errors} == {AuditSeverity.ERROR}
+        assert rollups.query("day", "rule", severity="info") == []
+        assert sum(bucket.count for bucket in rollups.query("day", "action", severity="info")) == 7
+
+    def test_unknown_granularity_or_dimension(self) -> None:
+        """Test unknown query names are rejected."""
+        rollups = AuditRollups()
+        with pytest.raises(ValueError, match="granularity"):
+            rollups.query("week", "severity")
+        with pytest.raises(ValueError, match="dimension"):
+            rollups.query("hour", "context")
+        with pytest.raises(ValueError, match="not split by severity"):
+            rollups.query("hour", "severity", severity="error")
+        with pytest.raises(ValueError, match="severity"):
+            rollups.query("hour", "actor", severity="fatal")
+
+
+class TestAuditStoreRollups:
+    """Tests for AuditStore.get_rollups."""
+
+    @pytest.mark.asyncio
+    async def test_memory_and_sqlite_agree(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test memory and SQLite rollups match, and re-stored records are not counted twice."""
+        records = make_records(30, **_ROLLUP_FIELDS)
+        memory = AuditStore()
+        sqlite = AuditStore(sqlite_path=tmp_path / "audit.db")
+        for store in (memory, sqlite):
+            await store.store_records(records[:20])
+            await store.store_records(records[10:])
+        records[0].sign("private_key", "signer")
+        for store in (memory, sqlite):
+            await store.store_record(records[0])
+
+        for granularity in ("minute", "hour", "day"):
+            for dimension in ("severity", "actor", "action", "target_type", "rule"):
+                assert await memory.get_rollups(granularity, dimension) == await sqlite.get_rollups(granularity, dimension)
+            for dimension in ("actor", "rule"):
+                for severity in ("error", "info"):
+                    expected = await memory.get_rollups(granularity, dimension, severity=severity)
+                    assert expected == await sqlite.get_rollups(granularity, dimension, severity=severity)
+        assert sum(bucket.count for bucket in await sqlite.get_rollups("day", "action")) == 30
+        await memory.close()
+        await sqlite.close()
+
+    @pytest.mark.asyncio
+    async def test_rebuild_rollups(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test rollups are recounted from records stored before the rollup table was filled."""
+        records = make_records(12, **_ROLLUP_FIELDS)
+        backend = SQLiteAuditBackend(tmp_path / "audit.db")
+        await backend.store_records(records)
+        await backend._run(backend._conn.execute, "DELETE FROM audit_rollups")
+        assert await backend.get_rollups("hour", "actor") == []
+
+        await backend.rebuild_rollups()
+        assert await backend.get_rollups("hour", "actor") == AuditRollups(records).query("hour", "actor")
+        backend.close()
+
+        store = AuditStore()
+        await store.store_records(records)
+        expected = await store.get_rollups("minute", "severity")
+        await store.rebuild_rollups()
+        assert await store.get_rollups("minute", "severity") == expected
+        await store.close()
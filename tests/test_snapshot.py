@@ -0,0 +1,106 @@
+"""Tests for binary chain snapshots."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditChain,
+    AuditFinding,
+    AuditRecord,
+    AuditSeverity,
+    AuditTargetType,
+    AuditViolation,
+    ChainSnapshot,
+)
+from compliance.backend.audit.core.snapshot import write_snapshot
+
+BASE_TIME = datetime(2026, 3, 1, tzinfo=UTC)
+
+# Vary optional, empty and nested values so every column layout is exercised
+_SNAPSHOT_FIELDS: dict[str, Any] = {
+    "action": "check",
+    "reason": lambda i: "nightly" if i % 2 else None,
+    "context": lambda i: {"index": i, "files": ["a.py"]} if i % 5 == 0 else {},
+    "findings": lambda i: [AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description="long function")] if i == 1 else [],
+    "violations": lambda i: [AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", line_number=3)] if i == 2 else [],
+}
+
+
+class TestChainSnapshot:
+    """Tests for snapshot writing and memory-mapped loading."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_random_access(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test every record comes back equal and valid, in order or by index."""
+        chain = await make_chain(20, difficulty=1, **_SNAPSHOT_FIELDS)
+        chain.chain[4].sign("private_key", "signer")
+        path = tmp_path / "chain.snap"
+        assert chain.export_snapshot(path) == 21  # Including genesis
+
+        with ChainSnapshot(path) as snapshot:
+            assert len(snapshot) == 21
+            assert list(snapshot) == list(chain.chain)
+            assert snapshot[0].previous_hash == "0"
+            assert snapshot[-1] == chain.chain[-1]
+            assert snapshot[4].signatures == chain.chain[4].signatures
+            assert all(record.verify() for record in snapshot)
+            with pytest.raises(IndexError):
+                snapshot[21]
+
+        assert path.stat().st_size < len(chain.export_chain("json")) / 2
+
+    @pytest.mark.asyncio
+    async def test_time_range_and_unusual_values(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test a time-range export, and values that do not fit fixed-width slots."""
+        chain = await make_chain(10, difficulty=1, base_time=BASE_TIME, step=timedelta(minutes=1), **_SNAPSHOT_FIELDS)
+        start, end = BASE_TIME + timedelta(minutes=2), BASE_TIME + timedelta(minutes=5)
+        chain.export_snapshot(tmp_path / "range.snap", start=start, end=end)
+        with ChainSnapshot(tmp_path / "range.snap") as snapshot:
+            assert list(snapshot) == chain.get_chain_slice(start, end)
+
+        records = [
+            AuditRecord(record_id="custom-id", actor="a", action="b", target="c", target_type=AuditTargetType.LOG, source="d", timestamp=datetime(2026, 3, 1)),
+            AuditRecord(
+                actor="a",
+                action="b",
+                target="c",
+                target_type=AuditTargetType.LOG,
+                source="d",
+                timestamp=datetime(2026, 3, 1, tzinfo=timezone(timedelta(hours=-5))),
+            ),
+        ]
+        write_snapshot(records, tmp_path / "odd.snap")
+        with ChainSnapshot(tmp_path / "odd.snap") as snapshot:
+            assert list(snapshot) == records
+            assert snapshot[0].timestamp.tzinfo is None
+            assert snapshot[1].timestamp.utcoffset() == timedelta(hours=-5)
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_files(self, tmp_path: Path, make_chain: Callable[..., Awaitable[AuditChain]]) -> None:
+        """Test foreign, newer-version, truncated and corrupt files are rejected."""
+        chain = await make_chain(5, difficulty=1, **_SNAPSHOT_FIELDS)
+        path = tmp_path / "chain.snap"
+        chain.export_snapshot(path)
+        data = path.read_bytes()
+
+        (tmp_path / "foreign.snap").write_bytes(b"PK\x03\x04" + bytes(100))
+        with pytest.raises(ValueError, match="Not an audit chain snapshot"):
+            ChainSnapshot(tmp_path / "foreign.snap")
+
+        (tmp_path / "newer.snap").write_bytes(data[:8] + b"\x02\x00" + data[10:])
+        with pytest.raises(ValueError, match="Unsupported"):
+            ChainSnapshot(tmp_path / "newer.snap")
+
+        (tmp_path / "short.snap").write_bytes(data[:-10])
+        with pytest.raises(ValueError, match="Truncated"):
+            ChainSnapshot(tmp_path / "short.snap")
+
+        # Flip a byte inside the first record with a body (the genesis record keeps previous_hash "0" there)
+        corrupt = bytearray(data)
+        corrupt[70] ^= 0xFF
+        (tmp_path / "corrupt.snap").write_bytes(bytes(corrupt))
+        with ChainSnapshot(tmp_path / "corrupt.snap") as snapshot, pytest.raises(ValueError, match="Corrupt record 0"):
+            snapshot[0]
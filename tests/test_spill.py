@@ -0,0 +1,128 @@
+"""Tests for the memory-bounded AuditStore and its on-disk spill tier."""
+
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from compliance.backend.audit.core import AuditFilter, AuditFinding, AuditRecord, AuditSeverity, AuditStore, SegmentedChainLog, spill
+
+
+# Five targets, so provenance chains span the tiers, and a finding on every fourth record
+_SPILL_FIELDS: dict[str, Any] = {
+    "target": lambda i: f"target_{i % 5}",
+    "findings": lambda i: [AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description=f"finding {i}")] if i % 4 == 0 else [],
+}
+
+
+class TestMemoryBoundedStore:
+    """Tests for AuditStore with a memory budget."""
+
+    @pytest.mark.asyncio
+    async def test_queries_and_statistics_span_tiers(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test a bounded store answers like an unbounded one while holding at most its budget in memory."""
+        records = make_records(50, **_SPILL_FIELDS)
+        base_time = records[0].timestamp
+        bounded = AuditStore(enable_cache=False, max_memory_records=10, spill_path=tmp_path / "spill")
+        unbounded = AuditStore(enable_cache=False)
+        for store in (bounded, unbounded):
+            await store.store_records(records[:30])
+            for record in records[30:]:
+                await store.store_record(record)
+
+        assert len(bounded._memory_store) <= 10
+
+        filters = [
+            AuditFilter(limit=100),
+            AuditFilter(actor="user_1", limit=5, offset=2),
+            AuditFilter(since=base_time + timedelta(seconds=3), until=base_time + timedelta(seconds=20)),
+        ]
+        for audit_filter in filters:
+            expected = [r.record_id for r in await unbounded.query_records(audit_filter)]
+            assert [r.record_id for r in await bounded.query_records(audit_filter)] == expected
+
+        bounded_stats = await bounded.get_statistics()
+        assert bounded_stats.pop("spilled_records") == 50 - len(bounded._memory_store)
+        assert bounded_stats == await unbounded.get_statistics()
+
+        spilled = await bounded.get_record(records[0].record_id)
+        assert spilled is not None
+        assert spilled.verify() is True
+        assert [r.record_id for r in await bounded.get_provenance_chain("target_0")] == [r.record_id for r in await unbounded.get_provenance_chain("target_0")]
+        assert await bounded.verify_integrity() is True
+
+        # Storing a spilled record again brings it back into memory without double counting
+        records[0].sign("private_key", "signer")
+        await bounded.store_record(records[0])
+        stats = await bounded.get_statistics()
+        assert stats["total_records"] == 50
+        assert stats["signed_records"] == 1
+        assert stats["total_findings"] == bounded_stats["total_findings"]
+
+        await bounded.close()
+        await unbounded.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_tiers_share_the_budget(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test the in-process cache tiers hold their share of the budget rather than every stored record."""
+        store = AuditStore(max_memory_records=100, spill_path=tmp_path / "spill")
+        records = make_records(2000, **_SPILL_FIELDS)
+        for start in range(0, len(records), 100):
+            await store.store_records(records[start : start + 100])
+        for target in ("target_0", "target_1"):
+            assert len(await store.get_provenance_chain(target)) == 400
+
+        assert store._cache is not None
+        assert len(store._memory_store) <= 80
+        assert len(store._cache.local) <= 10
+        assert len(store._cache.provenance) == 0  # Each chain alone is over the tier's share
+        assert (await store.get_statistics())["total_records"] == 2000
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_spilled_records_reload(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test records spilled to an explicit directory are available after reopening."""
+        store = AuditStore(enable_cache=False, max_memory_records=4, spill_path=tmp_path / "spill")
+        await store.store_records(make_records(12, **_SPILL_FIELDS))
+        spilled = (await store.get_statistics())["spilled_records"]
+        await store.close()
+
+        reopened = AuditStore(enable_cache=False, max_memory_records=4, spill_path=tmp_path / "spill")
+        assert len(await reopened.query_records(AuditFilter(limit=100))) == spilled
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_superseded_frames_are_compacted(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_records: Callable[..., list[AuditRecord]]
+    ) -> None:
+        """Test re-spilled records do not grow the log without bound and reopening reads each frame once per lookup pass."""
+        monkeypatch.setattr(spill, "COMPACT_MIN_DEAD_FRAMES", 8)
+        records = make_records(20, **_SPILL_FIELDS)
+        store = AuditStore(enable_cache=False, max_memory_records=4, spill_path=tmp_path / "spill")
+        for _ in range(5):
+            await store.store_records(records)
+        assert store._spill is not None
+        assert store._spill.dead_frames < max(8, len(store._spill) + len(store._memory_store))
+        assert [child.name for child in (tmp_path / "spill").iterdir()] != ["0"]
+        expected = [r.record_id for r in await store.query_records(AuditFilter(limit=100))]
+        stats = await store.get_statistics()
+        await store.close()
+
+        decoded: list[int] = []
+        read = SegmentedChainLog._read
+
+        def counting_read(log: SegmentedChainLog, index: int) -> AuditRecord:
+            decoded.append(index)
+            return read(log, index)
+
+        monkeypatch.setattr(SegmentedChainLog, "_read", counting_read)
+        reopened = AuditStore(enable_cache=False, max_memory_records=4, spill_path=tmp_path / "spill")
+        assert reopened._spill is not None
+        frames = len(reopened._spill) + reopened._spill.dead_frames
+        assert len(decoded) <= 2 * frames
+        # Records held in memory at close keep their last spilled frame, so every record comes back
+        assert sorted(expected) == sorted(r.record_id for r in await reopened.query_records(AuditFilter(limit=100)))
+        assert (await reopened.get_statistics())["total_records"] == stats["total_records"]
+        assert await reopened.verify_integrity() is True
+        await reopened.close()
@@ -0,0 +1,170 @@
+"""Tests for the embedded SQLite audit store backend."""
+
+import sqlite3
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditFilter,
+    AuditFinding,
+    AuditRecord,
+    AuditSeverity,
+    AuditStore,
+    AuditTargetType,
+    AuditViolation,
+    SQLiteAuditBackend,
+)
+from compliance.backend.audit.core.schema import compile_provenance
+
+
+class TestSQLiteAuditBackend:
+    """Tests for SQLiteAuditBackend."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_hash_and_children(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test records read back verify and keep findings, violations and signatures in order."""
+        backend = SQLiteAuditBackend(tmp_path / "audit.db")
+        record = make_record(1, context={"index": 1, "when": datetime.now(UTC)})
+        record.findings.extend(
+            AuditFinding(finding_type="smell", severity=AuditSeverity.WARNING, description=f"finding {i}", metadata={"n": i}) for i in range(3)
+        )
+        record.violations.append(AuditViolation(rule="E501", severity=AuditSeverity.ERROR, message="Line too long", file_path="a.py", line_number=3))
+        record.sign("private_key", "signer_1")
+        await backend.store_records([record])
+
+        # Re-storing after another signature adds only the new signature
+        record.sign("private_key", "signer_2")
+        await backend.store_records([record])
+
+        # Child rows are read by ordinal, not physical order (VACUUM may renumber rowids)
+        for table in ("audit_findings", "audit_signatures"):
+            script = (
+                f"CREATE TEMP TABLE reversed AS SELECT * FROM {table} ORDER BY ordinal DESC; "
+                f"DELETE FROM {table}; INSERT INTO {table} SELECT * FROM reversed; DROP TABLE reversed"
+            )
+            await backend._run(backend._conn.executescript, script)
+
+        loaded = await backend.get_record(record.record_id)
+        assert loaded is not None
+        assert loaded.verify() is True
+        assert loaded.record_hash == record.record_hash
+        assert [f.description for f in loaded.findings] == ["finding 0", "finding 1", "finding 2"]
+        assert loaded.violations[0].line_number == 3
+        assert [s.signer for s in loaded.signatures] == ["signer_1", "signer_2"]
+        assert await backend.get_record("missing") is None
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_filter_pushdown_matches_in_memory_filter(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test compiled SQL filters, ordering, offset and cursors agree with AuditFilter.matches."""
+        backend = SQLiteAuditBackend(tmp_path / "audit.db", batch_size=4)
+        records = make_records(20, target=lambda i: f"target_{i % 4}")
+        base_time = records[0].timestamp
+        await backend.store_records(records)
+
+        filters = [
+            AuditFilter(),
+            AuditFilter(actor="user_1"),
+            AuditFilter(action="action_0", target_type=AuditTargetType.MODULE),
+            AuditFilter(target="target_2", severity=AuditSeverity.INFO),
+            AuditFilter(since=base_time + timedelta(seconds=5), until=base_time + timedelta(seconds=12), limit=4, offset=2),
+        ]
+        newest_first = sorted(records, key=lambda r: (r.timestamp, r.record_id), reverse=True)
+        for audit_filter in filters:
+            expected = [r.record_id for r in newest_first if audit_filter.matches(r)]
+            expected = expected[audit_filter.offset : audit_filter.offset + audit_filter.limit]
+            assert [r.record_id for r in await backend.query_records(audit_filter)] == expected
+
+        paged: list[str] = []
+        page_filter: AuditFilter | None = AuditFilter(actor="user_2", limit=3)
+        while page_filter is not None:
+            page = await backend.query_records(page_filter)
+            paged.extend(r.record_id for r in page)
+            page_filter = page_filter.next_page(page)
+        assert paged == [r.record_id for r in newest_first if r.actor == "user_2"]
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_uses_wal_and_indexes(self, tmp_path: Path) -> None:
+        """Test the database runs in WAL mode and actor filters use the spec index."""
+        backend = SQLiteAuditBackend(tmp_path / "audit.db")
+        assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = backend._conn.execute("EXPLAIN QUERY PLAN SELECT record_id FROM audit_records WHERE actor = ?", ("user_1",)).fetchall()
+        assert any("idx_audit_actor" in str(row) for row in plan)
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_prefix_provenance_uses_target_index(self, tmp_path: Path, make_record: Callable[..., AuditRecord]) -> None:
+        """Test prefix provenance reads are an index range and stay exact at the edges of the range."""
+        backend = SQLiteAuditBackend(tmp_path / "audit.db")
+        targets = ["src/a.py", "src/b/c.py", "src0.py", "src", "SRC/d.py", "src/\U0010ffff", "src/\U0010ffffx"]
+        await backend.store_records([make_record(i, target=target) for i, target in enumerate(targets)])
+
+        assert [r.target for r in await backend.get_provenance("src/", prefix=True)] == ["src/a.py", "src/b/c.py", "src/\U0010ffff", "src/\U0010ffffx"]
+        assert [r.target for r in await backend.get_provenance("src/\U0010ffff", prefix=True)] == ["src/\U0010ffff", "src/\U0010ffffx"]
+        assert len(await backend.get_provenance("", prefix=True)) == len(targets)
+
+        clause, params = compile_provenance("src/", True, lambda _: "?")
+        plan = backend._conn.execute(f"EXPLAIN QUERY PLAN SELECT record_id FROM audit_records {clause}", params).fetchall()
+        assert any("idx_audit_target" in str(row) for row in plan)
+        backend.close()
+
+
+class TestSQLiteAuditStore:
+    """Tests for AuditStore backed by SQLite."""
+
+    @pytest.mark.asyncio
+    async def test_store_survives_restart(
+        self, tmp_path: Path, make_record: Callable[..., AuditRecord], make_records: Callable[..., list[AuditRecord]]
+    ) -> None:
+        """Test records stored through AuditStore are queryable after reopening."""
+        path = tmp_path / "audit.db"
+        store = AuditStore(sqlite_path=path)
+        await store.store_records(make_records(6))
+        await store.store_record(make_record(6))
+        await store.close()
+
+        reopened = AuditStore(sqlite_path=path)
+        records = await reopened.query_records(AuditFilter(actor="user_0"))
+        assert [r.context["index"] for r in records] == [6, 3, 0]
+        assert await reopened.get_record(records[0].record_id) is not None
+        assert await reopened.verify_integrity() is True
+
+        stats = await reopened.get_statistics()
+        assert stats["total_records"] == 7
+        assert stats["storage_backend"] == "sqlite"
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_verify_integrity_streams_batches(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_records: Callable[..., list[AuditRecord]]
+    ) -> None:
+        """Test integrity checks read the database one chunk-sized batch at a time and catch a tampered row."""
+        path = tmp_path / "audit.db"
+        records = make_records(7)
+        store = AuditStore(sqlite_path=path)
+        await store.store_records(records)
+        assert await store.verify_integrity(chunk_size=2) is True
+        await store.close()
+
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE audit_records SET actor = 'intruder' WHERE record_id = ?", (records[5].record_id,))
+        conn.commit()
+        conn.close()
+
+        batch_sizes: list[int] = []
+        iter_records = SQLiteAuditBackend.iter_records
+
+        async def recording_iter(backend: SQLiteAuditBackend, batch_size: int | None = None) -> AsyncIterator[list[AuditRecord]]:
+            async for batch in iter_records(backend, batch_size):
+                batch_sizes.append(len(batch))
+                yield batch
+
+        monkeypatch.setattr(SQLiteAuditBackend, "iter_records", recording_iter)
+        reopened = AuditStore(sqlite_path=path)
+        assert await reopened.verify_integrity(chunk_size=2) is False
+        assert batch_sizes == [2, 2, 2, 1]
+        assert await reopened.verify_integrity(parallel=True, workers=2, chunk_size=2) is False
+        await reopened.close()
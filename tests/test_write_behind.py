@@ -0,0 +1,131 @@
+"""Tests for write-behind fan-out to storage backends."""
+
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from compliance.backend.audit.core import (
+    AuditChain,
+    AuditContext,
+    AuditFilter,
+    AuditRecord,
+    AuditStore,
+    SQLiteAuditBackend,
+    WriteBehindQueue,
+    write_behind,
+)
+
+
+class TestWriteBehindQueue:
+    """Tests for WriteBehindQueue."""
+
+    @pytest.mark.asyncio
+    async def test_batches_in_order_and_reports_lag(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test records are written in enqueue order, in bounded batches, after put returns."""
+        release = asyncio.Event()
+        batches: list[list[str]] = []
+
+        async def write(records: list[AuditRecord]) -> None:
+            await release.wait()
+            batches.append([record.record_id for record in records])
+
+        queue = WriteBehindQueue("slow", write, batch_size=4)
+        records = make_records(10)
+        await queue.put(records)
+
+        assert queue.pending == 10
+        await asyncio.sleep(0.01)
+        assert queue.lag > 0
+
+        release.set()
+        await queue.flush()
+
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert [record_id for batch in batches for record_id in batch] == [record.record_id for record in records]
+        assert queue.statistics() == {"pending": 0, "lag_seconds": 0.0, "written": 10, "failed": 0, "batches": 3, "last_error": None}
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test producers wait while max_pending records are unwritten."""
+        release = asyncio.Event()
+
+        async def write(records: list[AuditRecord]) -> None:
+            await release.wait()
+
+        queue = WriteBehindQueue("slow", write, max_pending=3, batch_size=3)
+        producer = asyncio.create_task(queue.put(make_records(5)))
+        await asyncio.sleep(0.01)
+
+        assert not producer.done()
+        assert queue.pending == 3
+
+        release.set()
+        await producer
+        await queue.flush()
+        assert queue.written == 5
+
+    @pytest.mark.asyncio
+    async def test_failing_batch_is_retried_then_dropped(self, monkeypatch: pytest.MonkeyPatch, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test a batch that keeps failing is counted and does not block later writes."""
+        monkeypatch.setattr(write_behind, "RETRY_BACKOFF", 0)
+        attempts = 0
+
+        async def write(records: list[AuditRecord]) -> None:
+            nonlocal attempts
+            attempts += 1
+            if records[0].target == "target_0":
+                msg = "backend down"
+                raise ConnectionError(msg)
+
+        queue = WriteBehindQueue("flaky", write, batch_size=1, max_retries=2)
+        await queue.put(make_records(2))
+        await queue.flush()
+
+        assert attempts == 4
+        assert queue.failed == 1
+        assert queue.written == 1
+        assert queue.last_error == "ConnectionError: backend down"
+
+    def test_rejects_empty_queue(self) -> None:
+        """Test a queue needs room for at least one record."""
+
+        async def write(records: list[AuditRecord]) -> None:
+            pass
+
+        with pytest.raises(ValueError, match="must be positive"):
+            WriteBehindQueue("none", write, max_pending=0)
+
+
+class TestWriteBehindStore:
+    """Tests for AuditStore in write-behind mode."""
+
+    @pytest.mark.asyncio
+    async def test_reads_see_queued_writes(self, tmp_path: Path, make_records: Callable[..., list[AuditRecord]]) -> None:
+        """Test database reads wait for queued writes and lag is reported per backend."""
+        store = AuditStore(sqlite_path=tmp_path / "audit.db", write_behind=True, write_batch_size=7)
+        records = make_records(30)
+        await store.store_records(records[:20])
+        for record in records[20:]:
+            await store.store_record(record)
+
+        assert len(await store.query_records(AuditFilter(limit=100))) == 30
+        stats = await store.get_statistics()
+        assert stats["total_records"] == 30
+        assert stats["write_behind"]["sqlite"]["pending"] == 0
+        assert stats["write_behind"]["sqlite"]["written"] == 30
+        await store.close()
+
+    def test_sync_context_flushes_before_loop_closes(self, tmp_path: Path) -> None:
+        """Test a synchronous AuditContext commit reaches the database before its loop closes."""
+        store = AuditStore(sqlite_path=tmp_path / "audit.db", write_behind=True)
+        with AuditContext(actor="tester", action="sync_commit", target="file.py", chain=AuditChain(difficulty=1), store=store) as ctx:
+            pass
+
+        record = ctx.get_record()
+        assert record is not None
+        backend = SQLiteAuditBackend(tmp_path / "audit.db")
+        stored = asyncio.run(backend.get_record(record.record_id))
+        assert stored is not None
+        assert stored.record_hash == record.record_hash
+        backend.close()